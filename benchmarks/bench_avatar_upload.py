@@ -0,0 +1,92 @@
+"""
+Пропускна здатність завантаження аватарів за різної конкурентності.
+
+Порівнює синхронний виклик сховища прямо в циклі подій (як раніше робив маршрут
+з `cloudinary.uploader.upload`) з `AvatarStorage.save`, що виконується в пулі
+потоків. Мережеве сховище імітується блокуючою затримкою `REMOTE_LATENCY`,
+локальне — записом у тимчасовий каталог. Паралельно вимірюється затримка
+циклу подій: наскільки запізнюється `asyncio.sleep(0.005)`.
+
+Запуск (з кореня репозиторію):
+    python -m benchmarks.bench_avatar_upload
+"""
+import asyncio
+import io
+import os
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+
+from fastapi import UploadFile
+
+from src.services.storage import AvatarStorage, LocalStorage, read_upload
+from starlette.concurrency import run_in_threadpool
+
+REMOTE_LATENCY = 0.05
+AVATAR = os.urandom(256 * 1024)
+
+
+def remote_upload(data: bytes, public_id: str) -> str:
+    time.sleep(REMOTE_LATENCY)
+    return f"https://cdn.example.com/{public_id}"
+
+
+class BlockingRemoteStorage(AvatarStorage):
+    async def save(self, data, public_id, content_type):
+        return remote_upload(data, public_id)
+
+
+class RemoteStorage(AvatarStorage):
+    async def save(self, data, public_id, content_type):
+        return await run_in_threadpool(remote_upload, data, public_id)
+
+
+async def handle(backend: AvatarStorage, user_id: int):
+    data = await read_upload(UploadFile(file=io.BytesIO(AVATAR), filename="a.png"))
+    return await backend.save(data, f"user_avatars/{user_id}", "image/png")
+
+
+async def loop_lag(stop: asyncio.Event, samples: list):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.005)
+        samples.append(time.perf_counter() - started - 0.005)
+
+
+async def run(backend: AvatarStorage, concurrency: int, total: int):
+    stop = asyncio.Event()
+    lag = []
+    probe = asyncio.create_task(loop_lag(stop, lag))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(user_id):
+        async with semaphore:
+            await handle(backend, user_id)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe
+    return total / elapsed, max(lag, default=0) * 1e3
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as root:
+        backends = (
+            ("remote, blocking", BlockingRemoteStorage()),
+            ("remote, threadpool", RemoteStorage()),
+            ("local, threadpool", LocalStorage(root=root)),
+        )
+        for concurrency in (1, 10, 50):
+            for name, backend in backends:
+                rate, lag = await run(backend, concurrency, total=100)
+                print(
+                    f"concurrency {concurrency:>3}  {name:<19}"
+                    f" {rate:8.1f} uploads/s  max loop lag {lag:7.1f} ms"
+                )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,56 @@
+"""
+Пропускна здатність перевірки паролів bcrypt через пул `Hash` та вплив на цикл подій.
+
+Запуск (з кореня репозиторію):
+    python -m benchmarks.bench_hashing [кількість_логінів] [паралельність]
+"""
+import asyncio
+import os
+import sys
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+
+from src.auth.auth import Hash, HASH_EXECUTOR, HASH_WORKERS
+
+
+async def probe_loop_latency(stop: asyncio.Event, samples: list):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.005)
+        samples.append(time.perf_counter() - start - 0.005)
+
+
+async def main(logins: int, concurrency: int):
+    hasher = Hash()
+    hashed = hasher.get_password_hash("12345678")
+    queue = asyncio.Queue()
+    for _ in range(logins):
+        queue.put_nowait(None)
+
+    async def worker():
+        while not queue.empty():
+            queue.get_nowait()
+            await hasher.verify_password_async("12345678", hashed)
+
+    stop = asyncio.Event()
+    lags = []
+    probe = asyncio.create_task(probe_loop_latency(stop, lags))
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await probe
+    Hash.shutdown()
+
+    cores = min(HASH_WORKERS, os.cpu_count() or 1)
+    lags.sort()
+    print(f"executor={HASH_EXECUTOR} workers={HASH_WORKERS} concurrency={concurrency}")
+    print(f"{logins / elapsed:8.1f} logins/s total, {logins / elapsed / cores:8.1f} logins/s per core")
+    print(f"event loop lag p50={lags[len(lags) // 2] * 1000:.2f} ms max={lags[-1] * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    asyncio.run(main(logins, concurrency))
@@ -0,0 +1,62 @@
+"""
+Порівняння відновлення поточного користувача з кешу: json + ORM `User`
+проти orjson + `Principal`.
+
+Запуск (з кореня репозиторію):
+    python -m benchmarks.bench_principal
+"""
+import json
+import os
+import timeit
+import tracemalloc
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+
+import orjson
+
+from src.auth.principal import Principal
+from src.databases.models import User
+
+USER = {
+    "id": 42,
+    "username": "deadpool",
+    "email": "deadpool@example.com",
+    "avatar": "https://res.cloudinary.com/demo/image/upload/user_avatars/42",
+    "confirmed": True,
+    "role": "user",
+}
+JSON_PAYLOAD = json.dumps(USER)
+ORJSON_PAYLOAD = orjson.dumps(USER)
+
+
+def orm_user():
+    return User(**json.loads(JSON_PAYLOAD))
+
+
+def principal():
+    return Principal(**orjson.loads(ORJSON_PAYLOAD))
+
+
+def allocated_bytes(fn, rounds=1000):
+    fn()
+    tracemalloc.start()
+    snapshot = tracemalloc.take_snapshot()
+    objects = [fn() for _ in range(rounds)]
+    diff = tracemalloc.take_snapshot().compare_to(snapshot, "filename")
+    tracemalloc.stop()
+    del objects
+    return sum(stat.size_diff for stat in diff) / rounds
+
+
+def main():
+    number = 50_000
+    for name, fn in (("json + User", orm_user), ("orjson + Principal", principal)):
+        seconds = min(timeit.repeat(fn, number=number, repeat=5))
+        print(
+            f"{name:<20} {seconds / number * 1e6:7.2f} us/op"
+            f"  {allocated_bytes(fn):8.0f} B retained/op"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Накладні витрати Redis-лімітера на один запит (EVALSHA зі скриптом GCRA).
+
+Потрібен запущений Redis (як для застосунку). Запуск (з кореня репозиторію):
+    python -m benchmarks.bench_rate_limit
+"""
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+
+from fastapi import Response
+
+from src.services.rate_limit import RateLimiter, RateLimitExceeded
+
+
+async def main():
+    limiter = RateLimiter(times=10**9, seconds=60, scope="bench")
+    await limiter.hit("warmup", Response())
+    for concurrency in (1, 50):
+        samples = []
+
+        async def one(index):
+            started = time.perf_counter()
+            try:
+                await limiter.hit(f"client-{index % 100}", Response())
+            except RateLimitExceeded:
+                pass
+            samples.append(time.perf_counter() - started)
+
+        for _ in range(2000 // concurrency):
+            await asyncio.gather(*(one(i) for i in range(concurrency)))
+        samples.sort()
+        median = statistics.median(samples) * 1e3
+        p99 = samples[int(len(samples) * 0.99)] * 1e3
+        print(f"concurrency {concurrency:>3}  median {median:.3f} ms  p99 {p99:.3f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
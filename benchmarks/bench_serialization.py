@@ -0,0 +1,71 @@
+"""
+Порівняння серіалізації списку контактів з ORM-об'єктів:
+`jsonable_encoder` + json (як для маршруту без `response_model`),
+валідація через `TypeAdapter` + `dump_json` та швидкий шлях orjson без валідації.
+
+Запуск (з кореня репозиторію):
+    python -m benchmarks.bench_serialization
+"""
+import json
+import os
+import timeit
+from datetime import date
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+
+from fastapi.encoders import jsonable_encoder
+
+from src.databases.models import Contact
+from src.schemas.contact import ContactBase
+from src.services import serialization
+
+
+def make_contacts(count):
+    return [
+        Contact(
+            id=i,
+            first_name=f"Wade{i}",
+            last_name="Wilson",
+            email=f"wade{i}@example.com",
+            phone_number="+1234567890",
+            birthday=date(1991, 1 + i % 12, 1 + i % 28),
+            user_id=1,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def encoder(contacts):
+    models = [ContactBase.model_validate(c, from_attributes=True) for c in contacts]
+    return json.dumps(jsonable_encoder(models)).encode()
+
+
+def validated(contacts):
+    return serialization.dump_contacts(contacts, fast=False)
+
+
+def fast(contacts):
+    return serialization.dump_contacts(contacts, fast=True)
+
+
+def main():
+    for count in (1_000, 10_000):
+        contacts = make_contacts(count)
+        number = max(1, 20_000 // count)
+        baseline = None
+        for name, fn in (
+            ("jsonable_encoder", encoder),
+            ("TypeAdapter", validated),
+            ("orjson fast path", fast),
+        ):
+            seconds = min(timeit.repeat(lambda: fn(contacts), number=number, repeat=5))
+            per_call = seconds / number * 1e3
+            baseline = baseline or per_call
+            print(
+                f"{count:>6} rows  {name:<18} {per_call:8.2f} ms/call"
+                f"  x{baseline / per_call:5.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
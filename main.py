@@ -1,12 +1,48 @@
-from fastapi import FastAPI, Depends, HTTPException, status, Request
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from fastapi import FastAPI, status, Request
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import text
-from starlette.responses import JSONResponse
-from slowapi.errors import RateLimitExceeded
-from src.databases.connect import get_db
+from fastapi.staticfiles import StaticFiles
+from starlette.responses import JSONResponse, Response
+from src.databases.connect import engine
+from src.databases.query_stats import QueryStatsMiddleware
+from src.cache_func.redis_client import close_redis
+from src.cache_func.user_cache import listen_for_invalidations
+from src.auth.auth import Hash, token_cache_stats
 from src.routes import contacts, auth, users
+from src.cache_func import contacts_cache
+from src.services import health, metrics, rate_limit, storage, update_avatar
+from src.services.rate_limit import RateLimitExceeded, retry_after_header
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Керує життєвим циклом застосунку.
+
+    Під час старту запускає слухача інвалідацій кешу користувачів і фонову
+    перевірку залежностей, під час зупинки зупиняє їх, пули bcrypt і обробки
+    аватарів, закриває з'єднання з Redis і базою даних і прибирає метрики
+    процесу (у режимі кількох воркерів). Схема бази даних керується міграціями Alembic
+    (`alembic upgrade head`) і під час старту не змінюється.
+    """
+    tasks = [
+        asyncio.create_task(listen_for_invalidations()),
+        asyncio.create_task(health.monitor.run()),
+    ]
+    yield
+    for task in tasks:
+        task.cancel()
+    with suppress(asyncio.CancelledError):
+        await asyncio.gather(*tasks)
+    Hash.shutdown()
+    update_avatar.shutdown()
+    await close_redis()
+    await engine.dispose()
+    metrics.mark_process_dead()
+
+
+app = FastAPI(lifespan=lifespan)
 
 origins = [
     "http://localhost:8000",
@@ -21,6 +57,29 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(
+    storage.UploadLimitMiddleware,
+    limits={"/users/avatar": storage.AVATAR_MAX_BYTES + storage.MULTIPART_OVERHEAD},
+)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(metrics.MetricsMiddleware)
+
+metrics.register(metrics.PoolCollector(engine))
+metrics.register(
+    metrics.StatsCollector(
+        "contacts_cache", contacts_cache.stats, "Contacts response cache events."
+    )
+)
+metrics.register(
+    metrics.StatsCollector("rate_limit", rate_limit.stats, "Rate limiter decisions.")
+)
+metrics.register(
+    metrics.StatsCollector(
+        "jwt_cache",
+        token_cache_stats,
+        "Verified JWT cache: hits, misses, verification time spent and saved.",
+    )
+)
 
 
 @app.get("/", name="API root")
@@ -34,34 +93,51 @@ def get_index():
     return {"message": "Welcome to Contacts API."}
 
 
-@app.get("/health", name="Service availability")
-def get_health_status(db=Depends(get_db)):
+@app.get("/health/live", name="Liveness probe")
+def get_liveness():
+    """
+    Перевіряє, що процес працює і обробляє запити (без звернень до залежностей).
+
+    Returns:
+        dict: Статус процесу.
     """
-    Перевіряє доступність бази даних.
+    return {"status": "ok"}
 
-    Виконує простий SQL-запит `SELECT 1+1` для перевірки з'єднання з БД.
-    Якщо запит не виконується або не повертає результат — викидається помилка 503.
 
-    Args:
-        db: Залежність FastAPI для отримання сесії бази даних.
+@app.get("/health", name="Service availability")
+@app.get("/health/ready", name="Readiness probe")
+def get_readiness():
+    """
+    Повертає готовність застосунку приймати трафік.
+
+    Стан бази даних, Redis і SMTP перевіряється у фоновій задачі
+    (`src.services.health`), маршрут лише віддає останній результат і стан
+    пулу з'єднань, тому частий виклик не створює навантаження на залежності.
 
     Returns:
-        dict: Повідомлення про стан бази даних.
+        JSONResponse: Результати перевірок; код 503, якщо застосунок не готовий.
+    """
+    snapshot = health.monitor.snapshot()
+    return JSONResponse(
+        snapshot,
+        status_code=(
+            status.HTTP_200_OK
+            if snapshot["status"] == "ok"
+            else status.HTTP_503_SERVICE_UNAVAILABLE
+        ),
+    )
 
-    Raises:
-        HTTPException: Якщо база даних не відповідає або не налаштована.
+
+@app.get("/metrics", name="Prometheus metrics", include_in_schema=False)
+def get_metrics():
+    """
+    Віддає метрики застосунку у форматі Prometheus.
+
+    Returns:
+        Response: Метрики у текстовому форматі експозиції Prometheus.
     """
-    try:
-        result = db.execute(text("Select 1+1")).fetchone()
-        print(result)
-        if result is None:
-            raise Exception
-        return {"message": "DataBase is ready for use!"}
-    except:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="DataBase is not configure correctly ",
-        )
+    payload, content_type = metrics.render()
+    return Response(payload, media_type=content_type)
 
 
 @app.exception_handler(RateLimitExceeded)
@@ -69,7 +145,8 @@ async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
     """
     Обробляє помилки перевищення ліміту запитів.
 
-    Повертає статус 429 Too Many Requests з повідомленням українською мовою.
+    Повертає статус 429 Too Many Requests з повідомленням українською мовою
+    і заголовком Retry-After.
 
     Args:
         request (Request): Вхідний HTTP-запит.
@@ -81,12 +158,23 @@ async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
     return JSONResponse(
         status_code=status.HTTP_429_TOO_MANY_REQUESTS,
         content={"error": "Перевищено ліміт запитів. Спробуйте пізніше."},
+        headers={"Retry-After": retry_after_header(exc)},
     )
 
 app.include_router(contacts.router)
 app.include_router(auth.router)
 app.include_router(users.router)
 
+if storage.AVATAR_STORAGE == "local":
+    app.mount(
+        storage.AVATAR_BASE_URL,
+        StaticFiles(directory=storage.AVATAR_LOCAL_DIR, check_dir=False),
+        name="media",
+    )
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    from src.server import server_options
+
+    metrics.prepare_multiprocess_dir()
+    uvicorn.run("main:app", **server_options())
@@ -0,0 +1,71 @@
+"""
+Середовище Alembic: міграції виконуються через асинхронний рушій застосунку.
+
+Запуск (з кореня репозиторію, потрібна змінна DATABASE_URL):
+    alembic upgrade head
+"""
+import asyncio
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from src.databases.connect import ASYNC_DATABASE_URL, Base
+from src.databases import models  # noqa: F401  (реєструє таблиці в Base.metadata)
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline():
+    """
+    Генерує SQL міграцій без підключення до бази (`alembic upgrade head --sql`).
+    """
+    context.configure(
+        url=ASYNC_DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    """
+    Пропускає триграмні індекси поза PostgreSQL: вони потребують pg_trgm
+    і створюються міграцією лише для PostgreSQL.
+    """
+    if type_ == "index" and name.endswith("_trgm"):
+        return context.get_context().dialect.name == "postgresql"
+    return True
+
+
+def do_run_migrations(connection):
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_migrations_online():
+    """
+    Виконує міграції на окремому рушії без пулу з'єднань.
+    """
+    engine = create_async_engine(ASYNC_DATABASE_URL, poolclass=NullPool)
+    async with engine.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+    await engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
@@ -0,0 +1,47 @@
+"""Початкова схема: користувачі та контакти.
+
+Відповідає таблицям, які раніше створював `Base.metadata.create_all` під час
+імпорту моделей. Для бази, створеної таким чином, виконайте
+`alembic stamp 0001`, а потім `alembic upgrade head`.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("username", sa.String(), unique=True),
+        sa.Column("email", sa.String(), unique=True),
+        sa.Column("password", sa.String()),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("avatar", sa.String(length=255), nullable=True),
+        sa.Column("confirmed", sa.Boolean()),
+        sa.Column("role", sa.String()),
+    )
+    op.create_table(
+        "contacts",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("first_name", sa.String(length=50), nullable=False),
+        sa.Column("last_name", sa.String(length=50), nullable=False),
+        sa.Column("email", sa.String(length=100), nullable=False, unique=True),
+        sa.Column("phone_number", sa.String(length=20), nullable=False),
+        sa.Column("birthday", sa.Date(), nullable=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+    )
+
+
+def downgrade():
+    op.drop_table("contacts")
+    op.drop_table("users")
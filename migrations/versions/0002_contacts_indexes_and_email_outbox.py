@@ -0,0 +1,113 @@
+"""Індекси контактів, день народження в році та черга листів.
+
+- `contacts.birthday_doy` із заповненням для наявних записів;
+- індекси keyset-пагінації та пошуку найближчих днів народження;
+- триграмні GIN-індекси для пошуку (лише PostgreSQL, розширення pg_trgm);
+- таблиця `email_outbox`.
+
+Код з `birthday_doy` (пошук найближчих днів народження) потребує цієї міграції.
+Бази, які до появи Alembic створював `Base.metadata.create_all`, можуть уже
+містити частину цих об'єктів, тому наявні стовпці, індекси й таблиці
+пропускаються, а `birthday_doy` заповнюється лише там, де він порожній.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+TRGM_COLUMNS = ("first_name", "last_name", "email")
+
+
+def upgrade():
+    bind = op.get_bind()
+    is_postgres = bind.dialect.name == "postgresql"
+    inspector = sa.inspect(bind)
+    columns = {column["name"] for column in inspector.get_columns("contacts")}
+    indexes = {index["name"] for index in inspector.get_indexes("contacts")}
+
+    if "birthday_doy" not in columns:
+        with op.batch_alter_table("contacts") as batch:
+            batch.add_column(sa.Column("birthday_doy", sa.SmallInteger(), nullable=True))
+
+    # День року за календарем високосного року (див. models.birthday_day_of_year)
+    if is_postgres:
+        op.execute(
+            "UPDATE contacts SET birthday_doy = EXTRACT(DOY FROM make_date("
+            "2000, EXTRACT(MONTH FROM birthday)::int, EXTRACT(DAY FROM birthday)::int"
+            ")) WHERE birthday IS NOT NULL AND birthday_doy IS NULL"
+        )
+    else:
+        op.execute(
+            "UPDATE contacts SET birthday_doy = CAST(strftime('%j', "
+            "'2000-' || strftime('%m-%d', birthday)) AS INTEGER) "
+            "WHERE birthday IS NOT NULL AND birthday_doy IS NULL"
+        )
+
+    for name, index_columns in (
+        ("ix_contacts_user_id_id", ["user_id", "id"]),
+        ("ix_contacts_user_id_birthday_doy", ["user_id", "birthday_doy"]),
+    ):
+        if name not in indexes:
+            op.create_index(name, "contacts", index_columns)
+    if is_postgres:
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for column in TRGM_COLUMNS:
+            if f"ix_contacts_{column}_trgm" in indexes:
+                continue
+            op.create_index(
+                f"ix_contacts_{column}_trgm",
+                "contacts",
+                [column],
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            )
+
+    if inspector.has_table("email_outbox"):
+        return
+    op.create_table(
+        "email_outbox",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("kind", sa.String(length=32), nullable=False),
+        sa.Column("recipient", sa.String(length=255), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column(
+            "next_attempt_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now()
+        ),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ix_email_outbox_pending",
+        "email_outbox",
+        ["next_attempt_at"],
+        postgresql_where=sa.text("status = 'pending'"),
+        sqlite_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_email_outbox_pending", table_name="email_outbox")
+    op.drop_table("email_outbox")
+    if op.get_bind().dialect.name == "postgresql":
+        for column in TRGM_COLUMNS:
+            op.drop_index(f"ix_contacts_{column}_trgm", table_name="contacts")
+    op.drop_index("ix_contacts_user_id_birthday_doy", table_name="contacts")
+    op.drop_index("ix_contacts_user_id_id", table_name="contacts")
+    with op.batch_alter_table("contacts") as batch:
+        batch.drop_column("birthday_doy")
@@ -1,20 +1,51 @@
 from passlib.context import CryptContext
 from jose import jwt, JWTError
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+import asyncio
+import hashlib
 import os
+import time
 from sqlalchemy import select
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi import Depends, HTTPException, status
 from src.databases.connect import get_db
 from datetime import datetime, timezone, timedelta
 from src.databases.models import User
+from src.auth.principal import Principal
 from src.cache_func.user_cache import get_user_from_cache, set_user_to_cache
+from src.cache_func.local_cache import TTLCache
+from src.services.metrics import PASSWORD_HASH_DURATION
 
 ALGORITHM = os.getenv("ALGORITHM")
 SECRET_KEY = os.getenv("SECRET_KEY")
 
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "4096"))
+JWT_CACHE_MAX_TTL = float(os.getenv("JWT_CACHE_MAX_TTL", "300"))
+
+token_cache = TTLCache(JWT_CACHE_SIZE, JWT_CACHE_MAX_TTL)
+token_cache_stats = {"hits": 0, "misses": 0, "verify_seconds": 0.0, "saved_seconds": 0.0}
+
+HASH_EXECUTOR = os.getenv("HASH_EXECUTOR", "thread")
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(os.cpu_count() or 1)))
+HASH_QUEUE_TIMEOUT = float(os.getenv("HASH_QUEUE_TIMEOUT", "5"))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def _verify(plain_password, hashed_password):
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def _hash(password):
+    return pwd_context.hash(password)
+
 
 class Hash:
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    pwd_context = pwd_context
+
+    _executor: Executor | None = None
+    _slots: asyncio.Semaphore | None = None
+    _slots_loop = None
 
     def verify_password(self, plain_password, hashed_password):
         """
@@ -33,6 +64,74 @@ class Hash:
         """
         return self.pwd_context.hash(password)
 
+    @classmethod
+    def executor(cls) -> Executor:
+        """
+        Повертає спільний пул для bcrypt (`HASH_EXECUTOR=thread|process`), створюючи його при першому виклику.
+        """
+        if cls._executor is None:
+            if HASH_EXECUTOR == "process":
+                cls._executor = ProcessPoolExecutor(max_workers=HASH_WORKERS)
+            else:
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=HASH_WORKERS, thread_name_prefix="bcrypt"
+                )
+        return cls._executor
+
+    @classmethod
+    def shutdown(cls):
+        """
+        Зупиняє пул bcrypt (викликається під час зупинки застосунку).
+        """
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
+
+    async def _run(self, fn, *args):
+        """
+        Виконує bcrypt у пулі поза циклом подій.
+
+        Одночасно виконується не більше `HASH_WORKERS` операцій; решта чекає
+        вільного місця не довше `HASH_QUEUE_TIMEOUT` секунд, після чого запит
+        відхиляється з кодом 503, щоб сплеск логінів не блокував інші запити.
+        """
+        loop = asyncio.get_running_loop()
+        if Hash._slots is None or Hash._slots_loop is not loop:
+            Hash._slots = asyncio.Semaphore(HASH_WORKERS)
+            Hash._slots_loop = loop
+        slots = Hash._slots
+        try:
+            await asyncio.wait_for(slots.acquire(), HASH_QUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, try again later",
+                headers={"Retry-After": "1"},
+            )
+        try:
+            return await loop.run_in_executor(self.executor(), fn, *args)
+        finally:
+            slots.release()
+
+    async def verify_password_async(self, plain_password, hashed_password):
+        """
+        Перевіряє пароль користувача в пулі bcrypt, не блокуючи цикл подій.
+        :param plain_password: пароль користувача
+        :param hashed_password: хеш пароль користувача
+        :return: true or false
+        """
+        with PASSWORD_HASH_DURATION.labels("verify").time():
+            return await self._run(_verify, plain_password, hashed_password)
+
+    async def get_password_hash_async(self, password: str):
+        """
+        Генерує хеш для паролю користувача в пулі bcrypt, не блокуючи цикл подій.
+        :param password: пароль користувача
+        :return: Хеш паролю
+        """
+        with PASSWORD_HASH_DURATION.labels("hash").time():
+            return await self._run(_hash, password)
+
 
 async def create_access_token(data: dict, expires_delta=3600):
     """
@@ -55,9 +154,54 @@ async def create_password_reset_token(email: str, expires_delta=timedelta(hours=
     to_encode = {"sub": email, "exp": datetime.now(timezone.utc) + expires_delta}
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+def decode_token(token: str) -> dict:
+    """
+    Перевіряє підпис JWT і повертає його claims, використовуючи кеш перевірених токенів.
+
+    Ключем кешу є SHA-256 від токена. Запис живе не довше, ніж до `exp` токена,
+    і не довше за `JWT_CACHE_MAX_TTL`; токени без `exp` не кешуються.
+    `JWT_CACHE_SIZE=0` вимикає кеш. Повернутий словник спільний для всіх
+    звернень, його не можна змінювати.
+
+    У `token_cache_stats` накопичуються кількість влучань і промахів, сумарний
+    час перевірок підпису та оцінка заощадженого часу (влучання × середній час
+    перевірки).
+
+    Args:
+        token (str): JWT токен.
+
+    Returns:
+        dict: Claims токена.
+
+    Raises:
+        JWTError: Якщо токен недійсний або прострочений.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    claims = token_cache.get(key)
+    if claims is not None:
+        token_cache_stats["hits"] += 1
+        misses = token_cache_stats["misses"]
+        if misses:
+            token_cache_stats["saved_seconds"] += (
+                token_cache_stats["verify_seconds"] / misses
+            )
+        return claims
+
+    start = time.perf_counter()
+    claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    token_cache_stats["verify_seconds"] += time.perf_counter() - start
+    token_cache_stats["misses"] += 1
+
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)):
+        ttl = min(exp - time.time(), JWT_CACHE_MAX_TTL)
+        token_cache.set(key, claims, ttl=ttl)
+    return claims
+
+
 async def verify_password_reset_token(token: str): 
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token)
         return payload.get("sub")
     except JWTError:
         return None
@@ -67,7 +211,7 @@ async def verify_password_reset_token(token: str):
 async def get_current_user(
     token: HTTPAuthorizationCredentials = Depends(HTTPBearer()),
     db = Depends(get_db)
-):
+) -> Principal:
     """
     Отримує поточного авторизованого користувача з кешу Redis або бази даних на основі JWT токена.
 
@@ -82,7 +226,7 @@ async def get_current_user(
         HTTPException: Якщо токен недійсний або користувача не знайдено.
 
     Returns:
-        User: Об'єкт користувача.
+        Principal: Незмінні дані поточного користувача.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -91,7 +235,7 @@ async def get_current_user(
     )
 
     try:
-        payload = jwt.decode(token.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token.credentials)
         email = payload.get("sub")
         if email is None:
             raise credentials_exception
@@ -100,7 +244,7 @@ async def get_current_user(
 
     cached_user = await get_user_from_cache(email)
     if cached_user:
-        return User(**cached_user)
+        return cached_user
 
     stmt = select(User).where(User.email == email)
     result = await db.execute(stmt)
@@ -108,5 +252,4 @@ async def get_current_user(
     if user is None:
         raise credentials_exception
 
-    await set_user_to_cache(user)
-    return user
\ No newline at end of file
+    return await set_user_to_cache(user, publish=False)
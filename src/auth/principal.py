@@ -0,0 +1,46 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """
+    Незмінні дані автентифікованого користувача для обробки одного запиту.
+
+    На відміну від ORM-моделі `User`, не має інструментування SQLAlchemy, не прив'язаний
+    до сесії та не містить хешу пароля, тому його дешево створювати з кешу
+    і безпечно передавати між залежностями.
+    """
+
+    id: int
+    username: str | None
+    email: str
+    avatar: str | None = None
+    confirmed: bool = False
+    role: str = "user"
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        """
+        Створює Principal з ORM-об'єкта `User` (або будь-якого об'єкта з тими ж атрибутами).
+        """
+        return cls(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            avatar=user.avatar,
+            confirmed=bool(user.confirmed),
+            role=user.role or "user",
+        )
+
+    def to_dict(self) -> dict:
+        """
+        Повертає словник для серіалізації в кеш.
+        """
+        return {
+            "id": self.id,
+            "username": self.username,
+            "email": self.email,
+            "avatar": self.avatar,
+            "confirmed": self.confirmed,
+            "role": self.role,
+        }
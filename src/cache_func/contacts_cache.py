@@ -0,0 +1,172 @@
+"""
+Кеш JSON-відповідей зі списками контактів у Redis.
+
+Обмеження пам'яті:
+
+- одна відповідь — не більше `CONTACTS_CACHE_MAX_BYTES` (більші не кешуються);
+- на користувача — не більше `CONTACTS_CACHE_MAX_KEYS` відповідей: ключі
+  користувача записуються в індекс (sorted set за часом запису), і під час
+  запису нової відповіді найстаріші понад ліміт видаляються. Тому кеш одного
+  користувача займає не більше `CONTACTS_CACHE_MAX_KEYS * CONTACTS_CACHE_MAX_BYTES`;
+- загалом — `maxmemory` Redis з політикою `volatile-lru` (див. docker-compose):
+  витісняються лише ключі з TTL, тож лічильники версій (без TTL) не губляться.
+"""
+import hashlib
+import json
+import os
+from redis.exceptions import RedisError
+from src.cache_func.redis_client import get_redis
+
+CONTACTS_CACHE_TTL = int(os.getenv("CONTACTS_CACHE_TTL", "300"))
+CONTACTS_CACHE_MAX_BYTES = int(os.getenv("CONTACTS_CACHE_MAX_BYTES", "262144"))
+CONTACTS_CACHE_MAX_KEYS = int(os.getenv("CONTACTS_CACHE_MAX_KEYS", "50"))
+
+stats = {"hits": 0, "misses": 0, "skipped": 0, "evicted": 0, "errors": 0}
+
+# Запис відповіді та витіснення найстаріших відповідей користувача понад
+# ліміт — одна атомарна операція. Час береться з Redis (TIME).
+STORE_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000000 + tonumber(clock[2])
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+redis.call('ZADD', KEYS[2], now, KEYS[1])
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+local excess = redis.call('ZCARD', KEYS[2]) - tonumber(ARGV[3])
+if excess <= 0 then
+    return 0
+end
+local evicted = redis.call('ZPOPMIN', KEYS[2], excess)
+for i = 1, #evicted, 2 do
+    redis.call('DEL', evicted[i])
+end
+return excess
+"""
+
+_store = None
+
+
+def store():
+    """
+    Повертає скрипт запису відповіді, зареєстрований у спільному клієнті Redis при першому виклику.
+    """
+    global _store
+    if _store is None:
+        _store = get_redis().register_script(STORE_SCRIPT)
+    return _store
+
+
+def version_key(user_id: int) -> str:
+    """
+    Повертає ключ Redis з лічильником версії контактів користувача.
+    """
+    return f"contacts:{user_id}:version"
+
+
+def index_key(user_id: int) -> str:
+    """
+    Повертає ключ Redis з індексом закешованих відповідей користувача.
+    """
+    return f"contacts:{user_id}:keys"
+
+
+def cache_key(user_id: int, version: int, endpoint: str, params: dict) -> str:
+    """
+    Формує ключ кешу відповіді для користувача, версії даних, маршруту та параметрів.
+
+    Параметри нормалізуються: порожні значення відкидаються, а решта сортується,
+    тому однакові запити з різним порядком параметрів потрапляють в один ключ.
+
+    Args:
+        user_id (int): Ідентифікатор користувача.
+        version (int): Поточна версія контактів користувача.
+        endpoint (str): Назва маршруту (наприклад, "list" або "search").
+        params (dict): Параметри запиту.
+
+    Returns:
+        str: Ключ Redis.
+    """
+    normalized = json.dumps(
+        sorted((k, v) for k, v in params.items() if v is not None), default=str
+    )
+    digest = hashlib.sha1(normalized.encode()).hexdigest()
+    return f"contacts:{user_id}:v{version}:{endpoint}:{digest}"
+
+
+async def get_version(user_id: int) -> int:
+    """
+    Отримати поточну версію контактів користувача з Redis.
+    """
+    version = await get_redis().get(version_key(user_id))
+    return int(version) if version else 0
+
+
+async def current_version(user_id: int) -> int | None:
+    """
+    Отримати версію контактів користувача або None, якщо Redis недоступний.
+    """
+    try:
+        return await get_version(user_id)
+    except (RedisError, OSError):
+        stats["errors"] += 1
+        return None
+
+
+async def bump_version(user_id: int):
+    """
+    Збільшити версію контактів користувача.
+
+    Усі закешовані відповіді попередньої версії стають недосяжними за O(1)
+    і видаляються Redis після закінчення TTL.
+    """
+    try:
+        await get_redis().incr(version_key(user_id))
+    except (RedisError, OSError):
+        stats["errors"] += 1
+
+
+async def cached_response(
+    user_id: int, endpoint: str, params: dict, loader, version: int | None = None
+):
+    """
+    Повертає JSON-відповідь з кешу або формує її через `loader` і кешує.
+
+    Якщо Redis недоступний, відповідь завжди формується через `loader`.
+    Відповіді, більші за `CONTACTS_CACHE_MAX_BYTES`, не кешуються; понад
+    `CONTACTS_CACHE_MAX_KEYS` відповідей користувача витісняються найстаріші.
+
+    Args:
+        user_id (int): Ідентифікатор користувача.
+        endpoint (str): Назва маршруту.
+        params (dict): Параметри запиту.
+        loader: Асинхронна функція без аргументів, що повертає JSON (str або bytes).
+        version (int | None): Вже отримана версія контактів (щоб не читати її повторно).
+
+    Returns:
+        str | bytes: Серіалізована JSON-відповідь.
+    """
+    try:
+        if version is None:
+            version = await get_version(user_id)
+        key = cache_key(user_id, version, endpoint, params)
+        payload = await get_redis().get(key)
+    except (RedisError, OSError):
+        stats["errors"] += 1
+        return await loader()
+
+    if payload is not None:
+        stats["hits"] += 1
+        return payload
+
+    stats["misses"] += 1
+    payload = await loader()
+    if len(payload) > CONTACTS_CACHE_MAX_BYTES:
+        stats["skipped"] += 1
+        return payload
+    try:
+        stats["evicted"] += await store()(
+            keys=[key, index_key(user_id)],
+            args=[payload, CONTACTS_CACHE_TTL, CONTACTS_CACHE_MAX_KEYS],
+        )
+    except (RedisError, OSError):
+        stats["errors"] += 1
+    return payload
@@ -0,0 +1,52 @@
+import hashlib
+from fastapi import Request, Response
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """
+    Формує слабкий ETag з частин, що однозначно визначають вміст відповіді.
+
+    Args:
+        *parts: Значення, від яких залежить відповідь (користувач, версія даних, параметри).
+
+    Returns:
+        str: Слабкий ETag, наприклад `W/"3f2a..."`.
+    """
+    raw = "\x1f".join(str(part) for part in parts)
+    return f'W/"{hashlib.sha1(raw.encode()).hexdigest()[:20]}"'
+
+
+def etag_matches(request: Request, etag: str | None) -> bool:
+    """
+    Перевіряє заголовок If-None-Match запиту (слабке порівняння).
+    """
+    header = request.headers.get("if-none-match")
+    if not header or etag is None:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque for candidate in header.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    """
+    Повертає відповідь 304 Not Modified з тим самим ETag.
+    """
+    return Response(
+        status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    )
+
+
+def set_etag(response: Response, etag: str | None) -> Response:
+    """
+    Додає ETag і Cache-Control до відповіді, якщо ETag відомий.
+    """
+    if etag is not None:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = CACHE_CONTROL
+    return response
@@ -0,0 +1,65 @@
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Обмежений за розміром кеш у пам'яті процесу з витісненням LRU та TTL записів.
+
+    Кеш не потокобезпечний і призначений для використання в одному циклі подій.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        :param maxsize: максимальна кількість записів (0 вимикає кеш)
+        :param ttl: час життя запису в секундах за замовчуванням
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+
+    def get(self, key):
+        """
+        Повертає значення за ключем або None, якщо запису немає чи він застарів.
+        """
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value, ttl: float | None = None):
+        """
+        Зберігає значення; найдавніше використаний запис витісняється при переповненні.
+
+        :param ttl: власний час життя запису в секундах (за замовчуванням `self.ttl`)
+        """
+        if self.maxsize <= 0:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            self._data.pop(key, None)
+            return
+        self._data[key] = (value, time.monotonic() + ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key):
+        """
+        Видаляє запис, якщо він є.
+        """
+        self._data.pop(key, None)
+
+    def clear(self):
+        """
+        Очищує кеш.
+        """
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,74 @@
+import os
+import time
+import redis.asyncio as redis
+from redis.asyncio.retry import Retry
+from redis.backoff import ExponentialBackoff
+from src.services.metrics import REDIS_COMMAND_DURATION
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "1"))
+REDIS_CONNECT_TIMEOUT = float(os.getenv("REDIS_CONNECT_TIMEOUT", "0.5"))
+REDIS_RETRIES = int(os.getenv("REDIS_RETRIES", "1"))
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30"))
+
+_client: redis.Redis | None = None
+
+
+class InstrumentedRedis(redis.Redis):
+    """
+    Клієнт Redis, що записує час виконання кожної команди в метрики.
+    """
+
+    async def execute_command(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            REDIS_COMMAND_DURATION.labels(str(args[0]).upper()).observe(
+                time.perf_counter() - started
+            )
+
+
+def get_redis() -> redis.Redis:
+    """
+    Повертає спільний клієнт Redis, створюючи його при першому виклику.
+
+    Клієнт не встановлює з'єднання під час створення, а таймаути та кількість
+    повторних спроб обмежені, тож недоступний Redis не блокує старт застосунку
+    і не затримує запити довше ніж на кілька секунд.
+
+    Returns:
+        redis.Redis: Асинхронний клієнт Redis.
+    """
+    global _client
+    if _client is None:
+        _client = InstrumentedRedis.from_url(
+            REDIS_URL,
+            decode_responses=True,
+            socket_timeout=REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
+            retry=Retry(ExponentialBackoff(cap=0.5, base=0.05), REDIS_RETRIES),
+            max_connections=REDIS_MAX_CONNECTIONS,
+            health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+        )
+    return _client
+
+
+def _forget_client():
+    # Після fork з'єднання батьківського процесу не використовуються
+    global _client
+    _client = None
+
+
+os.register_at_fork(after_in_child=_forget_client)
+
+
+async def close_redis():
+    """
+    Закриває спільний клієнт Redis (викликається під час зупинки застосунку).
+    """
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -1,30 +1,104 @@
-import redis.asyncio as redis
-import json
+import asyncio
+import logging
+import os
+from redis.exceptions import RedisError
+import orjson
 from src.databases.models import User
+from src.auth.principal import Principal
+from src.cache_func.local_cache import TTLCache
+from src.cache_func.redis_client import get_redis
+from src.services.metrics import USER_CACHE_LOOKUPS
 
-r = redis.Redis(host="localhost", port=6379, db=0, decode_responses=True)
+logger = logging.getLogger(__name__)
 
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "3600"))
+USER_LOCAL_CACHE_SIZE = int(os.getenv("USER_LOCAL_CACHE_SIZE", "1024"))
+USER_LOCAL_CACHE_TTL = float(os.getenv("USER_LOCAL_CACHE_TTL", "30"))
+INVALIDATION_CHANNEL = "user_cache:invalidate"
 
-async def get_user_from_cache(email: str):
+local_users = TTLCache(USER_LOCAL_CACHE_SIZE, USER_LOCAL_CACHE_TTL)
+
+
+async def get_user_from_cache(email: str) -> Principal | None:
     """
-    Отримати дані користувача з кешу Redis за email.
+    Отримати дані користувача з кешу за email.
+
+    Спочатку перевіряється кеш у пам'яті процесу, потім Redis. Знайдені в Redis
+    дані зберігаються в локальному кеші, тож наступні запити обходяться без мережі.
     """
-    user_data = await r.get(email)
+    principal = local_users.get(email)
+    if principal is not None:
+        USER_CACHE_LOOKUPS.labels("local", "hit").inc()
+        return principal
+    USER_CACHE_LOOKUPS.labels("local", "miss").inc()
+    user_data = await get_redis().get(email)
     if user_data:
-        return json.loads(user_data)
+        USER_CACHE_LOOKUPS.labels("redis", "hit").inc()
+        principal = Principal(**orjson.loads(user_data))
+        local_users.set(email, principal)
+        return principal
+    USER_CACHE_LOOKUPS.labels("redis", "miss").inc()
     return None
 
 
-async def set_user_to_cache(user: User):
+async def set_user_to_cache(user: User | Principal, publish: bool = True) -> Principal:
     """
     Зберегти користувача в кеш Redis.
+
+    Після зміни даних користувача (`publish=True`) інші процеси отримують
+    повідомлення про інвалідацію через Redis pub/sub і видаляють застарілий
+    запис зі свого локального кешу. Заповнення кешу після промаху
+    (`publish=False`) нічого не змінює, тому повідомлення не надсилає, а запис
+    одразу потрапляє в локальний кеш процесу.
+
+    Args:
+        user (User | Principal): Користувач.
+        publish (bool): Чи сповіщати інші процеси про зміну.
+
+    Returns:
+        Principal: Дані користувача у вигляді, що зберігається в кеші.
+    """
+    principal = user if isinstance(user, Principal) else Principal.from_user(user)
+    await get_redis().set(
+        principal.email, orjson.dumps(principal.to_dict()), ex=USER_CACHE_TTL
+    )
+    if not publish:
+        local_users.set(principal.email, principal)
+        return principal
+    local_users.pop(principal.email)
+    await get_redis().publish(INVALIDATION_CHANNEL, principal.email)
+    return principal
+
+
+async def invalidate_user(email: str):
+    """
+    Видалити користувача з кешу Redis і з локальних кешів усіх процесів.
+    """
+    local_users.pop(email)
+    await get_redis().delete(email)
+    await get_redis().publish(INVALIDATION_CHANNEL, email)
+
+
+async def listen_for_invalidations(retry_delay: float = 1.0):
+    """
+    Слухає канал інвалідації та видаляє змінених користувачів з локального кешу.
+
+    Запускається як фонова задача на кожен процес. Після втрати з'єднання з Redis
+    локальний кеш очищується повністю (повідомлення могли бути пропущені),
+    а підписка відновлюється.
     """
-    user_dict = {
-        "id": user.id,
-        "username": user.username,
-        "email": user.email,
-        "avatar": user.avatar,
-        "confirmed": user.confirmed,
-        "role": user.role,
-    }
-    await r.set(user.email, json.dumps(user_dict), ex=3600)
+    while True:
+        pubsub = get_redis().pubsub()
+        try:
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    local_users.pop(message["data"])
+        except asyncio.CancelledError:
+            raise
+        except (RedisError, OSError) as exc:
+            logger.warning("User cache invalidation listener lost Redis: %s", exc)
+            local_users.clear()
+            await asyncio.sleep(retry_delay)
+        finally:
+            await pubsub.aclose()
@@ -1,30 +1,116 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import declarative_base
 import os
 from dotenv import load_dotenv
+from src.databases import query_stats
+from src.services.metrics import TimedQueuePool
 
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
 
-engine = create_engine(url=DATABASE_URL)
-Session = sessionmaker(bind=engine)
+
+def async_database_url(url: str) -> str:
+    """
+    Приводить URL бази даних до асинхронного драйвера.
+
+    `postgresql://` та `postgresql+psycopg2://` замінюються на `postgresql+asyncpg://`,
+    `sqlite://` — на `sqlite+aiosqlite://`. Інші URL повертаються без змін.
+
+    Args:
+        url (str): URL підключення з конфігурації.
+
+    Returns:
+        str: URL для `create_async_engine`.
+    """
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+
+def engine_options(url: str) -> dict:
+    """
+    Формує параметри пулу з'єднань для `create_async_engine`.
+
+    Для asyncpg додатково налаштовується розмір кешу підготовлених запитів
+    (`prepared_statement_cache_size`). SQLite не має пулу з'єднань, тому для нього
+    параметри пулу не передаються.
+
+    Args:
+        url (str): Асинхронний URL бази даних.
+
+    Returns:
+        dict: Іменовані аргументи для `create_async_engine`.
+    """
+    if url.startswith("sqlite"):
+        return {}
+    options = {
+        "poolclass": TimedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+    if url.startswith("postgresql+asyncpg"):
+        options["connect_args"] = {
+            "prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+        }
+    return options
+
+
+ASYNC_DATABASE_URL = async_database_url(DATABASE_URL)
+
+engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL))
+query_stats.install(engine)
+SessionLocal = async_sessionmaker(
+    bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+# Дочірній процес після fork (наприклад, gunicorn --preload) не повинен
+# використовувати з'єднання батьківського пулу: відкриває власні.
+os.register_at_fork(after_in_child=lambda: engine.sync_engine.dispose(close=False))
 
 Base = declarative_base()
 
 
-def get_db():
+async def get_db():
     """
-    Створює та надає сесію до бази даних для одного запиту.
+    Створює та надає асинхронну сесію до бази даних для одного запиту.
 
     Yields:
-        Session: Об'єкт сесії SQLAlchemy для виконання запитів до бази даних.
+        AsyncSession: Об'єкт асинхронної сесії SQLAlchemy для виконання запитів до бази даних.
 
     Ensures:
-        Сесія буде автоматично закрита після завершення використання.
+        Незавершена транзакція відкочується у разі помилки, а сесія повертає
+        з'єднання до пулу після завершення запиту.
+    """
+    async with SessionLocal() as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+
+
+def get_session_factory():
+    """
+    Повертає фабрику асинхронних сесій.
+
+    Використовується маршрутами з потоковою відповіддю: сесія, отримана через
+    `get_db`, закривається до початку передавання тіла відповіді, тому генератор
+    відкриває власну сесію на час стримінгу.
+
+    Returns:
+        async_sessionmaker: Фабрика сесій SQLAlchemy.
     """
-    connection = Session()
-    try:
-        yield connection
-    finally:
-        connection.close()
+    return SessionLocal
@@ -1,7 +1,26 @@
-from sqlalchemy import Column, Integer, String, DateTime, Date, ForeignKey, Boolean
-from sqlalchemy.orm import relationship
-from datetime import datetime
-from .connect import Base, engine
+from sqlalchemy import Column, Integer, SmallInteger, String, Text, DateTime, Date, ForeignKey, Boolean, Index, DDL, JSON, event, func, text
+from sqlalchemy.orm import relationship, validates
+from datetime import datetime, date
+from .connect import Base
+
+
+def birthday_day_of_year(value: date | None) -> int | None:
+    """
+    Обчислює порядковий номер дня народження в році за календарем високосного року.
+
+    Номер не залежить від року народження: 29 лютого завжди 60, 1 березня — 61,
+    31 грудня — 366. Це дозволяє шукати найближчі дні народження простим
+    діапазонним запитом за індексом.
+
+    Args:
+        value (date | None): Дата народження.
+
+    Returns:
+        int | None: День року (1–366) або None, якщо дата не задана.
+    """
+    if value is None:
+        return None
+    return date(2000, value.month, value.day).timetuple().tm_yday
 
 
 class Contact(Base):
@@ -12,10 +31,50 @@ class Contact(Base):
     email = Column(String(100), nullable=False, unique=True)
     phone_number = Column(String(20), nullable=False)
     birthday = Column(Date, nullable=True)
+    # День року для індексованого пошуку днів народження; наявні бази
+    # отримують стовпець і його значення міграцією 0002 (`alembic upgrade head`)
+    birthday_doy = Column(SmallInteger, nullable=True)
 
     user_id = Column(Integer, ForeignKey("users.id"))
     user = relationship("User", back_populates="contacts")
 
+    __table_args__ = (
+        # Keyset-пагінація списку контактів: WHERE user_id = ? AND id > ? ORDER BY id
+        Index("ix_contacts_user_id_id", "user_id", "id"),
+        Index("ix_contacts_user_id_birthday_doy", "user_id", "birthday_doy"),
+        # Триграмні GIN-індекси для пошуку ILIKE '%...%' (PostgreSQL, pg_trgm)
+        Index(
+            "ix_contacts_first_name_trgm",
+            "first_name",
+            postgresql_using="gin",
+            postgresql_ops={"first_name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_contacts_last_name_trgm",
+            "last_name",
+            postgresql_using="gin",
+            postgresql_ops={"last_name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_contacts_email_trgm",
+            "email",
+            postgresql_using="gin",
+            postgresql_ops={"email": "gin_trgm_ops"},
+        ),
+    )
+
+    @validates("birthday")
+    def _sync_birthday_doy(self, key, value):
+        self.birthday_doy = birthday_day_of_year(value)
+        return value
+
+
+event.listen(
+    Contact.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
 
 class User(Base):
     __tablename__ = "users"
@@ -31,4 +90,37 @@ class User(Base):
     contacts = relationship("Contact", back_populates="user")
 
 
-Base.metadata.create_all(bind=engine)
+class EmailOutbox(Base):
+    """
+    Черга вихідних листів у базі даних (transactional outbox).
+
+    Запис додається в тій самій транзакції, що й зміна, яка породжує лист
+    (наприклад, створення користувача), тому лист не губиться при перезапуску
+    і не відправляється, якщо транзакцію відкочено. Відправляє листи окремий
+    процес `src.workers.email_outbox`.
+    """
+
+    __tablename__ = "email_outbox"
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(32), nullable=False)
+    recipient = Column(String(255), nullable=False)
+    payload = Column(JSON, nullable=False, default=dict)
+    status = Column(String(16), nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Пошук готових до відправлення листів: індексуються лише записи pending
+        Index(
+            "ix_email_outbox_pending",
+            "next_attempt_at",
+            postgresql_where=text("status = 'pending'"),
+            sqlite_where=text("status = 'pending'"),
+        ),
+    )
+
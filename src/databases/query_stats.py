@@ -0,0 +1,225 @@
+"""
+Облік SQL-запитів на один HTTP-запит і журнал повільних запитів.
+
+Обробники подій рушія SQLAlchemy рахують кількість запитів і сумарний час
+у базі даних для поточного контексту (`count_queries`). `QueryStatsMiddleware`
+відкриває такий контекст на кожен HTTP-запит і додає до відповіді заголовок
+`Server-Timing`, який показують інструменти розробника браузера.
+
+Режим бюджету (для тестів): якщо задано `QUERY_BUDGET`, запит, що виконав
+більше SQL-запитів, записується в журнал, а з `QUERY_BUDGET_STRICT=true`
+завершується помилкою `QueryBudgetExceeded` — так тести ловлять N+1.
+"""
+import logging
+import os
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+QUERY_BUDGET = int(os.getenv("QUERY_BUDGET", "0"))
+QUERY_BUDGET_STRICT = os.getenv("QUERY_BUDGET_STRICT", "false").lower() == "true"
+SERVER_TIMING = os.getenv("SERVER_TIMING", "true").lower() == "true"
+MAX_SQL_LENGTH = 1000
+
+_WHITESPACE = re.compile(r"\s+")
+_LITERALS = re.compile(
+    r"'(?:[^']|'')*'"  # рядки
+    r"|\$\d+|%\(\w+\)s|(?<![:\w]):\w+|\?"  # параметри asyncpg, psycopg, іменовані, qmark
+    r"|\b\d+(?:\.\d+)?\b"  # числа
+)
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    Приводить SQL до шаблону: літерали й параметри замінюються на `?`,
+    списки `IN (?, ?, ...)` згортаються, пробіли нормалізуються.
+
+    Однакові за структурою запити дають однаковий шаблон, тому їх легко
+    згрупувати в журналі.
+
+    Args:
+        statement (str): SQL-запит.
+
+    Returns:
+        str: Нормалізований запит (не довший за `MAX_SQL_LENGTH` символів).
+    """
+    sql = _WHITESPACE.sub(" ", statement).strip()
+    sql = _LITERALS.sub("?", sql)
+    sql = _IN_LIST.sub("(...)", sql)
+    return sql[:MAX_SQL_LENGTH]
+
+
+class QueryBudgetExceeded(AssertionError):
+    """
+    Кількість SQL-запитів перевищила бюджет.
+    """
+
+
+class QueryStats:
+    """
+    Лічильник SQL-запитів одного контексту (HTTP-запиту або блоку `count_queries`).
+    """
+
+    __slots__ = ("label", "budget", "count", "duration", "statements")
+
+    def __init__(self, label: str = "", budget: int | None = None):
+        self.label = label
+        self.budget = budget
+        self.count = 0
+        self.duration = 0.0
+        # Шаблони запитів зберігаються лише для звіту про перевищення бюджету
+        self.statements = Counter() if budget is not None else None
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.duration += elapsed
+        if self.statements is not None:
+            self.statements[normalize_sql(statement)] += 1
+
+    @property
+    def exceeded(self) -> bool:
+        return self.budget is not None and self.count > self.budget
+
+    def report(self) -> str:
+        """
+        Опис перевищення бюджету з найчастішими запитами.
+        """
+        lines = [f"{self.label or 'block'}: {self.count} queries (budget {self.budget})"]
+        for sql, count in (self.statements or Counter()).most_common(5):
+            lines.append(f"  {count} x {sql}")
+        return "\n".join(lines)
+
+    def server_timing(self) -> str:
+        """
+        Значення заголовка `Server-Timing`.
+        """
+        return f'db;desc="{self.count} queries";dur={self.duration * 1000:.2f}'
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def current_stats() -> QueryStats | None:
+    """
+    Повертає лічильник поточного контексту або None.
+    """
+    return _current.get()
+
+
+@contextmanager
+def count_queries(budget: int | None = None, label: str = ""):
+    """
+    Рахує SQL-запити, виконані всередині блоку.
+
+    Приклад:
+        with count_queries(budget=2) as stats:
+            await create_user(data, session)
+        assert stats.count == 2
+
+    Args:
+        budget (int | None): Максимальна кількість запитів.
+        label (str): Назва блоку для повідомлень.
+
+    Yields:
+        QueryStats: Лічильник запитів.
+
+    Raises:
+        QueryBudgetExceeded: Якщо блок виконав більше `budget` запитів.
+    """
+    stats = QueryStats(label, budget)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+    if stats.exceeded:
+        raise QueryBudgetExceeded(stats.report())
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Час початку зберігається в контексті виконання, а не на з'єднанні з пулу:
+    # контекст живе лише один запит, тому помилка не залишає застарілих значень
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+def _record(context, statement):
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    context._query_started = None
+    elapsed = time.perf_counter() - started
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        logger.warning(
+            "Slow query (%.1f ms)%s: %s",
+            elapsed * 1000,
+            f" in {stats.label}" if stats is not None and stats.label else "",
+            normalize_sql(statement),
+        )
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _record(context, statement)
+
+
+def _handle_error(exception_context):
+    # Запит, що завершився помилкою, теж виконувався в базі даних
+    if exception_context.execution_context is not None:
+        _record(exception_context.execution_context, exception_context.statement or "")
+
+
+def install(engine):
+    """
+    Підключає облік запитів до рушія (синхронного або асинхронного).
+    """
+    target = getattr(engine, "sync_engine", engine)
+    if not event.contains(target, "before_cursor_execute", _before_cursor_execute):
+        event.listen(target, "before_cursor_execute", _before_cursor_execute)
+        event.listen(target, "after_cursor_execute", _after_cursor_execute)
+        event.listen(target, "handle_error", _handle_error)
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI-проміжний шар: рахує SQL-запити кожного HTTP-запиту та додає
+    заголовок `Server-Timing` (запити, виконані після початку відповіді,
+    наприклад під час стримінгу, у заголовок не потрапляють).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = QueryStats(
+            f"{scope['method']} {scope['path']}", QUERY_BUDGET or None
+        )
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and SERVER_TIMING:
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = _current.set(stats)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+        if stats.exceeded:
+            if QUERY_BUDGET_STRICT:
+                raise QueryBudgetExceeded(stats.report())
+            logger.warning("Query budget exceeded by %s", stats.report())
@@ -1,15 +1,63 @@
-from src.databases.models import Contact, User
+from src.databases.models import Contact, birthday_day_of_year
+from src.auth.principal import Principal
 from datetime import datetime, timedelta
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, or_, func, case, update, delete, bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+import base64
+import binascii
+import os
 
+DEFAULT_PAGE_SIZE = int(os.getenv("CONTACTS_PAGE_SIZE", "50"))
+MAX_PAGE_SIZE = int(os.getenv("CONTACTS_MAX_PAGE_SIZE", "200"))
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
 
-async def create_contact(contact, current_user: User, db):
+
+def encode_cursor(contact_id: int) -> str:
+    """
+    Кодує ідентифікатор останнього контакту сторінки у непрозорий курсор.
+
+    Args:
+        contact_id (int): Ідентифікатор останнього контакту на сторінці.
+
+    Returns:
+        str: Курсор для параметра `after` наступного запиту.
+    """
+    raw = f"c:{contact_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Розкодовує курсор, отриманий від клієнта.
+
+    Args:
+        cursor (str): Курсор з поля `next_cursor` попередньої сторінки.
+
+    Returns:
+        int: Ідентифікатор контакту, після якого починається сторінка.
+
+    Raises:
+        ValueError: Якщо курсор пошкоджений або має невідомий формат.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+    except (binascii.Error, UnicodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    prefix, _, value = raw.partition(":")
+    if prefix != "c" or not value.isdigit():
+        raise ValueError("Invalid cursor")
+    return int(value)
+
+
+async def create_contact(contact, current_user: Principal, db):
     """
     Створює новий контакт для поточного користувача.
 
     Args:
         contact: Схема даних нового контакту.
-        current_user (User): Поточний авторизований користувач.
+        current_user (Principal): Поточний авторизований користувач.
         db: Сесія бази даних.
 
     Returns:
@@ -22,30 +70,123 @@ async def create_contact(contact, current_user: User, db):
     return new_contact
 
 
-async def get_contacts(current_user: User, db):
+def contact_values(contact, current_user: Principal) -> dict:
+    """
+    Формує значення колонок нового контакту для пакетної вставки.
+
+    Args:
+        contact: Схема даних контакту.
+        current_user (Principal): Власник контакту.
+
+    Returns:
+        dict: Значення колонок, включно з `user_id` та `birthday_doy`.
+    """
+    values = contact.model_dump()
+    values["user_id"] = current_user.id
+    values["birthday_doy"] = birthday_day_of_year(values.get("birthday"))
+    return values
+
+
+async def insert_contacts(rows: list[dict], db) -> set[str]:
+    """
+    Вставляє пакет контактів одним багаторядковим INSERT, пропускаючи конфлікти email.
+
+    Використовує `INSERT ... ON CONFLICT (email) DO NOTHING RETURNING email`
+    (PostgreSQL або SQLite); SQLAlchemy об'єднує параметри в багаторядкові
+    VALUES (insertmanyvalues) і повторно використовує скомпільований запит.
+    Транзакцію фіксує викликач.
+
+    Args:
+        rows (list[dict]): Значення колонок, див. `contact_values`.
+        db: Сесія бази даних.
+
+    Returns:
+        set[str]: Email-адреси фактично вставлених контактів.
+    """
+    if not rows:
+        return set()
+    table = Contact.__table__
+    stmt = (
+        _insert_for(db)(table)
+        .on_conflict_do_nothing(index_elements=[table.c.email])
+        .returning(table.c.email)
+    )
+    result = await db.execute(stmt, rows)
+    return set(result.scalars().all())
+
+
+async def get_contacts(
+    current_user: Principal, db, limit: int = DEFAULT_PAGE_SIZE, after: str | None = None
+):
     """
-    Отримує всі контакти поточного користувача.
+    Отримує сторінку контактів поточного користувача (keyset-пагінація).
+
+    Контакти впорядковані за `id`; наступна сторінка починається одразу після
+    контакту, закодованого в курсорі, тому вартість запиту не залежить від глибини
+    гортання. Розмір сторінки обмежується `MAX_PAGE_SIZE`.
 
     Args:
-        current_user (User): Поточний авторизований користувач.
+        current_user (Principal): Поточний авторизований користувач.
         db: Сесія бази даних.
+        limit (int): Бажаний розмір сторінки.
+        after (str | None): Курсор попередньої сторінки або None для першої.
 
     Returns:
-        List[Contact]: Список контактів.
+        tuple[List[Contact], str | None]: Контакти сторінки та курсор наступної
+        сторінки (None, якщо сторінка остання).
+
+    Raises:
+        ValueError: Якщо курсор недійсний.
     """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
     stmt = select(Contact).where(Contact.user_id == current_user.id)
+    if after is not None:
+        stmt = stmt.where(Contact.id > decode_cursor(after))
+    stmt = stmt.order_by(Contact.id).limit(limit + 1)
     result = await db.execute(stmt)
-    contacts = result.scalars().all()
-    return contacts
+    contacts = list(result.scalars().all())
+
+    next_cursor = None
+    if len(contacts) > limit:
+        contacts = contacts[:limit]
+        next_cursor = encode_cursor(contacts[-1].id)
+    return contacts, next_cursor
+
+
+async def stream_contacts(current_user: Principal, db, batch_size: int = EXPORT_BATCH_SIZE):
+    """
+    Потоково читає всі контакти користувача через серверний курсор.
+
+    Рядки надходять пакетами по `batch_size` (`yield_per`), тому пам'ять не
+    залежить від кількості контактів, а перший пакет доступний до завершення
+    запиту в базі даних.
+
+    Args:
+        current_user (Principal): Поточний користувач.
+        db: Сесія бази даних.
+        batch_size (int): Кількість рядків у пакеті.
+
+    Yields:
+        List[Contact]: Пакет контактів, впорядкованих за `id`.
+    """
+    stmt = (
+        select(Contact)
+        .where(Contact.user_id == current_user.id)
+        .order_by(Contact.id)
+        .execution_options(yield_per=batch_size)
+    )
+    result = await db.stream_scalars(stmt)
+    async for partition in result.partitions():
+        yield partition
 
 
-async def get_contact_by_ID(contact_id: int, current_user: User, db):
+async def get_contact_by_ID(contact_id: int, current_user: Principal, db):
     """
     Повертає контакт за його ідентифікатором для поточного користувача.
 
     Args:
         contact_id (int): Ідентифікатор контакту.
-        current_user (User): Поточний авторизований користувач.
+        current_user (Principal): Поточний авторизований користувач.
         db: Сесія бази даних.
 
     Returns:
@@ -60,48 +201,64 @@ async def get_contact_by_ID(contact_id: int, current_user: User, db):
     return contact
 
 
-async def update_contact(contact_data, contact_id: int, current_user: User, db):
+async def update_contact(
+    contact_data, contact_id: int, current_user: Principal, db, partial: bool = False
+):
     """
-    Оновлює дані контакту поточного користувача.
+    Оновлює дані контакту поточного користувача одним запитом `UPDATE ... RETURNING`.
 
     Args:
         contact_data: Нові дані для оновлення.
         contact_id (int): Ідентифікатор контакту.
-        current_user (User): Поточний користувач.
+        current_user (Principal): Поточний користувач.
         db: Сесія бази даних.
+        partial (bool): Оновити лише передані поля (для PATCH); явний null
+            очищує необов'язкові поля, наприклад birthday.
 
     Returns:
         Contact | None: Оновлений контакт або None, якщо не знайдено.
     """
-    contact = await get_contact_by_ID(contact_id, current_user, db)
-    if contact:
-        for key, value in contact_data.dict().items():
-            setattr(contact, key, value)
-        db.commit()
-        db.refresh(contact)
+    values = contact_data.model_dump(exclude_unset=partial)
+    if not values:
+        return await get_contact_by_ID(contact_id, current_user, db)
+    if "birthday" in values:
+        values["birthday_doy"] = birthday_day_of_year(values["birthday"])
+    stmt = (
+        update(Contact)
+        .where(Contact.id == contact_id, Contact.user_id == current_user.id)
+        .values(**values)
+        .returning(Contact)
+    )
+    result = await db.execute(stmt)
+    contact = result.scalar_one_or_none()
+    await db.commit()
     return contact
 
 
-async def delete_contact(contact_id: int, current_user: User, db):
+async def delete_contact(contact_id: int, current_user: Principal, db):
     """
-    Видаляє контакт поточного користувача за ID.
+    Видаляє контакт поточного користувача за ID одним запитом `DELETE ... RETURNING`.
 
     Args:
         contact_id (int): Ідентифікатор контакту.
-        current_user (User): Поточний користувач.
+        current_user (Principal): Поточний користувач.
         db: Сесія бази даних.
 
     Returns:
         Contact | None: Видалений контакт або None, якщо не знайдено.
     """
-    contact = await get_contact_by_ID(contact_id, current_user, db)
-    if contact:
-        db.delete(contact)
-        db.commit()
+    stmt = (
+        delete(Contact)
+        .where(Contact.id == contact_id, Contact.user_id == current_user.id)
+        .returning(Contact)
+    )
+    result = await db.execute(stmt)
+    contact = result.scalar_one_or_none()
+    await db.commit()
     return contact
 
 
-async def find_search(first_name, last_name, email, current_user: User, db):
+async def find_search(first_name, last_name, email, current_user: Principal, db):
     """
     Шукає контакти поточного користувача за іменем, прізвищем або email.
 
@@ -109,7 +266,7 @@ async def find_search(first_name, last_name, email, current_user: User, db):
         first_name (str | None): Ім’я для пошуку.
         last_name (str | None): Прізвище для пошуку.
         email (str | None): Email для пошуку.
-        current_user (User): Поточний користувач.
+        current_user (Principal): Поточний користувач.
         db: Сесія бази даних.
 
     Returns:
@@ -130,28 +287,251 @@ async def find_search(first_name, last_name, email, current_user: User, db):
     return contacts
 
 
-async def contacts_birthday(current_user: User, db):
+def _dialect_name(db) -> str:
+    """
+    Повертає назву діалекту бази даних, до якої прив'язана сесія.
     """
-    Повертає контакти, у яких день народження протягом наступних 7 днів.
+    bind = getattr(db, "bind", None)
+    dialect = getattr(bind, "dialect", None)
+    return getattr(dialect, "name", "")
+
+
+def _insert_for(db):
+    """
+    Повертає діалектну конструкцію INSERT з підтримкою ON CONFLICT.
+    """
+    return pg_insert if _dialect_name(db) == "postgresql" else sqlite_insert
+
+
+def _escape_like(term: str) -> str:
+    """
+    Екранує спецсимволи LIKE, щоб пошуковий рядок порівнювався буквально.
+    """
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+async def search_contacts(
+    q: str, current_user: Principal, db, limit: int = DEFAULT_PAGE_SIZE, offset: int = 0
+):
+    """
+    Шукає контакти поточного користувача за одним рядком у імені, прізвищі та email.
+
+    На PostgreSQL умови `ILIKE '%q%'` обслуговуються триграмними GIN-індексами
+    (pg_trgm), а результати ранжуються за найбільшою схожістю `similarity()` серед
+    трьох полів. На інших СУБД (наприклад, SQLite у тестах) виконується звичайний
+    пошук ILIKE з сортуванням за `id`.
 
     Args:
-        current_user (User): Поточний користувач.
+        q (str): Пошуковий рядок.
+        current_user (Principal): Поточний користувач.
         db: Сесія бази даних.
+        limit (int): Розмір сторінки (не більше `MAX_PAGE_SIZE`).
+        offset (int): Кількість результатів, які потрібно пропустити.
 
     Returns:
-        List[Contact]: Список контактів з майбутніми днями народження.
+        List[Contact]: Сторінка знайдених контактів.
     """
-    today = datetime.today().date()
-    next_week = today + timedelta(days=7)
-    stmt = select(Contact).where(Contact.user_id == current_user.id)
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    pattern = f"%{_escape_like(q)}%"
+    stmt = select(Contact).where(
+        Contact.user_id == current_user.id,
+        or_(
+            Contact.first_name.ilike(pattern, escape="\\"),
+            Contact.last_name.ilike(pattern, escape="\\"),
+            Contact.email.ilike(pattern, escape="\\"),
+        ),
+    )
+    if _dialect_name(db) == "postgresql":
+        rank = func.greatest(
+            func.similarity(Contact.first_name, q),
+            func.similarity(Contact.last_name, q),
+            func.similarity(Contact.email, q),
+        )
+        stmt = stmt.order_by(rank.desc(), Contact.id)
+    else:
+        stmt = stmt.order_by(Contact.id)
+    stmt = stmt.limit(limit).offset(offset)
     result = await db.execute(stmt)
-    contacts = result.scalars().all()
-    upcoming = []
+    return result.scalars().all()
 
-    for contact in contacts:
-        if contact.birthday:
-            birthday_this_year = contact.birthday.replace(year=today.year)
-            if today <= birthday_this_year <= next_week:
-                upcoming.append(contact)
 
-    return upcoming
+def _operation_result(index: int, op: str, status: int, contact_id=None, error=None):
+    return {"index": index, "op": op, "status": status, "id": contact_id, "error": error}
+
+
+async def _batch_create(db, table, creates: list, results: list):
+    stmt = (
+        _insert_for(db)(table)
+        .on_conflict_do_nothing(index_elements=[table.c.email])
+        .returning(table.c.id, table.c.email)
+    )
+    result = await db.execute(stmt, [values for _, values in creates])
+    created = {email: contact_id for contact_id, email in result.all()}
+    for index, values in creates:
+        contact_id = created.get(values["email"])
+        if contact_id is None:
+            results[index] = _operation_result(
+                index, "create", 409, error="Contact with this email already exists"
+            )
+        else:
+            results[index] = _operation_result(index, "create", 201, contact_id)
+
+
+async def _batch_update(db, table, updates: list, results: list, user_id: int):
+    columns = [key[2:] for key in updates[0][1] if key != "b_id"]
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("b_id"), table.c.user_id == user_id)
+        .values({column: bindparam(f"b_{column}") for column in columns})
+    )
+    await db.execute(stmt, [params for _, params in updates])
+    for index, params in updates:
+        results[index] = _operation_result(index, "update", 200, params["b_id"])
+
+
+async def _batch_delete(db, table, deletes: list, results: list, user_id: int):
+    await db.execute(
+        delete(table).where(
+            table.c.user_id == user_id,
+            table.c.id.in_([contact_id for _, contact_id in deletes]),
+        )
+    )
+    for index, contact_id in deletes:
+        results[index] = _operation_result(index, "delete", 200, contact_id)
+
+
+async def apply_batch(operations, current_user: Principal, db) -> list[dict]:
+    """
+    Виконує пакет операцій create/update/delete над контактами в одній транзакції.
+
+    Операції виконуються в порядку запиту, а послідовні операції одного типу
+    об'єднуються в один запит: багаторядковий INSERT, UPDATE з executemany або
+    DELETE. Тому, наприклад, видалення контакту і створення нового з тим самим
+    email у такому порядку проходить успішно. Належність контактів перевіряється
+    одним запитом. Операції над чужими, відсутніми або вже видаленими в цьому
+    пакеті контактами отримують статус 404, створення з email, що вже існує
+    або повторюється в пакеті, — статус 409.
+
+    Args:
+        operations: Список операцій `ContactBatchRequest.operations`.
+        current_user (Principal): Поточний користувач.
+        db: Сесія бази даних.
+
+    Returns:
+        list[dict]: Результат кожної операції в порядку запиту.
+
+    Raises:
+        IntegrityError: Якщо оновлення порушує унікальність email; транзакцію
+        відкочує викликач.
+    """
+    table = Contact.__table__
+    results = [None] * len(operations)
+
+    target_ids = {operation.id for operation in operations if operation.op != "create"}
+    owned = set()
+    if target_ids:
+        result = await db.execute(
+            select(Contact.id).where(
+                Contact.user_id == current_user.id, Contact.id.in_(target_ids)
+            )
+        )
+        owned = set(result.scalars().all())
+
+    # Послідовні групи операцій одного типу: [(op, [(index, payload), ...]), ...]
+    groups = []
+    emails, deleted = set(), set()
+    for index, operation in enumerate(operations):
+        if operation.op == "create":
+            values = contact_values(operation.data, current_user)
+            if values["email"] in emails:
+                results[index] = _operation_result(
+                    index, "create", 409, error="Duplicate email in batch"
+                )
+                continue
+            emails.add(values["email"])
+            payload = values
+        elif operation.id not in owned or operation.id in deleted:
+            results[index] = _operation_result(
+                index, operation.op, 404, operation.id, "Contact not found"
+            )
+            continue
+        elif operation.op == "update":
+            values = contact_values(operation.data, current_user)
+            del values["user_id"]
+            payload = {f"b_{key}": value for key, value in values.items()}
+            payload["b_id"] = operation.id
+        else:
+            deleted.add(operation.id)
+            payload = operation.id
+        if not groups or groups[-1][0] != operation.op:
+            groups.append((operation.op, []))
+        groups[-1][1].append((index, payload))
+
+    for op, items in groups:
+        if op == "create":
+            await _batch_create(db, table, items, results)
+        elif op == "update":
+            await _batch_update(db, table, items, results, current_user.id)
+        else:
+            await _batch_delete(db, table, items, results, current_user.id)
+
+    await db.commit()
+    return results
+
+
+def birthday_window(today, days: int):
+    """
+    Обчислює діапазон днів року (див. `birthday_day_of_year`) для вікна днів народження.
+
+    Args:
+        today (date): Перший день вікна.
+        days (int): Кількість днів після `today`, які входять у вікно.
+
+    Returns:
+        tuple[int, int] | None: Початковий і кінцевий день року включно або None,
+        якщо вікно охоплює весь рік. Якщо початок більший за кінець, вікно
+        переходить через Новий рік.
+    """
+    if days >= 365:
+        return None
+    start = birthday_day_of_year(today)
+    end = birthday_day_of_year(today + timedelta(days=days))
+    return start, end
+
+
+async def contacts_birthday(current_user: Principal, db, days: int = 7):
+    """
+    Повертає контакти, у яких день народження протягом наступних `days` днів.
+
+    Фільтрація виконується в базі даних за індексом `(user_id, birthday_doy)`;
+    вікно, що переходить через Новий рік, та 29 лютого обробляються коректно.
+    Контакти впорядковані за найближчим днем народження.
+
+    Args:
+        current_user (Principal): Поточний користувач.
+        db: Сесія бази даних.
+        days (int): Розмір вікна в днях, включно з сьогоднішнім днем.
+
+    Returns:
+        List[Contact]: Список контактів з майбутніми днями народження.
+    """
+    today = datetime.today().date()
+    stmt = select(Contact).where(
+        Contact.user_id == current_user.id, Contact.birthday_doy.is_not(None)
+    )
+    window = birthday_window(today, days)
+    if window is None:
+        start = birthday_day_of_year(today)
+    else:
+        start, end = window
+        if start <= end:
+            stmt = stmt.where(Contact.birthday_doy.between(start, end))
+        else:
+            stmt = stmt.where(
+                or_(Contact.birthday_doy >= start, Contact.birthday_doy <= end)
+            )
+    stmt = stmt.order_by(
+        case((Contact.birthday_doy >= start, 0), else_=1), Contact.birthday_doy
+    )
+    result = await db.execute(stmt)
+    return result.scalars().all()
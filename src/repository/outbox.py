@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, update
+from src.databases.models import EmailOutbox
+
+VERIFICATION_EMAIL = "verification"
+PASSWORD_RESET_EMAIL = "password_reset"
+
+
+def utcnow() -> datetime:
+    """
+    Поточний час в UTC.
+    """
+    return datetime.now(timezone.utc)
+
+
+def enqueue_email(db, kind: str, recipient: str, payload: dict) -> EmailOutbox:
+    """
+    Додає лист до outbox у поточній транзакції (без commit).
+
+    Лист буде відправлено воркером лише після фіксації транзакції викликача.
+
+    Args:
+        db: Сесія бази даних.
+        kind (str): Тип листа (`VERIFICATION_EMAIL` або `PASSWORD_RESET_EMAIL`).
+        recipient (str): Email отримувача.
+        payload (dict): Дані для шаблону листа.
+
+    Returns:
+        EmailOutbox: Доданий запис.
+    """
+    email = EmailOutbox(
+        kind=kind,
+        recipient=recipient,
+        payload=payload,
+        status="pending",
+        attempts=0,
+        next_attempt_at=utcnow(),
+    )
+    db.add(email)
+    return email
+
+
+async def claim_emails(db, limit: int, lease_seconds: float) -> list[EmailOutbox]:
+    """
+    Забирає до `limit` листів, готових до відправлення, і фіксує транзакцію.
+
+    Рядки вибираються з `FOR UPDATE SKIP LOCKED`, тому кілька воркерів не
+    отримують один і той самий лист. Забраним листам збільшується лічильник
+    спроб, а `next_attempt_at` зсувається на `lease_seconds`: якщо воркер
+    впаде, не відправивши лист, той знову стане доступним після закінчення оренди.
+
+    Args:
+        db: Сесія бази даних.
+        limit (int): Максимальний розмір пакета.
+        lease_seconds (float): Тривалість оренди листа воркером.
+
+    Returns:
+        list[EmailOutbox]: Забрані листи.
+    """
+    now = utcnow()
+    due = (
+        select(EmailOutbox.id)
+        .where(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= now)
+        .order_by(EmailOutbox.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    result = await db.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.id.in_(due))
+        .values(
+            attempts=EmailOutbox.attempts + 1,
+            next_attempt_at=now + timedelta(seconds=lease_seconds),
+        )
+        .returning(EmailOutbox)
+        .execution_options(synchronize_session=False)
+    )
+    emails = result.scalars().all()
+    await db.commit()
+    return emails
+
+
+async def mark_sent(db, ids: list[int]):
+    """
+    Позначає листи відправленими.
+    """
+    if not ids:
+        return
+    await db.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.id.in_(ids))
+        .values(status="sent", sent_at=utcnow(), last_error=None)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+async def mark_failed(db, email_id: int, error: str, retry_in: float | None):
+    """
+    Записує помилку відправлення та планує наступну спробу.
+
+    Args:
+        db: Сесія бази даних.
+        email_id (int): Ідентифікатор листа.
+        error (str): Текст помилки.
+        retry_in (float | None): Затримка до наступної спроби в секундах
+            або None, якщо спроби вичерпано (лист отримує статус "failed").
+    """
+    values = {"last_error": error[:1000]}
+    if retry_in is None:
+        values["status"] = "failed"
+    else:
+        values["next_attempt_at"] = utcnow() + timedelta(seconds=retry_in)
+    await db.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.id == email_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
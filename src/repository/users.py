@@ -3,11 +3,13 @@ from sqlalchemy import select
 from src.auth.auth import Hash
 from src.databases.models import User
 from src.auth.auth import get_current_user
+from src.auth.principal import Principal
+from src.repository.outbox import enqueue_email, VERIFICATION_EMAIL
 
 hasher = Hash()
 
 
-async def admin_required(current_user = Depends(get_current_user)):
+async def admin_required(current_user: Principal = Depends(get_current_user)):
     if current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -16,13 +18,17 @@ async def admin_required(current_user = Depends(get_current_user)):
     return current_user
 
 
-async def create_user(user_data, db):
+async def create_user(user_data, db, verification_host: str | None = None):
     """
     Створює нового користувача у базі даних.
 
+    Якщо задано `verification_host`, лист підтвердження email додається
+    до outbox у тій самій транзакції, що й користувач.
+
     Args:
         user_data: Дані користувача, що включають ім'я, email і пароль.
         db: Сесія бази даних SQLAlchemy.
+        verification_host (str | None): Базовий URL для посилання в листі підтвердження.
 
     Returns:
         User: Створений об'єкт користувача.
@@ -30,13 +36,21 @@ async def create_user(user_data, db):
     user = User(
         username=user_data.username,
         email=user_data.email,
-        password=hasher.get_password_hash(user_data.password),
+        password=await hasher.get_password_hash_async(user_data.password),
         avatar=None,
         role = user_data.role
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    if verification_host is not None:
+        enqueue_email(
+            db,
+            VERIFICATION_EMAIL,
+            user.email,
+            {"username": user.username, "host": verification_host},
+        )
+    await db.commit()
+    # Сесія не скидає атрибути після commit, а всі значення за замовчуванням
+    # обчислюються на клієнті, тож повторний SELECT (refresh) не потрібен.
     return user
 
 
@@ -54,6 +68,6 @@ async def authenticate_user(email: str, password: str, db):
     """
     result = await db.execute(select(User).filter(User.email == email))
     user = result.scalars().first()
-    if not user or not hasher.verify_password(password, user.password):
+    if not user or not await hasher.verify_password_async(password, user.password):
         return None
     return user
@@ -6,7 +6,6 @@ from fastapi import (
     HTTPException,
     APIRouter,
     status,
-    BackgroundTasks,
     Request,
     Form,
 )
@@ -21,11 +20,16 @@ from src.auth.auth import (
     Hash,
 )
 from src.services.email_token import decode_email_token
-from src.services.email import send_verification_email, send_reset_email
+from src.cache_func.user_cache import invalidate_user
+from src.repository.outbox import enqueue_email, PASSWORD_RESET_EMAIL
+from src.services.rate_limit import RateLimiter
 
 hasher = Hash()
 
 router = APIRouter(prefix="/auth", tags=["auth"])
+
+login_rate_limit = RateLimiter(times=10, seconds=60, scope="login")
+signup_rate_limit = RateLimiter(times=5, seconds=60, scope="signup")
 templates = Jinja2Templates(directory="src/templates")
 
 
@@ -64,21 +68,21 @@ async def reset_password(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    user.password = hasher.get_password_hash(new_password)
-    db.commit()
+    user.password = await hasher.get_password_hash_async(new_password)
+    await db.commit()
+    await invalidate_user(user.email)
     return {"message": "Password updated successfully"}
 
 
 @router.post("/request-password-reset")
 async def request_password_reset(
-    email: str, background_tasks: BackgroundTasks, request: Request, db=Depends(get_db)
+    email: str, request: Request, db=Depends(get_db)
 ):
     """
-    Надсилає листа з посиланням на скидання пароля користувачу на email.
+    Ставить у чергу (outbox) листа з посиланням на скидання пароля користувачу на email.
 
     Args:
         email (str): Email-адреса користувача, який хоче скинути пароль.
-        background_tasks (BackgroundTasks): Об'єкт для фонової відправки email.
         request (Request): HTTP-запит, використовується для отримання базової URL-адреси.
         db (Session): Сесія бази даних.
 
@@ -93,9 +97,13 @@ async def request_password_reset(
     user = result.scalars().first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    background_tasks.add_task(
-        send_reset_email, user.email, user.username, str(request.base_url)
+    enqueue_email(
+        db,
+        PASSWORD_RESET_EMAIL,
+        user.email,
+        {"username": user.username, "host": str(request.base_url)},
     )
+    await db.commit()
     return {"message": "Reset link sent"}
 
 
@@ -124,14 +132,18 @@ async def verify_email(token: str, db=Depends(get_db)):
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
     user.confirmed = True
-    db.commit()
+    await db.commit()
+    await invalidate_user(user.email)
     return {"message": "Email successfully verified!"}
 
 
-@router.post("/signup", status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/signup",
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(signup_rate_limit)],
+)
 async def register(
     user: UserCreate,
-    background_tasks: BackgroundTasks,
     request: Request,
     db=Depends(get_db),
 ):
@@ -140,10 +152,12 @@ async def register(
 
     - **user**: дані користувача для реєстрації (username, email, password)
     - **request**: потрібен для побудови базового URL у листі
-    - **background_tasks**: використовується для надсилання email асинхронно
+    - Лист підтвердження записується в outbox у тій самій транзакції, що й
+      користувач, і відправляється окремим воркером
 
     Raises:
         - 409: якщо email вже зареєстрований
+        - 429: якщо з цієї IP-адреси перевищено ліміт реєстрацій (5 на хвилину)
 
     Returns:
         - email користувача у відповідь
@@ -154,17 +168,15 @@ async def register(
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT, detail="Email already registered"
         )
-    new_user = await create_user(user, db)
-    background_tasks.add_task(
-        send_verification_email,
-        new_user.email,
-        new_user.username,
-        str(request.base_url),
-    )
+    new_user = await create_user(user, db, verification_host=str(request.base_url))
     return {"Email": new_user.email}
 
 
-@router.post("/login", status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/login",
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(login_rate_limit)],
+)
 async def login(user: UserLogin, db=Depends(get_db)):
     """
     Авторизує користувача та повертає JWT токен доступу.
@@ -174,6 +186,7 @@ async def login(user: UserLogin, db=Depends(get_db)):
 
     Raises:
         - 401: якщо email або пароль неправильні
+        - 429: якщо з цієї IP-адреси перевищено ліміт спроб входу (10 на хвилину)
 
     Returns:
         - access_token (JWT)
@@ -1,19 +1,69 @@
-from fastapi import APIRouter, Depends, status, HTTPException, Query
+import csv
+import io
+from datetime import date
+from typing import Literal
+import orjson
+from sqlalchemy.exc import IntegrityError
+from fastapi.responses import StreamingResponse
+from fastapi import (
+    APIRouter,
+    Depends,
+    status,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    File,
+)
 from src.repository import crud
+from src.cache_func import contacts_cache
+from src.cache_func.etag import make_etag, etag_matches, not_modified, set_etag
+from src.services import contact_import, serialization
 from src.schemas.contact import (
     ContactCreate,
     ContactResponse,
     ContactUpdate,
+    ContactPatch,
     ContactBase,
     ContactDeleted,
+    ContactPage,
+    ContactImportResult,
+    ContactBatchRequest,
+    ContactBatchResponse,
 )
-from src.databases.connect import get_db
+from src.databases.connect import get_db, get_session_factory
 from src.auth.auth import get_current_user
 
 router = APIRouter(
     prefix="/contacts", tags=["contacts"], dependencies=[Depends(get_current_user)]
 )
 
+EXPORT_FIELDS = ("id", "first_name", "last_name", "email", "phone_number", "birthday")
+
+
+async def contacts_etag(user_id: int, endpoint: str, params: dict):
+    """
+    Обчислює ETag відповіді з версії контактів користувача в Redis.
+
+    Перевірка If-None-Match не звертається до PostgreSQL: ETag змінюється разом
+    з версією, яку збільшує кожна зміна контактів користувача.
+
+    Returns:
+        tuple[str | None, int | None]: ETag і версія (None, якщо Redis недоступний).
+    """
+    version = await contacts_cache.current_version(user_id)
+    if version is None:
+        return None, None
+    return make_etag(user_id, version, endpoint, sorted(params.items())), version
+
+
+def json_response(payload) -> Response:
+    """
+    Повертає вже серіалізовану JSON-відповідь без повторної обробки FastAPI.
+    """
+    return Response(content=payload, media_type="application/json")
+
 
 @router.post(
     "/",
@@ -35,26 +85,136 @@ async def create(
         Створений контакт.
     """
     contact = await crud.create_contact(contact, current_user, db)
+    await contacts_cache.bump_version(current_user.id)
     return contact
 
 
-@router.get("/", name="Get contacts", status_code=status.HTTP_200_OK)
-async def read_all(db=Depends(get_db), current_user=Depends(get_current_user)):
+@router.post(
+    "/import",
+    name="Import contacts",
+    response_model=ContactImportResult,
+    status_code=status.HTTP_200_OK,
+)
+async def import_contacts(
+    file: UploadFile = File(...),
+    format: Literal["csv", "ndjson"] | None = Query(None),
+    db=Depends(get_db),
+    current_user=Depends(get_current_user),
+):
     """
-    Отримує список усіх контактів поточного користувача.
+    Масово імпортує контакти з файлу CSV або NDJSON.
+
+    CSV має містити заголовок з колонками `first_name`, `last_name`, `email`,
+    `phone_number`, `birthday`; NDJSON — по одному JSON-об'єкту з тими ж полями
+    в кожному рядку. Файл обробляється пакетами, рядки з помилками або з email,
+    який вже існує, пропускаються та повертаються у звіті.
+
+    Parameters:
+        - file: файл для імпорту
+        - format: "csv" або "ndjson" (за замовчуванням визначається за файлом)
 
     Returns:
-        Список контактів.
+        Кількість імпортованих і відхилених рядків та помилки по рядках.
     """
-    contacts = await crud.get_contacts(current_user, db)
-    return contacts
+    try:
+        fmt = contact_import.detect_format(file, format)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Файл має бути у форматі CSV або NDJSON",
+        )
+    report = await contact_import.import_contacts(file, fmt, current_user, db)
+    if report["imported"]:
+        await contacts_cache.bump_version(current_user.id)
+    return report
+
+
+@router.post(
+    "/batch",
+    name="Batch contact operations",
+    response_model=ContactBatchResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def batch(
+    body: ContactBatchRequest,
+    db=Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """
+    Виконує пакет операцій створення, оновлення та видалення контактів в одній транзакції.
+
+    - **operations**: список операцій `{"op": "create", "data": {...}}`,
+      `{"op": "update", "id": 1, "data": {...}}` або `{"op": "delete", "id": 1}`
+
+    Returns:
+        Результат кожної операції (індекс, статус, id контакту, помилка).
+
+    Raises:
+        - 409: якщо оновлення конфліктує з існуючим email (жодна зміна не застосована)
+    """
+    try:
+        results = await crud.apply_batch(body.operations, current_user, db)
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Batch conflicts with existing contacts, no changes were applied",
+        )
+    if any(result["status"] < 400 for result in results):
+        await contacts_cache.bump_version(current_user.id)
+    return {"results": results}
+
+
+@router.get(
+    "/", name="Get contacts", response_model=ContactPage, status_code=status.HTTP_200_OK
+)
+async def read_all(
+    request: Request,
+    limit: int = Query(crud.DEFAULT_PAGE_SIZE, ge=1, le=crud.MAX_PAGE_SIZE),
+    after: str | None = Query(None),
+    db=Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """
+    Отримує сторінку контактів поточного користувача.
+
+    Parameters:
+        - limit: кількість контактів на сторінці (не більше за серверний максимум)
+        - after: курсор `next_cursor` з попередньої сторінки
+
+    Returns:
+        Сторінка контактів і курсор наступної сторінки
+        (або 304, якщо ETag з If-None-Match актуальний).
+    """
+    params = {"limit": limit, "after": after}
+    etag, version = await contacts_etag(current_user.id, "list", params)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    async def load():
+        try:
+            contacts, next_cursor = await crud.get_contacts(
+                current_user, db, limit, after
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        return serialization.dump_contact_page(contacts, next_cursor)
+
+    payload = await contacts_cache.cached_response(
+        current_user.id, "list", params, load, version
+    )
+    return set_etag(json_response(payload), etag)
 
 
 @router.get("/search", response_model=list[ContactBase])
 async def search_contacts(
+    request: Request,
+    q: str | None = Query(None, min_length=1, max_length=100),
     first_name=Query(None),
     last_name=Query(None),
     email=Query(None),
+    limit: int = Query(crud.DEFAULT_PAGE_SIZE, ge=1, le=crud.MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
     db=Depends(get_db),
     current_user=Depends(get_current_user),
 ):
@@ -62,33 +222,131 @@ async def search_contacts(
     Пошук контактів за ім'ям, прізвищем або email.
 
     Parameters:
+        - q: рядок для пошуку одночасно в імені, прізвищі та email (результати ранжовані)
         - first_name: ім’я (необов’язково)
         - last_name: прізвище (необов’язково)
         - email: email (необов’язково)
+        - limit: розмір сторінки для пошуку за `q`
+        - offset: зсув сторінки для пошуку за `q`
 
     Returns:
-        Список знайдених контактів.
+        Список знайдених контактів (або 304, якщо ETag з If-None-Match актуальний).
     """
-    find_contact = await crud.find_search(first_name, last_name, email, current_user, db)
-    if not find_contact:
-        raise HTTPException(status_code=404, detail="Contact not found")
-    return find_contact
+    params = {
+        "q": q,
+        "first_name": first_name,
+        "last_name": last_name,
+        "email": email,
+        "limit": limit if q else None,
+        "offset": offset if q else None,
+    }
+    etag, version = await contacts_etag(current_user.id, "search", params)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    async def load():
+        if q:
+            find_contact = await crud.search_contacts(
+                q, current_user, db, limit, offset
+            )
+        else:
+            find_contact = await crud.find_search(
+                first_name, last_name, email, current_user, db
+            )
+        if not find_contact:
+            raise HTTPException(status_code=404, detail="Contact not found")
+        return serialization.dump_contacts(find_contact)
+
+    payload = await contacts_cache.cached_response(
+        current_user.id, "search", params, load, version
+    )
+    return set_etag(json_response(payload), etag)
 
 
 @router.get("/upcoming-birthdays", response_model=list[ContactBase])
 async def get_upcoming_birthdays(
-    db=Depends(get_db), current_user=Depends(get_current_user)
+    days: int = Query(7, ge=0, le=366),
+    db=Depends(get_db),
+    current_user=Depends(get_current_user),
 ):
     """
-    Повертає список контактів з днем народження протягом наступного тижня.
+    Повертає список контактів з днем народження протягом наступних `days` днів.
+
+    Parameters:
+        - days: розмір вікна в днях (за замовчуванням тиждень)
 
     Returns:
         Список контактів з майбутніми днями народження.
     """
-    contacts_by_birthday = await crud.contacts_birthday(current_user, db)
-    if not contacts_by_birthday:
-        raise HTTPException(status_code=404, detail="Contact not found")
-    return contacts_by_birthday
+
+    async def load():
+        contacts_by_birthday = await crud.contacts_birthday(current_user, db, days)
+        if not contacts_by_birthday:
+            raise HTTPException(status_code=404, detail="Contact not found")
+        return serialization.dump_contacts(contacts_by_birthday)
+
+    params = {"days": days, "today": date.today().isoformat()}
+    payload = await contacts_cache.cached_response(
+        current_user.id, "birthdays", params, load
+    )
+    return json_response(payload)
+
+
+def export_ndjson(contacts) -> bytes:
+    """
+    Серіалізує пакет контактів у NDJSON (по одному об'єкту в рядку).
+    """
+    return b"".join(
+        orjson.dumps({field: getattr(contact, field) for field in EXPORT_FIELDS})
+        + b"\n"
+        for contact in contacts
+    )
+
+
+def export_csv(contacts) -> str:
+    """
+    Серіалізує пакет контактів у рядки CSV.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(
+        [getattr(contact, field) for field in EXPORT_FIELDS] for contact in contacts
+    )
+    return buffer.getvalue()
+
+
+@router.get("/export", name="Export contacts")
+async def export_contacts(
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    session_factory=Depends(get_session_factory),
+    current_user=Depends(get_current_user),
+):
+    """
+    Потоково вивантажує всі контакти поточного користувача у форматі NDJSON або CSV.
+
+    Контакти читаються з бази серверним курсором пакетами і відразу
+    передаються клієнту, тому пам'ять не залежить від кількості контактів.
+
+    Parameters:
+        - format: "ndjson" (за замовчуванням) або "csv"
+
+    Returns:
+        Потокова відповідь з файлом контактів.
+    """
+
+    async def generate():
+        if format == "csv":
+            yield ",".join(EXPORT_FIELDS) + "\r\n"
+        async with session_factory() as session:
+            async for contacts in crud.stream_contacts(current_user, session):
+                yield export_csv(contacts) if format == "csv" else export_ndjson(contacts)
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        generate(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="contacts.{format}"'},
+    )
 
 
 @router.get(
@@ -97,7 +355,12 @@ async def get_upcoming_birthdays(
     response_model=ContactBase,
     status_code=status.HTTP_200_OK,
 )
-async def read(contact_id, db=Depends(get_db), current_user=Depends(get_current_user)):
+async def read(
+    request: Request,
+    contact_id: int,
+    db=Depends(get_db),
+    current_user=Depends(get_current_user),
+):
     """
     Отримує контакт за його унікальним ідентифікатором.
 
@@ -107,10 +370,13 @@ async def read(contact_id, db=Depends(get_db), current_user=Depends(get_current_
     Returns:
         Об'єкт контакту.
     """
+    etag, _ = await contacts_etag(current_user.id, "contact", {"id": contact_id})
+    if etag_matches(request, etag):
+        return not_modified(etag)
     contact = await crud.get_contact_by_ID(contact_id, current_user, db)
     if contact is None:
         raise HTTPException(status_code=404, detail="Contact not found")
-    return contact
+    return set_etag(json_response(serialization.dump_contact(contact)), etag)
 
 
 @router.put(
@@ -121,7 +387,7 @@ async def read(contact_id, db=Depends(get_db), current_user=Depends(get_current_
 )
 async def update(
     contact: ContactUpdate,
-    contact_id,
+    contact_id: int,
     db=Depends(get_db),
     current_user=Depends(get_current_user),
 ):
@@ -138,14 +404,46 @@ async def update(
     updated = await crud.update_contact(contact, contact_id, current_user, db)
     if updated is None:
         raise HTTPException(status_code=404, detail="Contact not found")
-    return updated
+    await contacts_cache.bump_version(current_user.id)
+    return json_response(serialization.dump_contact(updated))
+
+
+@router.patch(
+    "/{contact_id}",
+    name="Patch contact By ID",
+    response_model=ContactBase,
+    status_code=status.HTTP_200_OK,
+)
+async def patch(
+    contact: ContactPatch,
+    contact_id: int,
+    db=Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """
+    Частково оновлює контакт за вказаним ID: змінюються лише передані поля.
+
+    Parameters:
+        - contact_id: ID контакту
+        - contact: поля, які потрібно змінити
+
+    Returns:
+        Оновлений контакт.
+    """
+    updated = await crud.update_contact(
+        contact, contact_id, current_user, db, partial=True
+    )
+    if updated is None:
+        raise HTTPException(status_code=404, detail="Contact not found")
+    await contacts_cache.bump_version(current_user.id)
+    return json_response(serialization.dump_contact(updated))
 
 
 @router.delete(
     "/{contact_id}", name="Delete contact By ID", response_model=ContactDeleted
 )
 async def delete(
-    contact_id, db=Depends(get_db), current_user=Depends(get_current_user)
+    contact_id: int, db=Depends(get_db), current_user=Depends(get_current_user)
 ):
     """
     Видаляє контакт за ID.
@@ -159,4 +457,5 @@ async def delete(
     deleted = await crud.delete_contact(contact_id, current_user, db)
     if deleted is None:
         raise HTTPException(status_code=404, detail="Contact not found")
+    await contacts_cache.bump_version(current_user.id)
     return deleted
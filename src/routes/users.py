@@ -1,18 +1,30 @@
-from slowapi import Limiter
-from fastapi import Request, APIRouter, Depends, UploadFile, HTTPException, status, File
-from slowapi.util import get_remote_address
+from sqlalchemy import update
+from fastapi import (
+    Request,
+    Response,
+    APIRouter,
+    Depends,
+    UploadFile,
+    HTTPException,
+    status,
+    File,
+)
 from src.auth.auth import get_current_user
 from src.databases.connect import get_db
 from src.databases.models import User
+from src.auth.principal import Principal
 from src.schemas.user import UserOut
-from src.services.update_avatar import upload_avatar
+from src.services.storage import AvatarStorage, get_storage, read_upload
+from src.services.update_avatar import store_avatar
 from src.cache_func.user_cache import set_user_to_cache
 from src.repository.users import admin_required
+from src.services.rate_limit import UserRateLimiter
+from src.cache_func.etag import make_etag, etag_matches, not_modified, set_etag
 
 
 router = APIRouter(prefix="/users", tags=["users"])
 
-limiter = Limiter(key_func=get_remote_address)
+me_rate_limit = UserRateLimiter(times=10, seconds=60, scope="me")
 
 
 @router.get(
@@ -20,21 +32,30 @@ limiter = Limiter(key_func=get_remote_address)
     response_model=UserOut,
     status_code=status.HTTP_200_OK,
     description="No more than 10 requests per minute",
+    dependencies=[Depends(me_rate_limit)],
 )
-@limiter.limit("5/minute")
-async def me(request: Request, user: User = Depends(get_current_user)):
+async def me(
+    request: Request, response: Response, user: Principal = Depends(get_current_user)
+):
     """
     Получить информацию о текущем аутентифицированном пользователе.
 
-    Ограничение: не более 5 запросов в минуту.
+    Ограничение: не более 10 запросов в минуту на пользователя
+    (общий для всех процессов лимит в Redis).
 
     Args:
         request (Request): HTTP запрос.
-        user (User): Текущий пользователь, полученный через Depends.
+        response (Response): Ответ, в который добавляется ETag.
+        user (Principal): Текущий пользователь, полученный через Depends.
 
     Returns:
-        UserOut: Модель с информацией о пользователе.
+        UserOut: Модель с информацией о пользователе
+        (или 304, если ETag из If-None-Match совпадает).
     """
+    etag = make_etag("me", *user.to_dict().values())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return user
 
 
@@ -43,40 +64,54 @@ async def me(request: Request, user: User = Depends(get_current_user)):
 )
 async def update_avatar(
     file: UploadFile = File(...),
-    current_user: User = Depends(admin_required),
+    current_user: Principal = Depends(admin_required),
     db=Depends(get_db),
+    storage: AvatarStorage = Depends(get_storage),
 ):
     """
     Обновить аватар текущего пользователя.
 
-    Принимает файл изображения, проверяет его тип,
-    загружает на внешний сервис (upload_avatar),
-    обновляет URL аватара в базе данных и возвращает новый URL.
+    Принимает файл изображения, проверяет его тип и размер, создаёт миниатюры
+    WebP в пуле процессов и сохраняет их в хранилище аватаров (Cloudinary или
+    локальный каталог) без блокировки цикла событий. Повторно загруженное
+    изображение не обрабатывается и не сохраняется ещё раз. Обновляет URL
+    аватара в базе данных и возвращает новый URL.
 
     Args:
         file (UploadFile): Загружаемый файл (требуется быть изображением).
-        current_user (User): Текущий пользователь из Depends.
-        db (Session): Сессия базы данных из Depends.
+        current_user (Principal): Текущий пользователь из Depends.
+        db (AsyncSession): Сессия базы данных из Depends.
+        storage (AvatarStorage): Хранилище аватаров из Depends.
 
     Raises:
-        HTTPException: если файл не является изображением.
+        HTTPException: 400, если файл не является изображением
+            или не декодируется;
+            413, если файл больше `AVATAR_MAX_BYTES`.
 
     Returns:
         dict: Словарь с ключом "avatar_url" и значением - URL загруженного аватара.
     """
-    if not file.content_type.startswith("image/"):
+    if not (file.content_type or "").startswith("image/"):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Файл має бути зображенням"
         )
 
-    public_id = f"user_avatars/{current_user.id}"
-    avatar_url = upload_avatar(file, public_id)
-    user = db.query(User).filter(User.id == current_user.id).first()
+    data = await read_upload(file)
+    try:
+        avatar_url = await store_avatar(data, storage)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Файл має бути зображенням"
+        )
+    result = await db.execute(
+        update(User)
+        .where(User.id == current_user.id)
+        .values(avatar=avatar_url)
+        .returning(User)
+    )
+    user = result.scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-
-    user.avatar = avatar_url
-    db.commit()
-    db.refresh(user)
+    await db.commit()
     await set_user_to_cache(user)
     return {"avatar_url": avatar_url}
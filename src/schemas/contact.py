@@ -1,21 +1,47 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field, field_validator
+from typing import Annotated, Literal, Optional, Union
 from datetime import date
 
 
+MAX_BATCH_OPERATIONS = 1000
+
+# Довжини відповідають стовпцям таблиці contacts
+Name = Annotated[str, Field(max_length=50)]
+ContactEmail = Annotated[EmailStr, Field(max_length=100)]
+PhoneNumber = Annotated[str, Field(max_length=20)]
+
+
 class ContactBase(BaseModel):
-    first_name: str
-    last_name: str
-    email: EmailStr
-    phone_number: str
-    birthday: date
+    first_name: Name
+    last_name: Name
+    email: ContactEmail
+    phone_number: PhoneNumber
+    # Стовпець допускає NULL: PATCH може очистити день народження
+    birthday: Optional[date]
 
 
 class ContactCreate(ContactBase):
-    pass
+    birthday: date
 
 
 class ContactUpdate(ContactBase):
-    pass
+    birthday: date
+
+
+class ContactPatch(BaseModel):
+    first_name: Optional[Name] = None
+    last_name: Optional[Name] = None
+    email: Optional[ContactEmail] = None
+    phone_number: Optional[PhoneNumber] = None
+    birthday: Optional[date] = None
+
+    @field_validator("first_name", "last_name", "email", "phone_number")
+    @classmethod
+    def not_null(cls, value):
+        # Явний null дозволений лише для birthday: інші стовпці NOT NULL
+        if value is None:
+            raise ValueError("Field cannot be null")
+        return value
 
 
 class ContactResponse(BaseModel):
@@ -28,3 +54,66 @@ class ContactResponse(BaseModel):
 
 class ContactDeleted(BaseModel):
     id: int
+
+
+class ContactOut(ContactBase):
+    id: int
+
+    class Config:
+        from_attributes = True
+
+
+class ContactPage(BaseModel):
+    items: list[ContactOut]
+    next_cursor: Optional[str] = None
+
+
+class ContactImportError(BaseModel):
+    row: int
+    error: str
+
+
+class ContactImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: list[ContactImportError]
+
+
+class ContactCreateOperation(BaseModel):
+    op: Literal["create"]
+    data: ContactCreate
+
+
+class ContactUpdateOperation(BaseModel):
+    op: Literal["update"]
+    id: int
+    data: ContactUpdate
+
+
+class ContactDeleteOperation(BaseModel):
+    op: Literal["delete"]
+    id: int
+
+
+ContactOperation = Annotated[
+    Union[ContactCreateOperation, ContactUpdateOperation, ContactDeleteOperation],
+    Field(discriminator="op"),
+]
+
+
+class ContactBatchRequest(BaseModel):
+    operations: list[ContactOperation] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_OPERATIONS
+    )
+
+
+class ContactOperationResult(BaseModel):
+    index: int
+    op: str
+    status: int
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class ContactBatchResponse(BaseModel):
+    results: list[ContactOperationResult]
@@ -0,0 +1,110 @@
+"""
+Налаштування сервера uvicorn для `python main.py`.
+
+`APP_ENV=development` (за замовчуванням) — один процес з автоперезавантаженням.
+`APP_ENV=production` — кілька воркерів (за замовчуванням по одному на доступне
+ядро контейнера), uvloop і httptools, налаштовані backlog і keep-alive та
+коректна зупинка: нові з'єднання не приймаються, запити, що виконуються,
+завершуються (не довше `GRACEFUL_SHUTDOWN_TIMEOUT` секунд), після чого
+lifespan кожного воркера закриває пули бази даних і Redis.
+
+Воркери запускаються як окремі процеси й імпортують застосунок заново,
+тож з'єднання, пули та фонові задачі створюються вже в кожному воркері
+(у lifespan або при першому використанні).
+"""
+import logging
+import math
+import os
+from importlib.util import find_spec
+from src.databases.connect import DB_MAX_OVERFLOW, DB_POOL_SIZE
+
+logger = logging.getLogger(__name__)
+
+APP_ENV = os.getenv("APP_ENV", "development").lower()
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "0"))
+SERVER_BACKLOG = int(os.getenv("SERVER_BACKLOG", "2048"))
+KEEP_ALIVE_TIMEOUT = int(os.getenv("KEEP_ALIVE_TIMEOUT", "65"))
+GRACEFUL_SHUTDOWN_TIMEOUT = int(os.getenv("GRACEFUL_SHUTDOWN_TIMEOUT", "30"))
+LIMIT_CONCURRENCY = int(os.getenv("LIMIT_CONCURRENCY", "0"))
+LIMIT_MAX_REQUESTS = int(os.getenv("LIMIT_MAX_REQUESTS", "0"))
+ACCESS_LOG = os.getenv("ACCESS_LOG", "true").lower() == "true"
+FORWARDED_ALLOW_IPS = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", "100"))
+
+CGROUP_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+
+
+def available_cpus(cpu_max_path: str = CGROUP_CPU_MAX) -> int:
+    """
+    Повертає кількість ядер, доступних процесу.
+
+    Враховує прив'язку до ядер (cpuset) і квоту CPU контейнера (cgroup v2
+    `cpu.max`), тому в контейнері з `--cpus=2` на 32-ядерному вузлі повертає 2.
+
+    Args:
+        cpu_max_path (str): Шлях до файлу квоти cgroup.
+
+    Returns:
+        int: Кількість ядер (не менше 1).
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open(cpu_max_path) as f:
+            quota, period = f.read().split()[:2]
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(1, cpus)
+
+
+def worker_count() -> int:
+    """
+    Кількість воркерів: `WEB_CONCURRENCY` або по одному на доступне ядро.
+    """
+    return WEB_CONCURRENCY if WEB_CONCURRENCY > 0 else available_cpus()
+
+
+def server_options(env: str = APP_ENV) -> dict:
+    """
+    Формує іменовані аргументи для `uvicorn.run`.
+
+    Args:
+        env (str): Режим запуску ("development" або "production").
+
+    Returns:
+        dict: Параметри сервера.
+    """
+    if env != "production":
+        return {"host": HOST, "port": PORT, "reload": True}
+
+    workers = worker_count()
+    connections = workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+    if connections > DB_MAX_CONNECTIONS:
+        logger.warning(
+            "%d workers may open up to %d database connections (DB_MAX_CONNECTIONS=%d); "
+            "lower DB_POOL_SIZE/DB_MAX_OVERFLOW or WEB_CONCURRENCY",
+            workers,
+            connections,
+            DB_MAX_CONNECTIONS,
+        )
+    return {
+        "host": HOST,
+        "port": PORT,
+        "workers": workers,
+        "loop": "uvloop" if find_spec("uvloop") else "asyncio",
+        "http": "httptools" if find_spec("httptools") else "h11",
+        "backlog": SERVER_BACKLOG,
+        "timeout_keep_alive": KEEP_ALIVE_TIMEOUT,
+        "timeout_graceful_shutdown": GRACEFUL_SHUTDOWN_TIMEOUT,
+        "limit_concurrency": LIMIT_CONCURRENCY or None,
+        "limit_max_requests": LIMIT_MAX_REQUESTS or None,
+        "access_log": ACCESS_LOG,
+        "proxy_headers": True,
+        "forwarded_allow_ips": FORWARDED_ALLOW_IPS,
+    }
@@ -0,0 +1,158 @@
+import csv
+import io
+import json
+import os
+from fastapi import UploadFile
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+from src.schemas.contact import ContactCreate
+from src.repository import crud
+
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", "1000"))
+
+
+def detect_format(file: UploadFile, requested: str | None = None) -> str:
+    """
+    Визначає формат файлу імпорту: явно заданий, за розширенням або за content-type.
+
+    Args:
+        file (UploadFile): Завантажений файл.
+        requested (str | None): Формат з параметра запиту ("csv" або "ndjson").
+
+    Returns:
+        str: "csv" або "ndjson".
+
+    Raises:
+        ValueError: Якщо формат не вдалося визначити.
+    """
+    if requested:
+        return requested
+    name = (file.filename or "").lower()
+    content_type = (file.content_type or "").lower()
+    if name.endswith((".ndjson", ".jsonl")) or "ndjson" in content_type:
+        return "ndjson"
+    if name.endswith(".csv") or "csv" in content_type:
+        return "csv"
+    raise ValueError("Unsupported import format")
+
+
+def iter_records(file, fmt: str):
+    """
+    Послідовно читає записи з файлу, не завантажуючи його в пам'ять повністю.
+
+    Yields:
+        tuple[int, dict | None, str | None]: Номер рядка даних, запис і помилка розбору.
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8", errors="replace", newline="")
+    try:
+        if fmt == "csv":
+            for row_no, record in enumerate(csv.DictReader(text), start=1):
+                yield row_no, record, None
+        else:
+            row_no = 0
+            for line in text:
+                if not line.strip():
+                    continue
+                row_no += 1
+                try:
+                    record = json.loads(line)
+                except ValueError as exc:
+                    yield row_no, None, f"Invalid JSON: {exc}"
+                    continue
+                if not isinstance(record, dict):
+                    yield row_no, None, "Expected a JSON object"
+                    continue
+                yield row_no, record, None
+    finally:
+        text.detach()
+
+
+def read_batch(records, size: int) -> list:
+    """
+    Забирає з ітератора до `size` записів (виконується в пулі потоків).
+    """
+    batch = []
+    for item in records:
+        batch.append(item)
+        if len(batch) >= size:
+            break
+    return batch
+
+
+def validate_batch(batch, current_user, report: dict) -> list[tuple[int, dict]]:
+    """
+    Перевіряє записи пакета схемою `ContactCreate` і відкидає дублікати email у пакеті.
+
+    Returns:
+        list[tuple[int, dict]]: Номери рядків і значення для вставки.
+    """
+    rows = []
+    seen = set()
+    for row_no, record, error in batch:
+        if error is None:
+            try:
+                contact = ContactCreate.model_validate(record)
+            except ValidationError as exc:
+                error = "; ".join(
+                    f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}"
+                    for item in exc.errors()
+                )
+            else:
+                if contact.email in seen:
+                    error = "Duplicate email in file"
+                else:
+                    seen.add(contact.email)
+                    rows.append((row_no, crud.contact_values(contact, current_user)))
+        if error is not None:
+            add_error(report, row_no, error)
+    return rows
+
+
+def add_error(report: dict, row_no: int, error: str):
+    """
+    Додає помилку рядка до звіту (деталі зберігаються не більше `IMPORT_MAX_ERRORS`).
+    """
+    report["failed"] += 1
+    if len(report["errors"]) < IMPORT_MAX_ERRORS:
+        report["errors"].append({"row": row_no, "error": error})
+
+
+async def import_contacts(file: UploadFile, fmt: str, current_user, db) -> dict:
+    """
+    Імпортує контакти з CSV або NDJSON пакетами по `IMPORT_BATCH_SIZE` записів.
+
+    Файл читається потоково, кожен пакет перевіряється в пулі потоків (щоб не
+    блокувати цикл подій), вставляється багаторядковим `INSERT ... ON CONFLICT
+    DO NOTHING` і фіксується окремою транзакцією, тому використання пам'яті
+    не залежить від розміру файлу.
+
+    Args:
+        file (UploadFile): Завантажений файл.
+        fmt (str): "csv" або "ndjson".
+        current_user: Поточний користувач.
+        db: Сесія бази даних.
+
+    Returns:
+        dict: Кількість імпортованих і відхилених рядків та помилки по рядках.
+    """
+    report = {"imported": 0, "failed": 0, "errors": []}
+    records = iter_records(file.file, fmt)
+    try:
+        while True:
+            batch = await run_in_threadpool(read_batch, records, IMPORT_BATCH_SIZE)
+            if not batch:
+                break
+            rows = await run_in_threadpool(validate_batch, batch, current_user, report)
+            if not rows:
+                continue
+            inserted = await crud.insert_contacts([values for _, values in rows], db)
+            await db.commit()
+            for row_no, values in rows:
+                if values["email"] in inserted:
+                    report["imported"] += 1
+                else:
+                    add_error(report, row_no, "Contact with this email already exists")
+    finally:
+        records.close()
+    return report
@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import os
+import time
+from sqlalchemy import text
+from src.cache_func.redis_client import get_redis
+from src.databases.connect import engine
+
+logger = logging.getLogger(__name__)
+
+HEALTH_CHECK_INTERVAL = float(os.getenv("HEALTH_CHECK_INTERVAL", "10"))
+HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", "2"))
+HEALTH_MAX_AGE = float(os.getenv("HEALTH_MAX_AGE", str(3 * HEALTH_CHECK_INTERVAL)))
+HEALTH_REQUIRED = frozenset(
+    name for name in os.getenv("HEALTH_REQUIRED", "database,redis").split(",") if name
+)
+POOL_SATURATION_THRESHOLD = float(os.getenv("POOL_SATURATION_THRESHOLD", "0.9"))
+
+
+async def check_database():
+    """
+    Виконує `SELECT 1` на окремому з'єднанні з пулу.
+    """
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def check_redis():
+    """
+    Перевіряє Redis командою PING.
+    """
+    await get_redis().ping()
+
+
+async def check_smtp():
+    """
+    Перевіряє, що SMTP-сервер приймає TCP-з'єднання (без рукостискання SMTP).
+    """
+    host = os.getenv("MAIL_SERVER")
+    if not host:
+        raise RuntimeError("MAIL_SERVER is not configured")
+    _, writer = await asyncio.open_connection(host, int(os.getenv("MAIL_PORT", "587")))
+    writer.close()
+    await writer.wait_closed()
+
+
+def pool_status(pool=None) -> dict:
+    """
+    Повертає стан пулу з'єднань з базою даних (без звернень до бази).
+
+    Returns:
+        dict: Кількість виданих з'єднань, ємність пулу та його заповненість (0–1).
+    """
+    pool = pool if pool is not None else engine.pool
+    if not hasattr(pool, "checkedout"):
+        return {"checked_out": 0, "capacity": None, "saturation": 0.0}
+    checked_out = pool.checkedout()
+    capacity = pool.size() + max(getattr(pool, "_max_overflow", 0), 0)
+    return {
+        "checked_out": checked_out,
+        "capacity": capacity,
+        "saturation": round(checked_out / capacity, 3) if capacity else 0.0,
+    }
+
+
+class HealthMonitor:
+    """
+    Фонова перевірка залежностей застосунку для `/health/ready`.
+
+    Перевірки виконуються паралельно раз на `interval` секунд у фоновій задачі,
+    а маршрут лише читає збережений результат, тож частота запитів оркестратора
+    не впливає на навантаження на базу даних, Redis і SMTP. Застосунок вважається
+    готовим, якщо обов'язкові перевірки (`HEALTH_REQUIRED`) успішні, результат
+    не застарів і пул з'єднань з базою не заповнений.
+    """
+
+    def __init__(
+        self,
+        checks: dict | None = None,
+        required: frozenset = HEALTH_REQUIRED,
+        interval: float = HEALTH_CHECK_INTERVAL,
+        timeout: float = HEALTH_CHECK_TIMEOUT,
+        max_age: float = HEALTH_MAX_AGE,
+    ):
+        self.checks = checks or {
+            "database": check_database,
+            "redis": check_redis,
+            "smtp": check_smtp,
+        }
+        self.required = required
+        self.interval = interval
+        self.timeout = timeout
+        self.max_age = max_age
+        self.results: dict[str, dict] = {}
+        self.checked_at: float | None = None
+
+    async def _probe(self, check) -> dict:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(check(), self.timeout)
+        except asyncio.TimeoutError:
+            error = f"timed out after {self.timeout}s"
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+        else:
+            error = None
+        return {
+            "ok": error is None,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+            "error": error,
+        }
+
+    async def refresh(self):
+        """
+        Виконує всі перевірки та зберігає результат.
+        """
+        names = list(self.checks)
+        results = await asyncio.gather(*(self._probe(self.checks[n]) for n in names))
+        for name, result in zip(names, results):
+            previous = self.results.get(name)
+            if previous is not None and previous["ok"] != result["ok"]:
+                logger.warning(
+                    "Health check %s is now %s: %s",
+                    name,
+                    "ok" if result["ok"] else "failing",
+                    result["error"],
+                )
+        self.results = dict(zip(names, results))
+        self.checked_at = time.monotonic()
+
+    async def run(self):
+        """
+        Оновлює результат кожні `interval` секунд, доки задачу не скасовано.
+        """
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Health check refresh failed")
+            await asyncio.sleep(self.interval)
+
+    def snapshot(self) -> dict:
+        """
+        Повертає останній результат перевірок і поточний стан пулу.
+
+        Returns:
+            dict: `status` ("ok", "starting" або "unavailable"), вік результату,
+            результати перевірок та стан пулу з'єднань.
+        """
+        pool = pool_status()
+        if self.checked_at is None:
+            return {"status": "starting", "checks": {}, "pool": pool}
+        age = time.monotonic() - self.checked_at
+        ready = (
+            age <= self.max_age
+            and all(self.results.get(name, {}).get("ok") for name in self.required)
+            and pool["saturation"] < POOL_SATURATION_THRESHOLD
+        )
+        return {
+            "status": "ok" if ready else "unavailable",
+            "age_seconds": round(age, 2),
+            "checks": self.results,
+            "pool": pool,
+        }
+
+
+monitor = HealthMonitor()
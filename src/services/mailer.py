@@ -0,0 +1,326 @@
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from email.message import EmailMessage
+from email.utils import formataddr, make_msgid
+import aiosmtplib
+from dotenv import load_dotenv
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from src.services.metrics import EMAIL_SEND_DURATION
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+MAIL_POOL_SIZE = int(os.getenv("MAIL_POOL_SIZE", "2"))
+MAIL_QUEUE_SIZE = int(os.getenv("MAIL_QUEUE_SIZE", "1000"))
+MAIL_TIMEOUT = float(os.getenv("MAIL_TIMEOUT", "10"))
+MAIL_MAX_RETRIES = int(os.getenv("MAIL_MAX_RETRIES", "3"))
+MAIL_RETRY_DELAY = float(os.getenv("MAIL_RETRY_DELAY", "1"))
+MAIL_IDLE_TIMEOUT = float(os.getenv("MAIL_IDLE_TIMEOUT", "60"))
+MAIL_STARTTLS = os.getenv("MAIL_STARTTLS", "true").lower() == "true"
+MAIL_SSL_TLS = os.getenv("MAIL_SSL_TLS", "false").lower() == "true"
+MAIL_VALIDATE_CERTS = os.getenv("MAIL_VALIDATE_CERTS", "false").lower() == "true"
+
+TEMPLATE_FOLDER = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "../templates")
+)
+
+templates = Environment(
+    loader=FileSystemLoader(TEMPLATE_FOLDER),
+    autoescape=select_autoescape(["html"]),
+)
+
+TRANSIENT_ERRORS = (
+    aiosmtplib.SMTPServerDisconnected,
+    aiosmtplib.SMTPConnectError,
+    aiosmtplib.SMTPTimeoutError,
+    OSError,
+    asyncio.TimeoutError,
+)
+
+
+def render(template_name: str, context: dict) -> str:
+    """
+    Рендерить HTML-шаблон листа (шаблони компілюються один раз і кешуються Jinja).
+    """
+    return templates.get_template(template_name).render(**context)
+
+
+def build_message(
+    recipient: str, subject: str, html: str, sender: str, sender_name: str | None
+) -> EmailMessage:
+    """
+    Створює HTML-лист.
+
+    Args:
+        recipient (str): Email отримувача.
+        subject (str): Тема листа.
+        html (str): HTML-тіло листа.
+        sender (str): Email відправника.
+        sender_name (str | None): Ім'я відправника.
+
+    Returns:
+        EmailMessage: Лист, готовий до відправлення.
+    """
+    message = EmailMessage()
+    message["From"] = formataddr((sender_name or "", sender))
+    message["To"] = recipient
+    message["Subject"] = subject
+    message["Message-ID"] = make_msgid()
+    message.set_content(html, subtype="html")
+    return message
+
+
+class Mailer:
+    """
+    Відправник листів з пулом постійних SMTP-з'єднань.
+
+    Листи потрапляють у чергу, яку обробляють `pool_size` воркерів. Кожен воркер
+    тримає власне автентифіковане з'єднання і відправляє через нього листи
+    один за одним, тож рукостискання (connect, STARTTLS, AUTH) виконується
+    один раз на з'єднання, а не на кожен лист. Розірване з'єднання
+    відновлюється, а лист відправляється повторно (до `max_retries` разів).
+    З'єднання, що простоювало довше за `idle_timeout`, закривається.
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        username: str | None = None,
+        password: str | None = None,
+        sender: str | None = None,
+        sender_name: str | None = None,
+        start_tls: bool = MAIL_STARTTLS,
+        use_tls: bool = MAIL_SSL_TLS,
+        validate_certs: bool = MAIL_VALIDATE_CERTS,
+        pool_size: int = MAIL_POOL_SIZE,
+        queue_size: int = MAIL_QUEUE_SIZE,
+        timeout: float = MAIL_TIMEOUT,
+        max_retries: int = MAIL_MAX_RETRIES,
+        retry_delay: float = MAIL_RETRY_DELAY,
+        idle_timeout: float = MAIL_IDLE_TIMEOUT,
+    ):
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.sender = sender or username
+        self.sender_name = sender_name
+        self.start_tls = start_tls
+        self.use_tls = use_tls
+        self.validate_certs = validate_certs
+        self.pool_size = pool_size
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.idle_timeout = idle_timeout
+        self.queue: asyncio.Queue | None = None
+        self.workers: list[asyncio.Task] = []
+        self._loop = None
+        self.latencies = deque(maxlen=1000)
+        self.stats = {"sent": 0, "failed": 0, "retries": 0, "connects": 0}
+
+    def start(self):
+        """
+        Запускає воркерів у поточному циклі подій (повторний виклик нічого не робить).
+        """
+        loop = asyncio.get_running_loop()
+        if self.workers and self._loop is loop:
+            return
+        self._loop = loop
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.workers = [
+            asyncio.create_task(self._worker(), name=f"mailer-{index}")
+            for index in range(self.pool_size)
+        ]
+
+    async def stop(self, timeout: float = 10.0):
+        """
+        Чекає відправлення листів з черги (не довше `timeout` секунд) і зупиняє воркерів.
+        """
+        if not self.workers:
+            return
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Mailer stopped with %d queued messages", self.queue.qsize())
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+    async def send(self, message: EmailMessage):
+        """
+        Ставить лист у чергу і чекає, доки його буде відправлено.
+
+        Raises:
+            aiosmtplib.SMTPException | OSError: Якщо лист не вдалося відправити.
+        """
+        self.start()
+        delivered = asyncio.get_running_loop().create_future()
+        await self.queue.put((message, delivered))
+        await delivered
+
+    async def send_template(
+        self, recipient: str, subject: str, template_name: str, context: dict
+    ):
+        """
+        Рендерить шаблон і відправляє лист через пул з'єднань.
+        """
+        html = render(template_name, context)
+        await self.send(
+            build_message(recipient, subject, html, self.sender, self.sender_name)
+        )
+
+    def snapshot(self) -> dict:
+        """
+        Повертає статистику: кількість листів, глибину черги та затримку відправлення.
+        """
+        latencies = sorted(self.latencies)
+        p95 = latencies[int((len(latencies) - 1) * 0.95)] if latencies else 0.0
+        return {
+            **self.stats,
+            "queue_depth": self.queue.qsize() if self.queue else 0,
+            "avg_latency_ms": (
+                sum(latencies) / len(latencies) * 1000 if latencies else 0.0
+            ),
+            "p95_latency_ms": p95 * 1000,
+        }
+
+    def _client(self) -> aiosmtplib.SMTP:
+        return aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            username=self.username,
+            password=self.password,
+            start_tls=self.start_tls,
+            use_tls=self.use_tls,
+            validate_certs=self.validate_certs,
+            timeout=self.timeout,
+        )
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        smtp = self._client()
+        await smtp.connect()
+        self.stats["connects"] += 1
+        return smtp
+
+    @staticmethod
+    async def _close(smtp: aiosmtplib.SMTP | None):
+        if smtp is None or not smtp.is_connected:
+            return
+        try:
+            await smtp.quit()
+        except (aiosmtplib.SMTPException, OSError, asyncio.TimeoutError):
+            smtp.close()
+
+    async def _deliver(self, smtp, message: EmailMessage):
+        """
+        Відправляє лист, відновлюючи з'єднання після мережевих помилок.
+
+        Після будь-якої помилки з'єднання закрите, тож воркер починає
+        наступний лист з нового з'єднання.
+
+        Returns:
+            aiosmtplib.SMTP | None: З'єднання для наступних листів.
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                if smtp is None or not smtp.is_connected:
+                    smtp = await self._connect()
+                await smtp.send_message(message)
+                return smtp
+            except TRANSIENT_ERRORS as exc:
+                await self._close(smtp)
+                smtp = None
+                if attempt == self.max_retries:
+                    raise
+                self.stats["retries"] += 1
+                logger.warning("SMTP delivery failed (%s), reconnecting", exc)
+                await asyncio.sleep(self.retry_delay * 2**attempt)
+            except BaseException:
+                # З'єднання могло бути відкрите тут, а воркер його не отримає,
+                # тому воно закривається разом з помилкою
+                await self._close(smtp)
+                raise
+
+    async def _worker(self):
+        smtp = None
+        try:
+            while True:
+                try:
+                    message, delivered = await asyncio.wait_for(
+                        self.queue.get(), self.idle_timeout
+                    )
+                except asyncio.TimeoutError:
+                    await self._close(smtp)
+                    smtp = None
+                    continue
+                started = time.perf_counter()
+                try:
+                    smtp = await self._deliver(smtp, message)
+                except (aiosmtplib.SMTPException, *TRANSIENT_ERRORS) as exc:
+                    smtp = None
+                    self.stats["failed"] += 1
+                    EMAIL_SEND_DURATION.labels("failed").observe(
+                        time.perf_counter() - started
+                    )
+                    if not delivered.done():
+                        delivered.set_exception(exc)
+                except Exception as exc:
+                    # Непередбачена помилка не повинна зупиняти воркера: стан
+                    # з'єднання невідомий, тому воно закривається
+                    logger.exception("Unexpected error while sending email")
+                    await self._close(smtp)
+                    smtp = None
+                    self.stats["failed"] += 1
+                    EMAIL_SEND_DURATION.labels("failed").observe(
+                        time.perf_counter() - started
+                    )
+                    if not delivered.done():
+                        delivered.set_exception(exc)
+                else:
+                    self.stats["sent"] += 1
+                    self.latencies.append(time.perf_counter() - started)
+                    EMAIL_SEND_DURATION.labels("sent").observe(self.latencies[-1])
+                    if not delivered.done():
+                        delivered.set_result(None)
+                finally:
+                    self.queue.task_done()
+        finally:
+            await self._close(smtp)
+
+
+_mailer: Mailer | None = None
+
+
+def get_mailer() -> Mailer:
+    """
+    Повертає спільний відправник листів, створюючи його з налаштувань MAIL_* при першому виклику.
+    """
+    global _mailer
+    if _mailer is None:
+        _mailer = Mailer(
+            hostname=os.getenv("MAIL_SERVER"),
+            port=int(os.getenv("MAIL_PORT", "587")),
+            username=os.getenv("MAIL_USERNAME") or None,
+            password=os.getenv("MAIL_PASSWORD") or None,
+            sender=os.getenv("MAIL_FROM"),
+            sender_name=os.getenv("MAIL_FROM_NAME"),
+        )
+    return _mailer
+
+
+async def shutdown_mailer():
+    """
+    Зупиняє спільний відправник листів (викликається під час зупинки застосунку).
+    """
+    global _mailer
+    if _mailer is not None:
+        await _mailer.stop()
+        _mailer = None
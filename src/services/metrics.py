@@ -0,0 +1,249 @@
+"""
+Метрики Prometheus застосунку.
+
+Маршрут `/metrics` (див. `main.py`) віддає метрики процесу. У продакшн-режимі
+з кількома воркерами задайте `PROMETHEUS_MULTIPROC_DIR` (порожній каталог,
+доступний для запису): тоді лічильники й гістограми всіх воркерів
+агрегуються, а метрики пулу з'єднань відображають воркер, що обробив запит.
+"""
+import os
+import shutil
+import time
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+if PROMETHEUS_MULTIPROC_DIR:
+    # Файли метрик створюються вже під час оголошення метрик нижче
+    os.makedirs(PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route template, method and status code.",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route"],
+)
+HTTP_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being processed.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUT = Histogram(
+    "db_pool_checkout_seconds",
+    "Time spent waiting for a database connection from the pool.",
+    buckets=FAST_BUCKETS,
+)
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds",
+    "Redis command round-trip time.",
+    ["command"],
+    buckets=FAST_BUCKETS,
+)
+USER_CACHE_LOOKUPS = Counter(
+    "user_cache_lookups_total",
+    "User cache lookups by tier (local, redis) and result (hit, miss).",
+    ["tier", "result"],
+)
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "bcrypt hash/verify duration, including waiting for a free worker.",
+    ["operation"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+EMAIL_SEND_DURATION = Histogram(
+    "email_send_duration_seconds",
+    "Email delivery duration through the SMTP pool.",
+    ["result"],
+)
+
+
+def route_label(scope: dict) -> str:
+    """
+    Повертає шаблон маршруту запиту (наприклад, "/contacts/{contact_id}").
+
+    Використовується замість фактичного шляху, щоб кількість значень мітки
+    не залежала від ідентифікаторів у URL.
+    """
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    if scope.get("endpoint") is not None:
+        # Змонтований застосунок (наприклад, StaticFiles на /media)
+        return scope.get("root_path") or "/"
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    ASGI-проміжний шар, що рахує HTTP-запити, їх тривалість і кількість
+    запитів, що виконуються.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = HTTP_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_progress.dec()
+            route = route_label(scope)
+            HTTP_REQUEST_DURATION.labels(method, route).observe(elapsed)
+            HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Пул з'єднань SQLAlchemy, що вимірює час очікування вільного з'єднання.
+    """
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            DB_POOL_CHECKOUT.observe(time.perf_counter() - started)
+
+
+class PoolCollector:
+    """
+    Експортує поточний стан пулу з'єднань рушія під час збору метрик.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def collect(self):
+        pool = self.engine.pool
+        if not hasattr(pool, "checkedout"):
+            return
+        for name, documentation, value in (
+            ("db_pool_size", "Configured pool size.", pool.size()),
+            ("db_pool_checked_out", "Connections in use.", pool.checkedout()),
+            ("db_pool_checked_in", "Idle connections in the pool.", pool.checkedin()),
+            ("db_pool_overflow", "Connections above pool_size.", max(pool.overflow(), 0)),
+        ):
+            yield GaugeMetricFamily(name, documentation, value=value)
+
+
+class StatsCollector:
+    """
+    Експортує наявні словники-лічильники модулів (наприклад,
+    `contacts_cache.stats`) як метрики `<prefix>_<ключ>_total`.
+    """
+
+    def __init__(self, prefix: str, stats: dict, documentation: str):
+        self.prefix = prefix
+        self.stats = stats
+        self.documentation = documentation
+
+    def collect(self):
+        for key, value in self.stats.items():
+            yield CounterMetricFamily(
+                f"{self.prefix}_{key}", self.documentation, value=value
+            )
+
+
+class SnapshotCollector:
+    """
+    Експортує словник, який повертає `snapshot()` під час збору метрик
+    (наприклад, `Mailer.snapshot`): ключі з `counters` — як лічильники
+    `<prefix>_<ключ>_total`, решта — як поточні значення (gauge).
+    """
+
+    def __init__(self, prefix: str, snapshot, counters=(), documentation: str = ""):
+        self.prefix = prefix
+        self.snapshot = snapshot
+        self.counters = set(counters)
+        self.documentation = documentation
+
+    def collect(self):
+        for key, value in self.snapshot().items():
+            family = CounterMetricFamily if key in self.counters else GaugeMetricFamily
+            yield family(f"{self.prefix}_{key}", self.documentation, value=value)
+
+
+_collectors: list = []
+
+
+def register(collector):
+    """
+    Реєструє колектор стану процесу в глобальному реєстрі.
+
+    Повторна реєстрація ігнорується: воркер, запущений через `python main.py`,
+    виконує `main.py` двічі (як `__mp_main__` і як `main`).
+    """
+    try:
+        REGISTRY.register(collector)
+    except ValueError:
+        return
+    _collectors.append(collector)
+
+
+def prepare_multiprocess_dir(path: str | None = PROMETHEUS_MULTIPROC_DIR):
+    """
+    Очищує каталог метрик кількох процесів перед стартом воркерів, щоб
+    значення з попереднього запуску не потрапили в нові метрики.
+    """
+    if not path:
+        return
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def mark_process_dead(pid: int | None = None):
+    """
+    Прибирає метрики `livesum` завершеного воркера (режим кількох процесів).
+    """
+    if PROMETHEUS_MULTIPROC_DIR:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+
+def render() -> tuple[bytes, str]:
+    """
+    Повертає метрики у текстовому форматі Prometheus та їх Content-Type.
+    """
+    if PROMETHEUS_MULTIPROC_DIR:
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        for collector in _collectors:
+            registry.register(collector)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
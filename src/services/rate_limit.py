@@ -0,0 +1,126 @@
+import math
+import os
+from fastapi import Depends, Request, Response
+from redis.exceptions import RedisError
+from src.auth.auth import get_current_user
+from src.auth.principal import Principal
+from src.cache_func.redis_client import get_redis
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+
+stats = {"allowed": 0, "limited": 0, "errors": 0}
+
+# GCRA (generic cell rate algorithm) — ковзне вікно у вигляді відра токенів.
+# Для кожного ключа зберігається лише "теоретичний час прибуття" (TAT)
+# наступного запиту, тому перевірка — одна атомарна операція O(1) в Redis.
+# Час береться з Redis (TIME), щоб усі воркери бачили один годинник.
+GCRA_SCRIPT = """
+local period = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local interval = period / limit
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+local new_tat = tat + interval
+local allow_at = new_tat - period
+if allow_at > now then
+    return {0, tostring(allow_at - now), 0}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {1, '0', math.floor((now - allow_at) / interval)}
+"""
+
+_gcra = None
+
+
+def gcra():
+    """
+    Повертає скрипт GCRA, зареєстрований у спільному клієнті Redis при першому виклику.
+    """
+    global _gcra
+    if _gcra is None:
+        _gcra = get_redis().register_script(GCRA_SCRIPT)
+    return _gcra
+
+
+class RateLimitExceeded(Exception):
+    """
+    Перевищено ліміт запитів; `retry_after` — через скільки секунд можна повторити.
+    """
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Rate limit exceeded, retry after {retry_after:.2f}s")
+        self.retry_after = retry_after
+
+
+class RateLimiter:
+    """
+    Залежність FastAPI, що обмежує кількість запитів до маршруту за IP-адресою клієнта.
+
+    Лічильники зберігаються в Redis і спільні для всіх процесів і вузлів.
+    Дозволяється `times` запитів за `seconds` секунд з рівномірним
+    відновленням ліміту (без скидання на межі вікна). Якщо Redis недоступний,
+    запит пропускається (fail open).
+
+    Приклад:
+        @router.post("/login", dependencies=[Depends(RateLimiter(10, 60, "login"))])
+    """
+
+    def __init__(self, times: int, seconds: int, scope: str):
+        self.times = times
+        self.seconds = seconds
+        self.scope = scope
+
+    def key(self, identity) -> str:
+        """
+        Повертає ключ Redis для маршруту та клієнта.
+        """
+        return f"rate:{self.scope}:{identity}"
+
+    async def hit(self, identity, response: Response):
+        """
+        Враховує запит і додає заголовки `X-RateLimit-*` до відповіді.
+
+        Raises:
+            RateLimitExceeded: Якщо ліміт вичерпано.
+        """
+        if not RATE_LIMIT_ENABLED:
+            return
+        try:
+            allowed, retry_after, remaining = await gcra()(
+                keys=[self.key(identity)], args=[self.seconds, self.times]
+            )
+        except (RedisError, OSError):
+            stats["errors"] += 1
+            return
+        if not allowed:
+            stats["limited"] += 1
+            raise RateLimitExceeded(float(retry_after))
+        stats["allowed"] += 1
+        response.headers["X-RateLimit-Limit"] = str(self.times)
+        response.headers["X-RateLimit-Remaining"] = str(remaining)
+
+    async def __call__(self, request: Request, response: Response):
+        client = request.client.host if request.client else "unknown"
+        await self.hit(client, response)
+
+
+class UserRateLimiter(RateLimiter):
+    """
+    Обмежує кількість запитів автентифікованого користувача (за його id).
+    """
+
+    async def __call__(
+        self, response: Response, user: Principal = Depends(get_current_user)
+    ):
+        await self.hit(user.id, response)
+
+
+def retry_after_header(exc: RateLimitExceeded) -> str:
+    """
+    Значення заголовка Retry-After (ціле число секунд, не менше 1).
+    """
+    return str(max(1, math.ceil(exc.retry_after)))
@@ -0,0 +1,90 @@
+import os
+import orjson
+from pydantic import TypeAdapter
+from src.schemas.contact import ContactBase, ContactOut, ContactPage
+
+FAST_SERIALIZATION = os.getenv("FAST_SERIALIZATION", "false").lower() == "true"
+
+CONTACT_FIELDS = tuple(ContactBase.model_fields)
+CONTACT_OUT_FIELDS = tuple(ContactOut.model_fields)
+
+contact_adapter = TypeAdapter(ContactBase)
+contact_list_adapter = TypeAdapter(list[ContactBase])
+contact_page_adapter = TypeAdapter(ContactPage)
+
+
+def use_fast_path(fast: bool | None) -> bool:
+    """
+    Повертає явно заданий режим або значення `FAST_SERIALIZATION` з конфігурації.
+    """
+    return FAST_SERIALIZATION if fast is None else fast
+
+
+def contact_row(contact, fields: tuple = CONTACT_FIELDS) -> dict:
+    """
+    Читає поля контакту з ORM-об'єкта без валідації.
+
+    Дані з бази вже пройшли перевірку схемою під час запису, тому повторна
+    валідація (зокрема `EmailStr`) для відповіді не потрібна.
+    """
+    return {field: getattr(contact, field) for field in fields}
+
+
+def dump_contact(contact, fast: bool | None = None) -> bytes:
+    """
+    Серіалізує один контакт у JSON за схемою `ContactBase`.
+
+    Args:
+        contact: ORM-об'єкт контакту.
+        fast (bool | None): Примусово увімкнути або вимкнути швидкий шлях.
+
+    Returns:
+        bytes: JSON-відповідь.
+    """
+    if use_fast_path(fast):
+        return orjson.dumps(contact_row(contact))
+    return contact_adapter.dump_json(
+        contact_adapter.validate_python(contact, from_attributes=True)
+    )
+
+
+def dump_contacts(contacts, fast: bool | None = None) -> bytes:
+    """
+    Серіалізує список контактів у JSON-масив за схемою `ContactBase`.
+
+    Args:
+        contacts: ORM-об'єкти контактів.
+        fast (bool | None): Примусово увімкнути або вимкнути швидкий шлях.
+
+    Returns:
+        bytes: JSON-відповідь.
+    """
+    if use_fast_path(fast):
+        return orjson.dumps([contact_row(contact) for contact in contacts])
+    return contact_list_adapter.dump_json(
+        contact_list_adapter.validate_python(contacts, from_attributes=True)
+    )
+
+
+def dump_contact_page(
+    contacts, next_cursor: str | None, fast: bool | None = None
+) -> bytes:
+    """
+    Серіалізує сторінку контактів у JSON за схемою `ContactPage`.
+
+    Args:
+        contacts: ORM-об'єкти контактів сторінки.
+        next_cursor (str | None): Курсор наступної сторінки.
+        fast (bool | None): Примусово увімкнути або вимкнути швидкий шлях.
+
+    Returns:
+        bytes: JSON-відповідь.
+    """
+    if use_fast_path(fast):
+        items = [contact_row(contact, CONTACT_OUT_FIELDS) for contact in contacts]
+        return orjson.dumps({"items": items, "next_cursor": next_cursor})
+    return contact_page_adapter.dump_json(
+        contact_page_adapter.validate_python(
+            {"items": contacts, "next_cursor": next_cursor}, from_attributes=True
+        )
+    )
@@ -0,0 +1,209 @@
+import os
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from tempfile import NamedTemporaryFile
+from fastapi import HTTPException, UploadFile, status
+from starlette.concurrency import run_in_threadpool
+
+AVATAR_STORAGE = os.getenv("AVATAR_STORAGE", "cloudinary").lower()
+AVATAR_MAX_BYTES = int(os.getenv("AVATAR_MAX_BYTES", str(5 * 1024 * 1024)))
+AVATAR_LOCAL_DIR = os.getenv("AVATAR_LOCAL_DIR", "media")
+AVATAR_BASE_URL = os.getenv("AVATAR_BASE_URL", "/media")
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(64 * 1024)))
+# Запас на заголовки частин multipart і інші поля форми
+MULTIPART_OVERHEAD = 64 * 1024
+
+CONTENT_TYPE_EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+}
+
+
+def too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File is larger than {max_bytes} bytes",
+    )
+
+
+async def read_upload(file: UploadFile, max_bytes: int = AVATAR_MAX_BYTES) -> bytes:
+    """
+    Читає завантажений файл частинами, перериваючись після перевищення ліміту.
+
+    Відомий розмір файлу перевіряється до читання, а з файлу читається не
+    більше `max_bytes + 1` байт, тож більший файл не потрапляє в пам'ять.
+
+    Args:
+        file (UploadFile): Завантажений файл.
+        max_bytes (int): Максимальний розмір файлу в байтах.
+
+    Returns:
+        bytes: Вміст файлу.
+
+    Raises:
+        HTTPException: 413, якщо файл більший за `max_bytes`.
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise too_large(max_bytes)
+    chunks = []
+    size = 0
+    while chunk := await file.read(min(UPLOAD_CHUNK_SIZE, max_bytes - size + 1)):
+        if size + len(chunk) > max_bytes:
+            raise too_large(max_bytes)
+        size += len(chunk)
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+class UploadLimitMiddleware:
+    """
+    ASGI-проміжний шар, що обмежує розмір тіла запитів завантаження файлів.
+
+    FastAPI розбирає multipart-форму ще до виклику обробника, тому перевірка
+    в `read_upload` не захищає від запису великого тіла у тимчасовий файл.
+    Запит із завеликим `Content-Length` відхиляється з кодом 413 до читання
+    тіла, а тіло без `Content-Length` (chunked) перериває перший фрагмент,
+    що виходить за ліміт.
+
+    Args:
+        limits (dict[str, int]): Максимальний розмір тіла за шляхом запиту.
+    """
+
+    def __init__(self, app, limits: dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            await self._reject(send, limit)
+            return
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise too_large(limit)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    @staticmethod
+    async def _reject(send, limit: int):
+        body = f'{{"detail":"Request body is larger than {limit} bytes"}}'.encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"connection", b"close"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+class AvatarStorage(ABC):
+    """
+    Сховище файлів аватарів.
+
+    Реалізації не блокують цикл подій: мережеві й дискові операції виконуються
+    в пулі потоків.
+    """
+
+    @abstractmethod
+    async def save(self, data: bytes, public_id: str, content_type: str) -> str:
+        """
+        Зберігає файл під ідентифікатором `public_id` (з перезаписом).
+
+        Args:
+            data (bytes): Вміст файлу.
+            public_id (str): Шлях/ім'я ресурсу, наприклад "avatars/<sha256>/256".
+            content_type (str): MIME-тип файлу.
+
+        Returns:
+            str: Публічний URL збереженого файлу.
+        """
+
+    async def find(self, public_id: str, content_type: str) -> str | None:
+        """
+        Повертає URL файлу, якщо він уже є у сховищі, інакше None.
+
+        За замовчуванням сховище не перевіряється (для Cloudinary це платний
+        виклик Admin API) і дедуплікація покладається на індекс у Redis.
+        """
+        return None
+
+
+class CloudinaryStorage(AvatarStorage):
+    """
+    Зберігає аватари в Cloudinary.
+
+    SDK Cloudinary синхронний, тому завантаження виконується в пулі потоків.
+    """
+
+    async def save(self, data: bytes, public_id: str, content_type: str) -> str:
+        from src.services.update_avatar import upload_avatar
+
+        return await run_in_threadpool(upload_avatar, data, public_id)
+
+
+class LocalStorage(AvatarStorage):
+    """
+    Зберігає аватари в локальному каталозі (для розробки та навантажувального тестування).
+
+    Файл спочатку записується у тимчасовий файл і атомарно перейменовується,
+    тому читачі ніколи не бачать частково записаний аватар.
+    """
+
+    def __init__(self, root: str = AVATAR_LOCAL_DIR, base_url: str = AVATAR_BASE_URL):
+        self.root = root
+        self.base_url = base_url.rstrip("/")
+
+    def _write(self, data: bytes, relative: str):
+        path = os.path.join(self.root, relative)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        with NamedTemporaryFile(dir=directory, delete=False) as tmp:
+            tmp.write(data)
+        os.replace(tmp.name, path)
+
+    async def save(self, data: bytes, public_id: str, content_type: str) -> str:
+        relative = public_id + CONTENT_TYPE_EXTENSIONS.get(content_type, "")
+        await run_in_threadpool(self._write, data, relative)
+        return f"{self.base_url}/{relative}"
+
+    async def find(self, public_id: str, content_type: str) -> str | None:
+        relative = public_id + CONTENT_TYPE_EXTENSIONS.get(content_type, "")
+        path = os.path.join(self.root, relative)
+        if await run_in_threadpool(os.path.exists, path):
+            return f"{self.base_url}/{relative}"
+        return None
+
+
+@lru_cache
+def get_storage() -> AvatarStorage:
+    """
+    Повертає сховище аватарів, обране змінною оточення `AVATAR_STORAGE`
+    ("cloudinary" або "local").
+
+    Raises:
+        ValueError: Якщо задано невідоме сховище.
+    """
+    if AVATAR_STORAGE == "local":
+        return LocalStorage()
+    if AVATAR_STORAGE == "cloudinary":
+        return CloudinaryStorage()
+    raise ValueError(f"Unknown AVATAR_STORAGE: {AVATAR_STORAGE}")
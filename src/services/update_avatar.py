@@ -1,30 +1,198 @@
-import cloudinary
-import cloudinary.uploader
-import cloudinary.api
-from fastapi import UploadFile
+import asyncio
+import hashlib
+import io
+import logging
 import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from dotenv import load_dotenv
+from redis.exceptions import RedisError
+from src.cache_func.redis_client import get_redis
 
 load_dotenv()
 
-cloudinary.config(
-    cloud_name=os.getenv("CLOUD_NAME"),
-    api_key=os.getenv("API_KEY"),
-    api_secret=os.getenv("API_SECRET"),
-    secure=True,
+logger = logging.getLogger(__name__)
+
+AVATAR_SIZES = tuple(
+    int(size) for size in os.getenv("AVATAR_SIZES", "256,64").split(",") if size
 )
+AVATAR_QUALITY = int(os.getenv("AVATAR_QUALITY", "80"))
+AVATAR_WORKERS = int(os.getenv("AVATAR_WORKERS", "2"))
+AVATAR_INDEX_TTL = int(os.getenv("AVATAR_INDEX_TTL", str(30 * 24 * 3600)))
+AVATAR_CONTENT_TYPE = "image/webp"
+
+_executor: ProcessPoolExecutor | None = None
+
+
+@lru_cache
+def cloudinary_uploader():
+    """
+    Импортирует и настраивает SDK Cloudinary при первой загрузке аватара.
+
+    SDK не нужен для большинства запросов, поэтому он не импортируется
+    при старте приложения.
+
+    Returns:
+        module: Модуль `cloudinary.uploader`.
+    """
+    import cloudinary
+    import cloudinary.uploader
 
+    cloudinary.config(
+        cloud_name=os.getenv("CLOUD_NAME"),
+        api_key=os.getenv("API_KEY"),
+        api_secret=os.getenv("API_SECRET"),
+        secure=True,
+    )
+    return cloudinary.uploader
 
-def upload_avatar(file: UploadFile, public_id: str):
+
+def upload_avatar(data: bytes, public_id: str):
     """
     Загружает изображение аватара в Cloudinary с заданным public_id.
 
+    Вызов блокирующий: из асинхронного кода его выполняют в пуле потоков
+    (см. `CloudinaryStorage`).
+
     Args:
-        file (UploadFile): Файл изображения для загрузки.
+        data (bytes): Содержимое файла изображения.
         public_id (str): Идентификатор ресурса в Cloudinary (путь/имя).
 
     Returns:
         str: URL загруженного изображения (secure_url).
     """
-    result = cloudinary.uploader.upload(file.file, public_id=public_id, overwrite=True)
+    result = cloudinary_uploader().upload(
+        io.BytesIO(data), public_id=public_id, overwrite=True
+    )
     return result.get("secure_url")
+
+
+def content_hash(data: bytes) -> str:
+    """
+    Возвращает SHA-256 содержимого файла (ключ дедупликации аватаров).
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def process_avatar(
+    data: bytes, sizes: tuple = AVATAR_SIZES, quality: int = AVATAR_QUALITY
+) -> dict[int, bytes]:
+    """
+    Декодирует изображение и создаёт квадратные миниатюры в формате WebP.
+
+    Поворот из EXIF применяется к пикселям, а сами метаданные (EXIF, GPS, ICC)
+    в результат не попадают. Выполняется в пуле процессов, поэтому Pillow
+    импортируется внутри функции.
+
+    Args:
+        data (bytes): Исходное изображение.
+        sizes (tuple): Стороны миниатюр в пикселях.
+        quality (int): Качество WebP (0-100).
+
+    Returns:
+        dict[int, bytes]: Закодированные миниатюры по размеру.
+
+    Raises:
+        ValueError: Если файл не удалось декодировать как изображение.
+    """
+    from PIL import Image, ImageOps
+
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image.draft("RGB", (max(sizes), max(sizes)))
+            image = ImageOps.exif_transpose(image)
+            has_alpha = image.mode in ("RGBA", "LA") or "transparency" in image.info
+            image = image.convert("RGBA" if has_alpha else "RGB")
+    except (OSError, Image.DecompressionBombError) as exc:
+        raise ValueError(f"Cannot decode image: {exc}") from None
+
+    variants = {}
+    for size in sizes:
+        thumbnail = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        thumbnail.save(buffer, "WEBP", quality=quality)
+        variants[size] = buffer.getvalue()
+    return variants
+
+
+def executor() -> ProcessPoolExecutor:
+    """
+    Возвращает общий пул процессов для обработки изображений, создавая его при первом вызове.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=AVATAR_WORKERS)
+    return _executor
+
+
+def shutdown():
+    """
+    Останавливает пул обработки изображений (вызывается при остановке приложения).
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def index_key(digest: str) -> str:
+    """
+    Возвращает ключ Redis с URL уже сохранённого аватара с данным хешем.
+    """
+    return f"avatar:{digest}"
+
+
+async def stored_avatar_url(digest: str, storage) -> str | None:
+    """
+    Ищет уже сохранённый аватар с тем же содержимым: сначала в Redis, затем в хранилище.
+
+    Недоступность Redis не мешает загрузке — аватар просто обрабатывается заново.
+    """
+    try:
+        url = await get_redis().get(index_key(digest))
+    except (RedisError, OSError):
+        url = None
+    if url:
+        return url
+    return await storage.find(f"avatars/{digest}/{AVATAR_SIZES[0]}", AVATAR_CONTENT_TYPE)
+
+
+async def store_avatar(data: bytes, storage) -> str:
+    """
+    Обрабатывает и сохраняет аватар, пропуская уже загруженные изображения.
+
+    Результаты адресуются хешем исходного файла (`avatars/<sha256>/<size>`),
+    поэтому повторная загрузка того же изображения не тратит ни CPU, ни трафик.
+    Миниатюры создаются в пуле процессов, не блокируя цикл событий. Исходный
+    файл не сохраняется: в хранилище попадают только миниатюры без метаданных.
+
+    Args:
+        data (bytes): Содержимое загруженного файла.
+        storage (AvatarStorage): Хранилище аватаров.
+
+    Returns:
+        str: URL основного (самого первого из `AVATAR_SIZES`) варианта аватара.
+
+    Raises:
+        ValueError: Если файл не является корректным изображением.
+    """
+    digest = content_hash(data)
+    url = await stored_avatar_url(digest, storage)
+    if url:
+        return url
+
+    loop = asyncio.get_running_loop()
+    variants = await loop.run_in_executor(executor(), process_avatar, data)
+    urls = await asyncio.gather(
+        *(
+            storage.save(body, f"avatars/{digest}/{size}", AVATAR_CONTENT_TYPE)
+            for size, body in variants.items()
+        )
+    )
+    url = urls[0]
+
+    try:
+        await get_redis().set(index_key(digest), url, ex=AVATAR_INDEX_TTL)
+    except (RedisError, OSError):
+        pass
+    return url
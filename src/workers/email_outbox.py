@@ -0,0 +1,159 @@
+"""
+Воркер відправлення листів з таблиці `email_outbox`.
+
+Запускається окремим процесом, тому веб-вузли не виконують жодної роботи з SMTP:
+
+    python -m src.workers.email_outbox
+
+Кілька воркерів можуть працювати одночасно: листи розподіляються між ними
+через `FOR UPDATE SKIP LOCKED`.
+"""
+import asyncio
+import logging
+import os
+import random
+import signal
+from contextlib import suppress
+from prometheus_client import start_http_server
+from src.databases.connect import SessionLocal, engine
+from src.repository import outbox
+from src.services.email import send_verification_email, send_reset_email
+from src.services import metrics
+from src.services.mailer import get_mailer, shutdown_mailer
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "50"))
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "1"))
+OUTBOX_LEASE_SECONDS = float(os.getenv("OUTBOX_LEASE_SECONDS", "300"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+OUTBOX_RETRY_BASE = float(os.getenv("OUTBOX_RETRY_BASE", "30"))
+OUTBOX_RETRY_MAX = float(os.getenv("OUTBOX_RETRY_MAX", "3600"))
+OUTBOX_METRICS_PORT = int(os.getenv("OUTBOX_METRICS_PORT", "0"))
+
+SENDERS = {
+    outbox.VERIFICATION_EMAIL: send_verification_email,
+    outbox.PASSWORD_RESET_EMAIL: send_reset_email,
+}
+
+
+def retry_delay(attempts: int) -> float | None:
+    """
+    Затримка перед наступною спробою: експоненційна з випадковим розкидом до 10%.
+
+    Args:
+        attempts (int): Кількість уже зроблених спроб.
+
+    Returns:
+        float | None: Затримка в секундах або None, якщо спроби вичерпано.
+    """
+    if attempts >= OUTBOX_MAX_ATTEMPTS:
+        return None
+    delay = min(OUTBOX_RETRY_BASE * 2 ** (attempts - 1), OUTBOX_RETRY_MAX)
+    return delay + random.uniform(0, delay * 0.1)
+
+
+async def deliver(email) -> str | None:
+    """
+    Відправляє один лист.
+
+    Returns:
+        str | None: Текст помилки або None, якщо лист відправлено.
+    """
+    sender = SENDERS.get(email.kind)
+    if sender is None:
+        return f"Unknown email kind: {email.kind}"
+    try:
+        await sender(
+            email.recipient, email.payload.get("username"), email.payload.get("host")
+        )
+    except Exception as exc:
+        return f"{type(exc).__name__}: {exc}"
+    return None
+
+
+async def process_batch(
+    session_factory=SessionLocal, batch_size: int = OUTBOX_BATCH_SIZE
+) -> int:
+    """
+    Забирає пакет листів, відправляє їх паралельно і записує результат.
+
+    Returns:
+        int: Кількість оброблених листів (0, якщо черга порожня).
+    """
+    async with session_factory() as session:
+        emails = await outbox.claim_emails(session, batch_size, OUTBOX_LEASE_SECONDS)
+        if not emails:
+            return 0
+        errors = await asyncio.gather(*(deliver(email) for email in emails))
+        sent = [email.id for email, error in zip(emails, errors) if error is None]
+        await outbox.mark_sent(session, sent)
+        for email, error in zip(emails, errors):
+            if error is not None:
+                retry_in = retry_delay(email.attempts)
+                logger.warning(
+                    "Email %s to %s failed (attempt %d): %s",
+                    email.id,
+                    email.recipient,
+                    email.attempts,
+                    error,
+                )
+                await outbox.mark_failed(session, email.id, error, retry_in)
+    return len(emails)
+
+
+async def run(stop: asyncio.Event, session_factory=SessionLocal):
+    """
+    Обробляє outbox, доки не встановлено `stop`.
+
+    Поки є листи, пакети забираються один за одним без пауз; коли черга
+    порожня, воркер чекає `OUTBOX_POLL_INTERVAL` секунд. Помилки бази даних
+    не зупиняють воркер.
+    """
+    while not stop.is_set():
+        try:
+            processed = await process_batch(session_factory)
+        except Exception:
+            logger.exception("Email outbox batch failed")
+            processed = 0
+        if processed < OUTBOX_BATCH_SIZE:
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(stop.wait(), OUTBOX_POLL_INTERVAL)
+
+
+def mailer_collector() -> metrics.SnapshotCollector:
+    """
+    Колектор статистики пулу SMTP (`Mailer.snapshot`) цього процесу.
+    """
+    return metrics.SnapshotCollector(
+        "mailer",
+        lambda: get_mailer().snapshot(),
+        counters=("sent", "failed", "retries", "connects"),
+        documentation="SMTP pool: deliveries, queue depth and send latency.",
+    )
+
+
+async def main():
+    """
+    Точка входу процесу воркера: коректно зупиняється за SIGTERM/SIGINT.
+
+    Якщо задано `OUTBOX_METRICS_PORT`, метрики Prometheus (тривалість
+    відправлення листів, глибина черги та затримка пулу SMTP) доступні на цьому порту.
+    """
+    if OUTBOX_METRICS_PORT:
+        metrics.register(mailer_collector())
+        start_http_server(OUTBOX_METRICS_PORT)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+    try:
+        await run(stop)
+    finally:
+        await shutdown_mailer()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
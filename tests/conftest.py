@@ -12,7 +12,7 @@ from src.databases.models import Contact
 
 from main import app
 from src.databases.models import User
-from src.databases.connect import Base, get_db
+from src.databases.connect import Base, get_db, get_session_factory
 from src.auth.auth import create_access_token, Hash
 
 
@@ -72,6 +72,7 @@ def client():
             return user
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
     app.dependency_overrides[get_current_user] = override_get_current_user
 
     yield TestClient(app)
@@ -0,0 +1,51 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from fastapi import HTTPException, status
+from src.auth.auth import Hash
+
+
+@pytest.mark.asyncio
+async def test_password_hash_async_roundtrip():
+    hasher = Hash()
+    hashed = await hasher.get_password_hash_async("secret123")
+    assert hashed != "secret123"
+    assert await hasher.verify_password_async("secret123", hashed)
+    assert not await hasher.verify_password_async("wrong", hashed)
+
+
+@pytest.mark.asyncio
+async def test_password_hash_rejects_when_pool_is_saturated():
+    hasher = Hash()
+    await hasher.get_password_hash_async("warmup")
+    slots = Hash._slots
+    held = 0
+    while not slots.locked():
+        await slots.acquire()
+        held += 1
+    try:
+        with patch("src.auth.auth.HASH_QUEUE_TIMEOUT", 0.01):
+            with pytest.raises(HTTPException) as exc_info:
+                await hasher.get_password_hash_async("secret123")
+    finally:
+        for _ in range(held):
+            slots.release()
+    assert exc_info.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert exc_info.value.headers["Retry-After"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_password_hash_does_not_block_event_loop():
+    hasher = Hash()
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.001)
+
+    task = asyncio.create_task(ticker())
+    await hasher.get_password_hash_async("secret123")
+    task.cancel()
+    assert ticks > 1
@@ -0,0 +1,94 @@
+import io
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.auth.principal import Principal
+from src.services.contact_import import detect_format, iter_records, import_contacts
+
+CSV_DATA = (
+    b"first_name,last_name,email,phone_number,birthday\n"
+    b"Wade,Wilson,wade@example.com,+1234567890,1991-01-01\n"
+    b"Bad,Email,not-an-email,+1234567890,1991-01-01\n"
+    b"Peter,Parker,peter@example.com,+1234567890,2001-08-10\n"
+)
+NDJSON_DATA = (
+    b'{"first_name": "Wade", "last_name": "Wilson", "email": "wade@example.com", '
+    b'"phone_number": "+1234567890", "birthday": "1991-01-01"}\n'
+    b"\n"
+    b"not json\n"
+)
+
+
+@pytest.fixture
+def current_user():
+    return Principal(id=1, username="deadpool", email="deadpool@example.com")
+
+
+def make_upload(data, filename, content_type):
+    upload = MagicMock()
+    upload.file = io.BytesIO(data)
+    upload.filename = filename
+    upload.content_type = content_type
+    return upload
+
+
+def test_detect_format():
+    assert detect_format(make_upload(b"", "contacts.csv", "text/csv")) == "csv"
+    assert detect_format(make_upload(b"", "contacts.jsonl", None)) == "ndjson"
+    assert detect_format(make_upload(b"", "x", "text/plain"), "ndjson") == "ndjson"
+    with pytest.raises(ValueError):
+        detect_format(make_upload(b"", "contacts.txt", "text/plain"))
+
+
+def test_iter_records_ndjson_reports_parse_errors():
+    records = list(iter_records(io.BytesIO(NDJSON_DATA), "ndjson"))
+    assert records[0][1]["email"] == "wade@example.com"
+    assert records[1][0] == 2
+    assert records[1][2].startswith("Invalid JSON")
+
+
+@pytest.mark.asyncio
+@patch("src.services.contact_import.crud.insert_contacts", new_callable=AsyncMock)
+async def test_import_contacts_reports_row_errors(mock_insert, current_user):
+    mock_insert.return_value = {"wade@example.com"}
+    db = MagicMock()
+    db.commit = AsyncMock()
+    upload = make_upload(CSV_DATA, "contacts.csv", "text/csv")
+
+    report = await import_contacts(upload, "csv", current_user, db)
+
+    rows = mock_insert.await_args.args[0]
+    assert [row["email"] for row in rows] == ["wade@example.com", "peter@example.com"]
+    assert rows[0]["user_id"] == 1
+    assert rows[0]["birthday_doy"] == 1
+    assert report["imported"] == 1
+    assert report["failed"] == 2
+    assert report["errors"][0]["row"] == 2
+    assert report["errors"][1] == {
+        "row": 3,
+        "error": "Contact with this email already exists",
+    }
+    db.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@patch("src.services.contact_import.crud.insert_contacts", new_callable=AsyncMock)
+async def test_import_contacts_rejects_values_longer_than_columns(mock_insert, current_user):
+    mock_insert.return_value = {"wade@example.com"}
+    db = MagicMock()
+    db.commit = AsyncMock()
+    data = (
+        b"first_name,last_name,email,phone_number,birthday\n"
+        b"Wade,Wilson,wade@example.com,+1234567890,1991-01-01\n"
+        + b"Peter," + b"P" * 51 + b",peter@example.com," + b"1" * 21 + b",2001-08-10\n"
+    )
+    upload = make_upload(data, "contacts.csv", "text/csv")
+
+    report = await import_contacts(upload, "csv", current_user, db)
+
+    rows = mock_insert.await_args.args[0]
+    assert [row["email"] for row in rows] == ["wade@example.com"]
+    assert report["imported"] == 1
+    assert report["failed"] == 1
+    assert report["errors"][0]["row"] == 2
+    assert "last_name" in report["errors"][0]["error"]
+    assert "phone_number" in report["errors"][0]["error"]
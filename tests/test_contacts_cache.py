@@ -0,0 +1,108 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+from redis.exceptions import ConnectionError as RedisConnectionError
+from src.cache_func import contacts_cache
+from src.cache_func.contacts_cache import cache_key, cached_response, bump_version
+
+
+def test_cache_key_normalizes_params():
+    first = cache_key(1, 3, "search", {"q": "wade", "limit": 10, "email": None})
+    second = cache_key(1, 3, "search", {"limit": 10, "q": "wade"})
+    assert first == second
+    assert first.startswith("contacts:1:v3:search:")
+
+
+def test_cache_key_changes_with_version():
+    params = {"limit": 10}
+    assert cache_key(1, 1, "list", params) != cache_key(1, 2, "list", params)
+
+
+@pytest.mark.asyncio
+@patch("src.cache_func.contacts_cache.store")
+@patch("src.cache_func.contacts_cache.get_redis")
+async def test_cached_response_miss_then_store(mock_get_redis, mock_store):
+    mock_redis = mock_get_redis.return_value
+    mock_redis.get = AsyncMock(side_effect=["4", None])
+    script = mock_store.return_value = AsyncMock(return_value=0)
+    loader = AsyncMock(return_value='{"items": []}')
+
+    payload = await cached_response(1, "list", {"limit": 10}, loader)
+
+    assert payload == '{"items": []}'
+    loader.assert_awaited_once()
+    key, index = script.await_args.kwargs["keys"]
+    assert key.startswith("contacts:1:v4:list:")
+    assert index == "contacts:1:keys"
+    assert script.await_args.kwargs["args"] == [
+        payload, contacts_cache.CONTACTS_CACHE_TTL, contacts_cache.CONTACTS_CACHE_MAX_KEYS
+    ]
+
+
+@pytest.mark.asyncio
+@patch("src.cache_func.contacts_cache.get_redis")
+async def test_cached_response_hit_skips_loader(mock_get_redis):
+    mock_redis = mock_get_redis.return_value
+    mock_redis.get = AsyncMock(side_effect=["4", '{"items": [1]}'])
+    loader = AsyncMock()
+    hits = contacts_cache.stats["hits"]
+
+    payload = await cached_response(1, "list", {"limit": 10}, loader)
+
+    assert payload == '{"items": [1]}'
+    loader.assert_not_awaited()
+    assert contacts_cache.stats["hits"] == hits + 1
+
+
+@pytest.mark.asyncio
+@patch("src.cache_func.contacts_cache.store")
+@patch("src.cache_func.contacts_cache.get_redis")
+async def test_cached_response_skips_large_payload(mock_get_redis, mock_store):
+    mock_redis = mock_get_redis.return_value
+    mock_redis.get = AsyncMock(side_effect=[None, None])
+    loader = AsyncMock(return_value="x" * (contacts_cache.CONTACTS_CACHE_MAX_BYTES + 1))
+
+    await cached_response(1, "list", {}, loader)
+
+    mock_store.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_cached_response_evicts_oldest_over_key_budget(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    script = client.register_script(contacts_cache.STORE_SCRIPT)
+    monkeypatch.setattr(contacts_cache, "get_redis", lambda: client)
+    monkeypatch.setattr(contacts_cache, "store", lambda: script)
+    monkeypatch.setattr(contacts_cache, "CONTACTS_CACHE_MAX_KEYS", 2)
+
+    for page in range(3):
+        await cached_response(1, "list", {"page": page}, AsyncMock(return_value="[]"))
+    await cached_response(2, "list", {}, AsyncMock(return_value="[]"))
+
+    assert await client.exists(cache_key(1, 0, "list", {"page": 0})) == 0
+    assert await client.exists(cache_key(1, 0, "list", {"page": 2})) == 1
+    assert await client.zcard(contacts_cache.index_key(1)) == 2
+    assert await client.zcard(contacts_cache.index_key(2)) == 1
+
+
+@pytest.mark.asyncio
+@patch("src.cache_func.contacts_cache.get_redis")
+async def test_cached_response_redis_down(mock_get_redis):
+    mock_redis = mock_get_redis.return_value
+    mock_redis.get = AsyncMock(side_effect=RedisConnectionError())
+    loader = AsyncMock(return_value="[]")
+
+    payload = await cached_response(1, "search", {"q": "wade"}, loader)
+
+    assert payload == "[]"
+    loader.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@patch("src.cache_func.contacts_cache.get_redis")
+async def test_bump_version(mock_get_redis):
+    mock_redis = mock_get_redis.return_value
+    mock_redis.incr = AsyncMock()
+    await bump_version(7)
+    mock_redis.incr.assert_awaited_once_with("contacts:7:version")
@@ -0,0 +1,26 @@
+from src.databases.connect import async_database_url, engine_options
+
+
+def test_async_database_url_postgres():
+    url = async_database_url("postgresql://user:pass@db:5432/contacts")
+    assert url == "postgresql+asyncpg://user:pass@db:5432/contacts"
+
+
+def test_async_database_url_keeps_async_driver():
+    url = "postgresql+asyncpg://user:pass@db:5432/contacts"
+    assert async_database_url(url) == url
+
+
+def test_async_database_url_sqlite():
+    assert async_database_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+
+
+def test_engine_options_postgres_pool():
+    options = engine_options("postgresql+asyncpg://user:pass@db:5432/contacts")
+    assert options["pool_pre_ping"] is True
+    assert options["pool_size"] > 0
+    assert "prepared_statement_cache_size" in options["connect_args"]
+
+
+def test_engine_options_sqlite_without_pool():
+    assert engine_options("sqlite+aiosqlite:///./test.db") == {}
@@ -0,0 +1,118 @@
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, patch
+from prometheus_client import CollectorRegistry
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from src.databases.connect import Base
+from src.databases.models import EmailOutbox
+from src.repository import outbox
+from src.repository.users import create_user
+from src.schemas.user import UserCreate
+from src.workers import email_outbox
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def enqueue(session_factory, count=1):
+    async with session_factory() as session:
+        for index in range(count):
+            outbox.enqueue_email(
+                session,
+                outbox.VERIFICATION_EMAIL,
+                f"user{index}@example.com",
+                {"username": f"user{index}", "host": "http://testserver/"},
+            )
+        await session.commit()
+
+
+async def all_emails(session_factory):
+    async with session_factory() as session:
+        return (await session.execute(select(EmailOutbox))).scalars().all()
+
+
+@pytest.mark.asyncio
+async def test_claim_leases_emails(session_factory):
+    await enqueue(session_factory, 3)
+    async with session_factory() as session:
+        claimed = await outbox.claim_emails(session, limit=2, lease_seconds=60)
+        assert [email.attempts for email in claimed] == [1, 1]
+        rest = await outbox.claim_emails(session, limit=10, lease_seconds=60)
+        assert len(rest) == 1
+        assert await outbox.claim_emails(session, limit=10, lease_seconds=60) == []
+
+
+@pytest.mark.asyncio
+async def test_process_batch_marks_sent(session_factory):
+    await enqueue(session_factory, 2)
+    sender = AsyncMock()
+    with patch.dict(email_outbox.SENDERS, {outbox.VERIFICATION_EMAIL: sender}):
+        assert await email_outbox.process_batch(session_factory) == 2
+
+    sender.assert_any_await("user0@example.com", "user0", "http://testserver/")
+    assert {email.status for email in await all_emails(session_factory)} == {"sent"}
+
+
+@pytest.mark.asyncio
+async def test_process_batch_schedules_retry(session_factory):
+    await enqueue(session_factory)
+    sender = AsyncMock(side_effect=ConnectionRefusedError("smtp down"))
+    with patch.dict(email_outbox.SENDERS, {outbox.VERIFICATION_EMAIL: sender}):
+        await email_outbox.process_batch(session_factory)
+        assert await email_outbox.process_batch(session_factory) == 0
+
+    (email,) = await all_emails(session_factory)
+    assert email.status == "pending"
+    assert email.attempts == 1
+    assert "smtp down" in email.last_error
+
+
+@pytest.mark.asyncio
+async def test_process_batch_gives_up(session_factory, monkeypatch):
+    monkeypatch.setattr(email_outbox, "OUTBOX_MAX_ATTEMPTS", 1)
+    await enqueue(session_factory)
+    sender = AsyncMock(side_effect=OSError("boom"))
+    with patch.dict(email_outbox.SENDERS, {outbox.VERIFICATION_EMAIL: sender}):
+        await email_outbox.process_batch(session_factory)
+
+    (email,) = await all_emails(session_factory)
+    assert email.status == "failed"
+
+
+def test_retry_delay_backs_off(monkeypatch):
+    monkeypatch.setattr(email_outbox, "OUTBOX_MAX_ATTEMPTS", 5)
+    delays = [email_outbox.retry_delay(attempt) for attempt in range(1, 5)]
+    assert all(later > earlier for earlier, later in zip(delays, delays[1:]))
+    assert email_outbox.retry_delay(5) is None
+
+
+@pytest.mark.asyncio
+@patch("src.repository.users.hasher.get_password_hash_async", new_callable=AsyncMock)
+async def test_create_user_enqueues_verification(mock_hash, session_factory):
+    mock_hash.return_value = "hashed"
+    user_data = UserCreate(
+        username="hulk", email="hulk@example.com", password="smash123", role="user"
+    )
+    async with session_factory() as session:
+        await create_user(user_data, session, verification_host="http://testserver/")
+
+    (email,) = await all_emails(session_factory)
+    assert email.kind == outbox.VERIFICATION_EMAIL
+    assert email.recipient == "hulk@example.com"
+    assert email.payload == {"username": "hulk", "host": "http://testserver/"}
+
+
+def test_mailer_collector_exports_queue_and_latency():
+    registry = CollectorRegistry()
+    registry.register(email_outbox.mailer_collector())
+
+    assert registry.get_sample_value("mailer_sent_total") == 0
+    assert registry.get_sample_value("mailer_queue_depth") == 0
+    assert registry.get_sample_value("mailer_p95_latency_ms") == 0
@@ -0,0 +1,58 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.cache_func.etag import make_etag, etag_matches, not_modified, set_etag
+from src.routes.contacts import contacts_etag
+
+
+def make_request(if_none_match=None):
+    request = MagicMock()
+    request.headers = {"if-none-match": if_none_match} if if_none_match else {}
+    return request
+
+
+def test_make_etag_is_weak_and_stable():
+    etag = make_etag(1, 4, "list", [("limit", 50)])
+    assert etag.startswith('W/"') and etag.endswith('"')
+    assert etag == make_etag(1, 4, "list", [("limit", 50)])
+    assert etag != make_etag(1, 5, "list", [("limit", 50)])
+
+
+def test_etag_matches_weak_comparison_and_lists():
+    etag = make_etag("me", 1)
+    strong = etag.removeprefix("W/")
+    assert etag_matches(make_request(etag), etag)
+    assert etag_matches(make_request(strong), etag)
+    assert etag_matches(make_request(f'"other", {etag}'), etag)
+    assert etag_matches(make_request("*"), etag)
+    assert not etag_matches(make_request('"other"'), etag)
+    assert not etag_matches(make_request(), etag)
+    assert not etag_matches(make_request(etag), None)
+
+
+def test_not_modified_and_set_etag_headers():
+    etag = make_etag("x")
+    response = not_modified(etag)
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.headers["cache-control"] == "private, no-cache"
+
+    response = set_etag(MagicMock(headers={}), None)
+    assert response.headers == {}
+
+
+@pytest.mark.asyncio
+@patch("src.routes.contacts.contacts_cache.current_version", new_callable=AsyncMock)
+async def test_contacts_etag_changes_with_version(mock_version):
+    mock_version.return_value = 3
+    first, version = await contacts_etag(1, "list", {"limit": 50, "after": None})
+    assert version == 3
+    mock_version.return_value = 4
+    second, _ = await contacts_etag(1, "list", {"after": None, "limit": 50})
+    assert first != second
+
+
+@pytest.mark.asyncio
+@patch("src.routes.contacts.contacts_cache.current_version", new_callable=AsyncMock)
+async def test_contacts_etag_without_redis(mock_version):
+    mock_version.return_value = None
+    assert await contacts_etag(1, "list", {"limit": 50}) == (None, None)
@@ -0,0 +1,72 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+from fastapi.testclient import TestClient
+from main import app
+from src.services import health
+from src.services.health import HealthMonitor, pool_status
+
+
+async def ok():
+    pass
+
+
+async def down():
+    raise ConnectionRefusedError("refused")
+
+
+async def hang():
+    await asyncio.sleep(10)
+
+
+@pytest.mark.asyncio
+async def test_refresh_reports_each_check():
+    monitor = HealthMonitor(
+        checks={"database": ok, "redis": down, "smtp": hang},
+        required=frozenset({"database"}),
+        timeout=0.05,
+    )
+    await monitor.refresh()
+    snapshot = monitor.snapshot()
+
+    assert snapshot["status"] == "ok"
+    assert snapshot["checks"]["redis"]["error"] == "ConnectionRefusedError: refused"
+    assert "timed out" in snapshot["checks"]["smtp"]["error"]
+
+
+@pytest.mark.asyncio
+async def test_required_failure_or_stale_result_is_not_ready():
+    monitor = HealthMonitor(
+        checks={"database": ok, "redis": down}, required=frozenset({"database", "redis"})
+    )
+    assert monitor.snapshot()["status"] == "starting"
+    await monitor.refresh()
+    assert monitor.snapshot()["status"] == "unavailable"
+
+    monitor.checks["redis"] = ok
+    await monitor.refresh()
+    assert monitor.snapshot()["status"] == "ok"
+    monitor.checked_at -= monitor.max_age + 1
+    assert monitor.snapshot()["status"] == "unavailable"
+
+
+def test_pool_status_saturation():
+    pool = MagicMock(_max_overflow=10)
+    pool.checkedout.return_value = 27
+    pool.size.return_value = 20
+    assert pool_status(pool) == {"checked_out": 27, "capacity": 30, "saturation": 0.9}
+
+
+def test_ready_route_serves_cached_result(monkeypatch):
+    monitor = HealthMonitor(checks={"database": down}, required=frozenset({"database"}))
+    monkeypatch.setattr(health, "monitor", monitor)
+    client = TestClient(app)
+
+    assert client.get("/health/live").json() == {"status": "ok"}
+    assert client.get("/health/ready").status_code == 503
+
+    monitor.checks["database"] = ok
+    asyncio.run(monitor.refresh())
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json()["checks"]["database"]["ok"] is True
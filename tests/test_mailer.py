@@ -0,0 +1,187 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+import aiosmtplib
+from src.services import mailer
+from src.services.mailer import Mailer, build_message, render
+
+
+class FakeSMTP:
+    instances = []
+    fail_sends = 0
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.is_connected = False
+        self.sent = []
+        FakeSMTP.instances.append(self)
+
+    async def connect(self):
+        self.is_connected = True
+
+    async def send_message(self, message):
+        if FakeSMTP.fail_sends:
+            FakeSMTP.fail_sends -= 1
+            self.is_connected = False
+            raise aiosmtplib.SMTPServerDisconnected("connection lost")
+        self.sent.append(message)
+
+    async def quit(self):
+        self.is_connected = False
+
+    def close(self):
+        self.is_connected = False
+
+
+@pytest.fixture
+def fake_smtp():
+    FakeSMTP.instances = []
+    FakeSMTP.fail_sends = 0
+    with patch("src.services.mailer.aiosmtplib.SMTP", FakeSMTP):
+        yield FakeSMTP
+
+
+def make_mailer(**kwargs):
+    options = {"pool_size": 1, "retry_delay": 0, "sender": "noreply@example.com"}
+    options.update(kwargs)
+    return Mailer("smtp.example.com", 587, "user", "secret", **options)
+
+
+def test_render_and_build_message():
+    html = render(
+        "templates.html", {"host": "http://x/", "username": "<b>", "token": "t"}
+    )
+    assert "http://x/auth/verify-email/t" in html
+    assert "&lt;b&gt;" in html
+
+    message = build_message("to@example.com", "Hi", html, "from@example.com", "Team")
+    assert message["To"] == "to@example.com"
+    assert message["From"] == "Team <from@example.com>"
+    assert message.get_content_subtype() == "html"
+
+
+@pytest.mark.asyncio
+async def test_messages_reuse_connection(fake_smtp):
+    sender = make_mailer()
+    for index in range(5):
+        await sender.send_template(
+            f"user{index}@example.com",
+            "Hi",
+            "templates.html",
+            {"host": "h/", "username": "u", "token": "t"},
+        )
+    await sender.stop()
+
+    assert len(fake_smtp.instances) == 1
+    assert len(fake_smtp.instances[0].sent) == 5
+    stats = sender.snapshot()
+    assert stats["sent"] == 5 and stats["connects"] == 1
+    assert stats["queue_depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_reconnects_after_disconnect(fake_smtp):
+    fake_smtp.fail_sends = 1
+    sender = make_mailer()
+    await sender.send(build_message("a@example.com", "s", "<p/>", "f@example.com", None))
+    await sender.stop()
+
+    assert len(fake_smtp.instances) == 2
+    assert sender.snapshot()["retries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_retries(fake_smtp):
+    fake_smtp.fail_sends = 10
+    sender = make_mailer(max_retries=2)
+    with pytest.raises(aiosmtplib.SMTPServerDisconnected):
+        await sender.send(
+            build_message("a@example.com", "s", "<p/>", "f@example.com", None)
+        )
+    await sender.stop()
+
+    assert sender.snapshot()["failed"] == 1
+    assert len(fake_smtp.instances) == 3
+
+
+@pytest.mark.asyncio
+async def test_worker_survives_unexpected_error(fake_smtp):
+    sender = make_mailer()
+    message = build_message("a@example.com", "s", "<p/>", "f@example.com", None)
+    with patch.object(FakeSMTP, "send_message", side_effect=UnicodeEncodeError(
+        "ascii", "ї", 0, 1, "bad header"
+    )):
+        with pytest.raises(UnicodeEncodeError):
+            await asyncio.wait_for(sender.send(message), 1)
+
+    await asyncio.wait_for(sender.send(message), 1)
+    await sender.stop()
+
+    assert sender.snapshot()["failed"] == 1
+    assert sender.snapshot()["sent"] == 1
+    assert len(fake_smtp.instances) == 2
+
+
+@pytest.mark.asyncio
+async def test_rejected_retry_closes_new_connection(fake_smtp):
+    async def send_message(self, message):
+        if len(FakeSMTP.instances) == 1:
+            self.is_connected = False
+            raise aiosmtplib.SMTPServerDisconnected("connection lost")
+        raise aiosmtplib.SMTPResponseException(550, "mailbox unavailable")
+
+    sender = make_mailer()
+    message = build_message("a@example.com", "s", "<p/>", "f@example.com", None)
+    with patch.object(FakeSMTP, "send_message", send_message):
+        with pytest.raises(aiosmtplib.SMTPResponseException):
+            await asyncio.wait_for(sender.send(message), 1)
+
+    assert len(fake_smtp.instances) == 2
+    assert not any(smtp.is_connected for smtp in fake_smtp.instances)
+    await asyncio.wait_for(sender.send(message), 1)
+    await sender.stop()
+    assert sender.snapshot()["sent"] == 1
+
+
+@pytest.mark.asyncio
+async def test_delivers_to_local_smtp_server(unused_tcp_port):
+    controller_module = pytest.importorskip("aiosmtpd.controller")
+    from aiosmtpd.handlers import Sink
+
+    class Collect(Sink):
+        def __init__(self):
+            self.messages = []
+
+        async def handle_DATA(self, server, session, envelope):
+            self.messages.append(envelope)
+            return "250 OK"
+
+    handler = Collect()
+    controller = controller_module.Controller(
+        handler, hostname="127.0.0.1", port=unused_tcp_port
+    )
+    controller.start()
+    try:
+        sender = Mailer(
+            "127.0.0.1",
+            unused_tcp_port,
+            sender="noreply@example.com",
+            start_tls=False,
+            pool_size=2,
+        )
+        await asyncio.gather(
+            *(
+                sender.send(
+                    build_message(
+                        f"u{i}@example.com", "s", "<p/>", "noreply@example.com", None
+                    )
+                )
+                for i in range(10)
+            )
+        )
+        await sender.stop()
+    finally:
+        controller.stop()
+
+    assert len(handler.messages) == 10
+    assert sender.snapshot()["connects"] <= 2
@@ -0,0 +1,53 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from main import app
+from src.databases.connect import engine_options
+from src.services import metrics
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_middleware_labels_by_route_template():
+    test_app = FastAPI()
+    test_app.add_middleware(metrics.MetricsMiddleware)
+
+    @test_app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        return {"id": item_id}
+
+    labels = {"method": "GET", "route": "/items/{item_id}", "status": "200"}
+    before = sample("http_requests_total", **labels)
+    unmatched = sample("http_requests_total", method="GET", route="unmatched", status="404")
+    client = TestClient(test_app)
+    for item_id in (1, 2, 3):
+        client.get(f"/items/{item_id}")
+    client.get("/missing")
+
+    assert sample("http_requests_total", **labels) == before + 3
+    assert sample(
+        "http_requests_total", method="GET", route="unmatched", status="404"
+    ) == unmatched + 1
+    assert sample("http_requests_in_progress", method="GET") == 0
+
+
+def test_metrics_endpoint_exposes_pool_and_caches():
+    response = TestClient(app).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    for name in (
+        "db_pool_checked_out",
+        "contacts_cache_hits_total",
+        "jwt_cache_hits_total",
+        "jwt_cache_saved_seconds_total",
+        "http_requests_total",
+    ):
+        assert name in response.text
+
+
+def test_postgres_engine_uses_timed_pool():
+    options = engine_options("postgresql+asyncpg://user:pass@db:5432/contacts")
+    assert options["poolclass"] is metrics.TimedQueuePool
@@ -0,0 +1,127 @@
+import logging
+import pytest
+import pytest_asyncio
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from src.databases import query_stats
+from src.databases.connect import Base
+from src.databases.models import User
+from src.databases.query_stats import (
+    QueryBudgetExceeded,
+    QueryStatsMiddleware,
+    count_queries,
+    normalize_sql,
+)
+from src.repository.users import create_user
+from src.schemas.user import UserCreate
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    query_stats.install(engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+def test_normalize_sql():
+    sql = normalize_sql(
+        "SELECT users.id\n  FROM users WHERE users.email = $1 "
+        "AND users.id IN ($2, $3, $4) AND role = 'admin' LIMIT 10"
+    )
+    assert sql == (
+        "SELECT users.id FROM users WHERE users.email = ? "
+        "AND users.id IN (...) AND role = ? LIMIT ?"
+    )
+    assert normalize_sql("SELECT x::INTEGER FROM t WHERE a = :a_1") == (
+        "SELECT x::INTEGER FROM t WHERE a = ?"
+    )
+
+
+@pytest.mark.asyncio
+async def test_signup_query_budget(session_factory):
+    data = UserCreate(
+        username="deadpool", email="deadpool@example.com", password="12345678", role="user"
+    )
+    async with session_factory() as session:
+        with count_queries(budget=2) as stats:
+            user = await create_user(data, session, verification_host="http://test/")
+
+    # INSERT users + INSERT email_outbox, без повторного SELECT
+    assert stats.count == 2
+    assert user.id is not None
+    assert user.created_at is not None
+
+
+@pytest.mark.asyncio
+async def test_budget_exceeded_reports_repeated_queries(session_factory):
+    async with session_factory() as session:
+        with pytest.raises(QueryBudgetExceeded) as exc:
+            with count_queries(budget=1, label="n+1"):
+                for user_id in range(3):
+                    await session.execute(select(User).where(User.id == user_id))
+
+    assert "n+1: 3 queries (budget 1)" in str(exc.value)
+    assert "3 x SELECT" in str(exc.value)
+
+
+@pytest.mark.asyncio
+async def test_slow_query_logged(session_factory, monkeypatch, caplog):
+    monkeypatch.setattr(query_stats, "SLOW_QUERY_MS", 0)
+    async with session_factory() as session:
+        with caplog.at_level(logging.WARNING, logger=query_stats.__name__):
+            await session.execute(text("SELECT 42"))
+
+    assert "Slow query" in caplog.text
+    assert "SELECT ?" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_failed_query_is_counted(session_factory):
+    async with session_factory() as session:
+        with count_queries() as stats:
+            with pytest.raises(OperationalError):
+                await session.execute(text("SELECT * FROM missing_table"))
+        await session.rollback()
+        with count_queries() as after:
+            await session.execute(text("SELECT 1"))
+
+    assert stats.count == 1
+    assert after.count == 1
+
+
+@pytest.fixture
+def app_with_db(session_factory):
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware)
+
+    async def get_session():
+        async with session_factory() as session:
+            yield session
+
+    @app.get("/users")
+    async def read_users(db=Depends(get_session)):
+        for user_id in range(3):
+            await db.execute(select(User).where(User.id == user_id))
+        return []
+
+    return app
+
+
+def test_middleware_sets_server_timing(app_with_db):
+    response = TestClient(app_with_db).get("/users")
+
+    assert response.headers["server-timing"].startswith('db;desc="3 queries";dur=')
+
+
+def test_strict_budget_fails_request(app_with_db, monkeypatch):
+    monkeypatch.setattr(query_stats, "QUERY_BUDGET", 2)
+    monkeypatch.setattr(query_stats, "QUERY_BUDGET_STRICT", True)
+
+    with pytest.raises(QueryBudgetExceeded):
+        TestClient(app_with_db).get("/users")
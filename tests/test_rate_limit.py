@@ -0,0 +1,62 @@
+import pytest
+from unittest.mock import AsyncMock
+from fastapi import Depends, FastAPI, Response
+from fastapi.testclient import TestClient
+from redis.exceptions import ConnectionError as RedisConnectionError
+from src.services import rate_limit
+from src.services.rate_limit import RateLimiter, RateLimitExceeded
+from main import rate_limit_handler
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+
+
+@pytest.fixture
+def fake_gcra(monkeypatch):
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    script = client.register_script(rate_limit.GCRA_SCRIPT)
+    monkeypatch.setattr(rate_limit, "gcra", lambda: script)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_allows_limit_then_rejects(fake_gcra):
+    limiter = RateLimiter(times=3, seconds=60, scope="test")
+    remaining = []
+    for _ in range(3):
+        response = Response()
+        await limiter.hit("1.2.3.4", response)
+        remaining.append(response.headers["X-RateLimit-Remaining"])
+
+    with pytest.raises(RateLimitExceeded) as exc:
+        await limiter.hit("1.2.3.4", Response())
+
+    assert remaining == ["2", "1", "0"]
+    assert 0 < exc.value.retry_after <= 20
+    await limiter.hit("5.6.7.8", Response())
+
+
+@pytest.mark.asyncio
+async def test_fails_open_without_redis(monkeypatch):
+    script = AsyncMock(side_effect=RedisConnectionError())
+    monkeypatch.setattr(rate_limit, "gcra", lambda: script)
+    errors = rate_limit.stats["errors"]
+    await RateLimiter(times=1, seconds=60, scope="test").hit("ip", Response())
+    assert rate_limit.stats["errors"] == errors + 1
+
+
+def test_route_returns_429_with_retry_after(fake_gcra):
+    app = FastAPI()
+    app.add_exception_handler(RateLimitExceeded, rate_limit_handler)
+
+    @app.get("/ping", dependencies=[Depends(RateLimiter(1, 60, "ping"))])
+    async def ping():
+        return {"ok": True}
+
+    client = TestClient(app)
+    assert client.get("/ping").status_code == 200
+    response = client.get("/ping")
+
+    assert response.status_code == 429
+    assert response.json() == {"error": "Перевищено ліміт запитів. Спробуйте пізніше."}
+    assert int(response.headers["Retry-After"]) >= 1
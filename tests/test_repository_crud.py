@@ -1,9 +1,14 @@
 import pytest
+import pytest_asyncio
 import asyncio
-from unittest.mock import  patch, MagicMock
+from unittest.mock import  patch, MagicMock, AsyncMock
 from datetime import date, timedelta
-from src.repository.crud import update_contact, delete_contact, create_contact, contacts_birthday, get_contact_by_ID, get_contacts, find_search
-from src.databases.models import Contact, User
+from src.repository.crud import update_contact, delete_contact, create_contact, contacts_birthday, get_contact_by_ID, get_contacts, find_search, encode_cursor, decode_cursor, search_contacts, birthday_window, apply_batch
+from src.databases.models import Contact, User, birthday_day_of_year
+from src.schemas.contact import ContactBatchRequest, ContactUpdate, ContactPatch
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from src.databases.connect import Base
 
 @pytest.fixture
 def current_user():
@@ -14,9 +19,9 @@ def current_user():
 @pytest.fixture
 def db():
     session = MagicMock()
-    session.commit = MagicMock()
-    session.refresh = MagicMock()
-    session.delete = MagicMock()
+    session.commit = AsyncMock()
+    session.refresh = AsyncMock()
+    session.delete = AsyncMock()
     return session
 
 
@@ -33,17 +38,43 @@ async def test_create_contact(db, current_user):
     assert result is not None
     assert isinstance(result, Contact)
 
+def make_contacts(*ids):
+    contacts = []
+    for contact_id in ids:
+        contact = Contact()
+        contact.id = contact_id
+        contacts.append(contact)
+    return contacts
+
+
 @pytest.mark.asyncio
 async def test_get_contacts(db, current_user):
-    fake_contacts = [Contact(), Contact()]
-    query_mock = MagicMock()
-    query_mock.filter.return_value.all.return_value = fake_contacts
-    db.query.return_value = query_mock
+    fake_contacts = make_contacts(1, 2)
+    db.execute = AsyncMock(return_value=MagicMock())
+    db.execute.return_value.scalars.return_value.all.return_value = fake_contacts
 
-    result = await get_contacts(current_user, db)
+    contacts, next_cursor = await get_contacts(current_user, db, limit=5)
 
-    db.query.assert_called_once()
-    assert result == fake_contacts
+    db.execute.assert_awaited_once()
+    assert contacts == fake_contacts
+    assert next_cursor is None
+
+@pytest.mark.asyncio
+async def test_get_contacts_next_cursor(db, current_user):
+    db.execute = AsyncMock(return_value=MagicMock())
+    db.execute.return_value.scalars.return_value.all.return_value = make_contacts(1, 2, 3)
+
+    contacts, next_cursor = await get_contacts(current_user, db, limit=2)
+
+    assert [contact.id for contact in contacts] == [1, 2]
+    assert decode_cursor(next_cursor) == 2
+
+def test_cursor_roundtrip():
+    assert decode_cursor(encode_cursor(42)) == 42
+
+def test_decode_cursor_invalid():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
 
 @pytest.mark.asyncio
 async def test_get_contact_by_ID_found(db, current_user):
@@ -68,60 +99,92 @@ async def test_get_contact_by_ID_not_found(db, current_user):
     assert result is None
 
 @pytest.mark.asyncio
-@patch('src.repository.crud.get_contact_by_ID')
-async def test_update_contact_found(mock_get_contact, db, current_user):
+async def test_update_contact_found(db, current_user):
     contact = Contact()
-    contact.first_name = 'OldName'
-    mock_get_contact.return_value = contact
-
-    contact_data = MagicMock()
-    contact_data.dict.return_value = {'first_name': 'Jane'}
+    contact.first_name = 'Jane'
+    db.execute = AsyncMock(return_value=MagicMock())
+    db.execute.return_value.scalar_one_or_none.return_value = contact
+    contact_data = ContactUpdate(
+        first_name='Jane', last_name='Doe', email='jane@example.com',
+        phone_number='+1234567890', birthday=date(1990, 3, 1),
+    )
 
     result = await update_contact(contact_data, 1, current_user, db)
 
-    mock_get_contact.assert_called_once()
-    db.commit.assert_called_once()
-    db.refresh.assert_called_once_with(contact)
+    stmt = db.execute.await_args.args[0]
+    sql = str(stmt)
+    assert sql.startswith('UPDATE contacts')
+    assert 'RETURNING' in sql
+    assert stmt.compile().params['birthday_doy'] == 61
+    db.execute.assert_awaited_once()
+    db.commit.assert_awaited_once()
+    db.refresh.assert_not_called()
     assert result.first_name == 'Jane'
 
 @pytest.mark.asyncio
-@patch('src.repository.crud.get_contact_by_ID')
-async def test_update_contact_not_found(mock_get_contact, db, current_user):
-    mock_get_contact.return_value = None
+async def test_patch_contact_clears_birthday(db, current_user):
+    db.execute = AsyncMock(return_value=MagicMock())
+    contact_data = ContactPatch.model_validate({"birthday": None})
 
-    contact_data = MagicMock()
-    contact_data.dict.return_value = {'first_name': 'Jane'}
+    await update_contact(contact_data, 1, current_user, db, partial=True)
 
-    result = await update_contact(contact_data, 1, current_user, db)
+    params = db.execute.await_args.args[0].compile().params
+    assert params['birthday'] is None
+    assert params['birthday_doy'] is None
+    assert 'first_name' not in params
 
-    mock_get_contact.assert_called_once()
-    db.commit.assert_not_called()
-    db.refresh.assert_not_called()
+def test_patch_contact_rejects_null_required_field():
+    with pytest.raises(ValueError):
+        ContactPatch.model_validate({"first_name": None})
+
+@pytest.mark.asyncio
+async def test_update_contact_not_found(db, current_user):
+    db.execute = AsyncMock(return_value=MagicMock())
+    db.execute.return_value.scalar_one_or_none.return_value = None
+    contact_data = ContactPatch(first_name='Jane')
+
+    result = await update_contact(contact_data, 1, current_user, db, partial=True)
+
+    stmt = db.execute.await_args.args[0]
+    assert set(stmt.compile().params) >= {'first_name'}
+    assert 'last_name' not in stmt.compile().params
     assert result is None
 
 @pytest.mark.asyncio
 @patch('src.repository.crud.get_contact_by_ID')
-async def test_delete_contact_found(mock_get_contact, db, current_user):
+async def test_patch_contact_without_fields(mock_get_contact, db, current_user):
     contact = Contact()
     mock_get_contact.return_value = contact
 
-    result = await delete_contact(1, current_user, db)
+    result = await update_contact(ContactPatch(), 1, current_user, db, partial=True)
 
     mock_get_contact.assert_called_once()
-    db.delete.assert_called_once_with(contact)
-    db.commit.assert_called_once()
+    db.commit.assert_not_called()
     assert result == contact
 
 @pytest.mark.asyncio
-@patch('src.repository.crud.get_contact_by_ID')
-async def test_delete_contact_not_found(mock_get_contact, db, current_user):
-    mock_get_contact.return_value = None
+async def test_delete_contact_found(db, current_user):
+    contact = Contact()
+    db.execute = AsyncMock(return_value=MagicMock())
+    db.execute.return_value.scalar_one_or_none.return_value = contact
 
     result = await delete_contact(1, current_user, db)
 
-    mock_get_contact.assert_called_once()
+    sql = str(db.execute.await_args.args[0])
+    assert sql.startswith('DELETE FROM contacts')
+    assert 'RETURNING' in sql
     db.delete.assert_not_called()
-    db.commit.assert_not_called()
+    db.commit.assert_awaited_once()
+    assert result == contact
+
+@pytest.mark.asyncio
+async def test_delete_contact_not_found(db, current_user):
+    db.execute = AsyncMock(return_value=MagicMock())
+    db.execute.return_value.scalar_one_or_none.return_value = None
+
+    result = await delete_contact(1, current_user, db)
+
+    db.execute.assert_awaited_once()
     assert result is None
 
 
@@ -138,22 +201,118 @@ def test_find_search(db, current_user):
     query_mock.filter.assert_called()
     assert result == fake_contacts
 
-def test_contacts_birthday(db, current_user):
-    today = date.today()
-    contact1 = Contact()
-    contact1.user_id = current_user.id
-    contact1.birthday = today + timedelta(days=3)
-    contact2 = Contact()
-    contact2.user_id = current_user.id
-    contact2.birthday = today + timedelta(days=10)  # вне диапазона
-    contact3 = Contact()
-    contact3.user_id = current_user.id
-    contact3.birthday = None
-
-    db.query.return_value.filter.return_value.all.return_value = [contact1, contact2, contact3]
-
-    result = asyncio.run(contacts_birthday(current_user, db))
-
-    assert contact1 in result
-    assert contact2 not in result
-    assert contact3 not in result
\ No newline at end of file
+@pytest.mark.asyncio
+async def test_search_contacts_fallback_without_similarity(db, current_user):
+    fake_contacts = make_contacts(3)
+    db.execute = AsyncMock(return_value=MagicMock())
+    db.execute.return_value.scalars.return_value.all.return_value = fake_contacts
+
+    result = await search_contacts("wade", current_user, db, limit=10)
+
+    stmt = db.execute.await_args.args[0]
+    assert "similarity" not in str(stmt)
+    assert result == fake_contacts
+
+@pytest.mark.asyncio
+async def test_search_contacts_ranked_on_postgres(db, current_user):
+    db.bind.dialect.name = "postgresql"
+    db.execute = AsyncMock(return_value=MagicMock())
+    db.execute.return_value.scalars.return_value.all.return_value = []
+
+    await search_contacts("wade", current_user, db, limit=10)
+
+    stmt = db.execute.await_args.args[0]
+    assert "similarity" in str(stmt)
+
+def test_birthday_day_of_year_leap_day():
+    assert birthday_day_of_year(date(1992, 2, 29)) == 60
+    assert birthday_day_of_year(date(1991, 3, 1)) == 61
+    assert birthday_day_of_year(date(1991, 12, 31)) == 366
+
+def test_contact_keeps_birthday_doy_in_sync():
+    contact = Contact(birthday=date(1990, 1, 5))
+    assert contact.birthday_doy == 5
+    contact.birthday = None
+    assert contact.birthday_doy is None
+
+def test_birthday_window_wraps_new_year():
+    start, end = birthday_window(date(2025, 12, 29), 7)
+    assert start == 364
+    assert end == 5
+
+def test_birthday_window_includes_leap_day_in_common_year():
+    start, end = birthday_window(date(2025, 2, 28), 1)
+    assert start <= birthday_day_of_year(date(2024, 2, 29)) <= end
+
+def test_birthday_window_whole_year():
+    assert birthday_window(date(2025, 6, 1), 366) is None
+
+@pytest.mark.asyncio
+async def test_contacts_birthday(db, current_user):
+    fake_contacts = make_contacts(1)
+    db.execute = AsyncMock(return_value=MagicMock())
+    db.execute.return_value.scalars.return_value.all.return_value = fake_contacts
+
+    result = await contacts_birthday(current_user, db, days=7)
+
+    stmt = db.execute.await_args.args[0]
+    assert "birthday_doy" in str(stmt)
+    assert result == fake_contacts
+
+
+@pytest.mark.asyncio
+async def test_apply_batch_reports_missing_contacts(db, current_user):
+    request = ContactBatchRequest.model_validate({"operations": [
+        {"op": "delete", "id": 5},
+        {"op": "update", "id": 6, "data": {
+            "first_name": "Wade", "last_name": "Wilson", "email": "wade@example.com",
+            "phone_number": "+1234567890", "birthday": "1991-01-01",
+        }},
+    ]})
+    db.execute = AsyncMock(return_value=MagicMock())
+    db.execute.return_value.scalars.return_value.all.return_value = [5]
+
+    results = await apply_batch(request.operations, current_user, db)
+
+    assert [result["status"] for result in results] == [200, 404]
+    assert results[1]["error"] == "Contact not found"
+    assert db.execute.await_count == 2
+    db.commit.assert_awaited_once()
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_apply_batch_runs_operations_in_request_order(session_factory):
+    contact_data = {
+        "first_name": "Wade", "last_name": "Wilson", "email": "wade@example.com",
+        "phone_number": "+1234567890", "birthday": "1991-01-01",
+    }
+    async with session_factory() as session:
+        user = User(username="deadpool", email="deadpool@example.com", password="x", role="user")
+        session.add(user)
+        await session.flush()
+        contact = Contact(
+            first_name="Wade", last_name="Wilson", email="wade@example.com",
+            phone_number="+1234567890", birthday=date(1991, 1, 1), user_id=user.id,
+        )
+        session.add(contact)
+        await session.commit()
+
+        request = ContactBatchRequest.model_validate({"operations": [
+            {"op": "delete", "id": contact.id},
+            {"op": "create", "data": contact_data},
+            {"op": "update", "id": contact.id, "data": contact_data},
+        ]})
+        results = await apply_batch(request.operations, user, session)
+
+        assert [result["status"] for result in results] == [200, 201, 404]
+        emails = (await session.execute(select(Contact.id, Contact.email))).all()
+        assert emails == [(results[1]["id"], "wade@example.com")]
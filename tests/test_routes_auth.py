@@ -52,12 +52,14 @@ def test_login_invalid(client):
     assert response.status_code == 401
     assert response.json()["detail"] == "Invalid authorization"
 
+@patch("src.routes.auth.invalidate_user", new_callable=AsyncMock)
 @patch("src.routes.auth.decode_email_token", new_callable=AsyncMock)
-def test_verify_email_success(mock_decode, client):
+def test_verify_email_success(mock_decode, mock_invalidate, client):
     mock_decode.return_value = "deadpool@example.com"
     response = client.get("/auth/verify-email/fake-token")
     assert response.status_code == 200
     assert response.json()["message"] == "Email successfully verified!"
+    mock_invalidate.assert_awaited_once_with("deadpool@example.com")
 
 @patch("src.routes.auth.decode_email_token")
 def test_verify_email_invalid_token(mock_decode, client):
@@ -66,14 +68,16 @@ def test_verify_email_invalid_token(mock_decode, client):
     assert response.status_code == 400
     assert response.json()["detail"] == "Invalid or expired token"
 
-@patch("src.routes.auth.send_reset_email")
-def test_request_password_reset_success(mock_send, client):
+@patch("src.routes.auth.enqueue_email")
+def test_request_password_reset_success(mock_enqueue, client):
     response = client.post(
         "/auth/request-password-reset",
         params={"email": "deadpool@example.com"}
     )
     assert response.status_code == 200
     assert response.json()["message"] == "Reset link sent"
+    kind, recipient = mock_enqueue.call_args.args[1:3]
+    assert (kind, recipient) == ("password_reset", "deadpool@example.com")
 
 def test_request_password_reset_invalid_email(client):
     response = client.post(
@@ -83,8 +87,9 @@ def test_request_password_reset_invalid_email(client):
     assert response.status_code == 404
     assert response.json()["detail"] == "User not found"
 
+@patch("src.routes.auth.invalidate_user", new_callable=AsyncMock)
 @patch("src.routes.auth.verify_password_reset_token")
-def test_reset_password_success(mock_verify, client):
+def test_reset_password_success(mock_verify, mock_invalidate, client):
     mock_verify.return_value = "deadpool@example.com"
     response = client.post(
         "/auth/reset-password",
@@ -95,6 +100,7 @@ def test_reset_password_success(mock_verify, client):
     )
     assert response.status_code == 200
     assert response.json()["message"] == "Password updated successfully"
+    mock_invalidate.assert_awaited_once_with("deadpool@example.com")
 
 @patch("src.routes.auth.verify_password_reset_token")
 def test_reset_password_invalid_token(mock_verify, client):
@@ -1,4 +1,5 @@
 import json
+from unittest.mock import AsyncMock, patch
 import pytest
 from fastapi.testclient import TestClient
 from src.auth.auth import create_access_token
@@ -38,7 +39,16 @@ async def test_read_all_contacts(client, get_token):
     headers = {"Authorization": f"Bearer {get_token}"}
     response = client.get("/contacts/", headers=headers)
     assert response.status_code == 200
-    assert isinstance(response.json(), list)
+    data = response.json()
+    assert isinstance(data["items"], list)
+    assert "next_cursor" in data
+
+
+@pytest.mark.asyncio
+async def test_read_all_contacts_invalid_cursor(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.get("/contacts/?after=broken", headers=headers)
+    assert response.status_code == 400
 
 
 
@@ -52,6 +62,53 @@ async def test_search_contact(client, get_token):
     assert result[0]["email"] == contact_data["email"]
 
 
+@pytest.mark.asyncio
+async def test_search_contact_by_query(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.get("/contacts/search?q=wilson&limit=10", headers=headers)
+    assert response.status_code == 200
+    result = response.json()
+    assert result[0]["last_name"] == contact_data["last_name"]
+
+
+@pytest.mark.asyncio
+async def test_batch_contacts(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    batch_contact = dict(contact_data, email="batch@example.com")
+    response = client.post(
+        "/contacts/batch",
+        headers=headers,
+        json={"operations": [
+            {"op": "create", "data": batch_contact},
+            {"op": "create", "data": batch_contact},
+            {"op": "delete", "id": 999999},
+        ]},
+    )
+    assert response.status_code == 200
+    statuses = [result["status"] for result in response.json()["results"]]
+    assert statuses == [201, 409, 404]
+
+
+@pytest.mark.asyncio
+async def test_export_contacts_ndjson(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.get("/contacts/export", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert contact_data["email"] in [row["email"] for row in rows]
+
+
+@pytest.mark.asyncio
+async def test_export_contacts_csv(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.get("/contacts/export?format=csv", headers=headers)
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert lines[0] == "id,first_name,last_name,email,phone_number,birthday"
+    assert any(contact_data["email"] in line for line in lines[1:])
+
+
 @pytest.mark.asyncio
 async def test_read_contact_by_id(get_token, existing_contact_id, async_client):
     token = await get_token
@@ -83,6 +140,29 @@ async def test_update_contact(client, get_token):
     assert response.json()["first_name"] == "Updated"
 
 
+@pytest.mark.asyncio
+async def test_patch_contact(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.patch("/contacts/7", json={"last_name": "Patched"}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["last_name"] == "Patched"
+    assert response.json()["first_name"] == "Updated"
+
+
+@pytest.mark.asyncio
+async def test_patch_contact_clears_birthday(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.patch("/contacts/7", json={"birthday": None}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["birthday"] is None
+
+    response = client.get("/contacts/7", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["birthday"] is None
+    assert client.get("/contacts/", headers=headers).status_code == 200
+    assert client.get("/contacts/upcoming-birthdays", headers=headers).status_code in [200, 404]
+
+
 @pytest.mark.asyncio
 async def test_delete_contact(client, get_token):
     headers = {"Authorization": f"Bearer {get_token}"}
@@ -95,4 +175,20 @@ async def test_delete_contact(client, get_token):
 async def test_get_deleted_contact_by_id(client, get_token):
     headers = {"Authorization": f"Bearer {get_token}"}
     response = client.get("/contacts/7", headers=headers)
-    assert response.status_code == 404
\ No newline at end of file
+    assert response.status_code == 404
+
+@pytest.mark.asyncio
+async def test_read_all_contacts_not_modified(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    with patch(
+        "src.routes.contacts.contacts_cache.current_version",
+        new=AsyncMock(return_value=7),
+    ):
+        response = client.get("/contacts/", headers=headers)
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        response = client.get(
+            "/contacts/", headers={**headers, "If-None-Match": etag}
+        )
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
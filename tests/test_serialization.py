@@ -0,0 +1,42 @@
+from datetime import date
+from src.databases.models import Contact
+from src.services import serialization
+
+
+def make_contacts(count):
+    return [
+        Contact(
+            id=i,
+            first_name=f"Wade{i}",
+            last_name="Wilson",
+            email=f"wade{i}@example.com",
+            phone_number="+1234567890",
+            birthday=date(1991, 1, 1 + i % 28),
+            user_id=1,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def test_fast_contacts_match_validated_output():
+    contacts = make_contacts(3)
+    assert serialization.dump_contacts(contacts, fast=True) == (
+        serialization.dump_contacts(contacts, fast=False)
+    )
+    assert serialization.dump_contact(contacts[0], fast=True) == (
+        serialization.dump_contact(contacts[0], fast=False)
+    )
+
+
+def test_fast_page_matches_validated_output():
+    contacts = make_contacts(2)
+    for cursor in ("Yzoy", None):
+        assert serialization.dump_contact_page(contacts, cursor, fast=True) == (
+            serialization.dump_contact_page(contacts, cursor, fast=False)
+        )
+
+
+def test_fast_path_follows_config(monkeypatch):
+    monkeypatch.setattr(serialization, "FAST_SERIALIZATION", True)
+    assert serialization.use_fast_path(None) is True
+    assert serialization.use_fast_path(False) is False
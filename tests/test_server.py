@@ -0,0 +1,34 @@
+from src import server
+
+
+def test_available_cpus_respects_cgroup_quota(tmp_path):
+    cpu_max = tmp_path / "cpu.max"
+    cpu_max.write_text("150000 100000\n")
+    assert server.available_cpus(str(cpu_max)) == min(2, server.available_cpus("/missing"))
+
+
+def test_available_cpus_without_quota(tmp_path):
+    cpu_max = tmp_path / "cpu.max"
+    cpu_max.write_text("max 100000\n")
+    assert server.available_cpus(str(cpu_max)) == server.available_cpus("/missing") >= 1
+
+
+def test_worker_count_from_env(monkeypatch):
+    monkeypatch.setattr(server, "WEB_CONCURRENCY", 3)
+    assert server.worker_count() == 3
+
+
+def test_development_options_reload():
+    options = server.server_options("development")
+    assert options["reload"] is True
+    assert "workers" not in options
+
+
+def test_production_options(monkeypatch):
+    monkeypatch.setattr(server, "WEB_CONCURRENCY", 4)
+    options = server.server_options("production")
+    assert options["workers"] == 4
+    assert "reload" not in options
+    assert options["backlog"] == server.SERVER_BACKLOG
+    assert options["timeout_graceful_shutdown"] == server.GRACEFUL_SHUTDOWN_TIMEOUT
+    assert options["limit_max_requests"] is None
@@ -0,0 +1,41 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Бюджет холодного імпорту застосунку (мс); на момент введення ~1100 мс.
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "2500"))
+
+LAZY_MODULES = ("cloudinary", "PIL", "aiosmtplib", "src.services.mailer")
+
+
+def run_python(*args) -> subprocess.CompletedProcess:
+    # База даних недосяжна: імпорт застосунку не повинен до неї підключатися
+    env = {**os.environ, "DATABASE_URL": "sqlite:////nonexistent/contacts.db"}
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def import_time_ms() -> float:
+    stderr = run_python("-X", "importtime", "-c", "import main").stderr
+    for line in stderr.splitlines():
+        if line.endswith("| main"):
+            return int(line.split("|")[1]) / 1000
+    raise AssertionError("main not found in -X importtime output")
+
+
+def test_import_does_not_load_heavy_sdks():
+    code = f"import sys, main; print([m for m in {LAZY_MODULES!r} if m in sys.modules])"
+    assert run_python("-c", code).stdout.strip() == "[]"
+
+
+def test_import_time_budget():
+    elapsed = min(import_time_ms() for _ in range(2))
+    assert elapsed < IMPORT_TIME_BUDGET_MS, f"import main took {elapsed:.0f} ms"
@@ -0,0 +1,118 @@
+import io
+import pytest
+from unittest.mock import patch
+from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi.testclient import TestClient
+from src.services import storage
+from src.services.storage import CloudinaryStorage, LocalStorage, UploadLimitMiddleware, read_upload
+
+
+def upload(data: bytes) -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename="avatar.png")
+
+
+@pytest.mark.asyncio
+async def test_read_upload_returns_content():
+    data = b"x" * (storage.UPLOAD_CHUNK_SIZE * 2 + 10)
+    assert await read_upload(upload(data), max_bytes=len(data)) == data
+
+
+@pytest.mark.asyncio
+async def test_read_upload_rejects_large_file():
+    with pytest.raises(HTTPException) as exc:
+        await read_upload(upload(b"x" * 11), max_bytes=10)
+    assert exc.value.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_read_upload_rejects_known_size_without_reading():
+    file = upload(b"x" * 11)
+    file.size = 11
+    with pytest.raises(HTTPException):
+        await read_upload(file, max_bytes=10)
+    assert file.file.tell() == 0
+
+
+@pytest.mark.asyncio
+async def test_read_upload_reads_at_most_limit_plus_one():
+    file = upload(b"x" * (storage.UPLOAD_CHUNK_SIZE * 4))
+    with pytest.raises(HTTPException):
+        await read_upload(file, max_bytes=10)
+    assert file.file.tell() == 11
+
+
+def upload_app():
+    app = FastAPI()
+    app.add_middleware(UploadLimitMiddleware, limits={"/upload": 1024})
+    calls = []
+
+    @app.post("/upload")
+    async def receive_upload(file: UploadFile = File(...)):
+        calls.append(file.filename)
+        return {"size": len(await read_upload(file))}
+
+    return app, calls
+
+
+def test_upload_limit_middleware_rejects_by_content_length():
+    app, calls = upload_app()
+    client = TestClient(app)
+
+    small = client.post("/upload", files={"file": ("a.png", b"x" * 100)})
+    large = client.post("/upload", files={"file": ("a.png", b"x" * 2048)})
+
+    assert small.status_code == 200
+    assert large.status_code == 413
+    assert calls == ["a.png"]
+
+
+def test_upload_limit_middleware_stops_chunked_body():
+    app, calls = upload_app()
+
+    def body():
+        yield (
+            b"--b\r\nContent-Disposition: form-data; name=\"file\"; "
+            b"filename=\"a.png\"\r\n\r\n"
+        )
+        for _ in range(4):
+            yield b"x" * 512
+        yield b"\r\n--b--\r\n"
+
+    response = TestClient(app).post(
+        "/upload", content=body(), headers={"content-type": "multipart/form-data; boundary=b"}
+    )
+
+    assert response.status_code == 413
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_local_storage_overwrites_file(tmp_path):
+    backend = LocalStorage(root=str(tmp_path), base_url="/media/")
+    await backend.save(b"old", "user_avatars/1", "image/png")
+    url = await backend.save(b"new", "user_avatars/1", "image/png")
+
+    assert url == "/media/user_avatars/1.png"
+    assert (tmp_path / "user_avatars" / "1.png").read_bytes() == b"new"
+    assert [p.name for p in (tmp_path / "user_avatars").iterdir()] == ["1.png"]
+
+
+@pytest.mark.asyncio
+@patch("src.services.update_avatar.upload_avatar")
+async def test_cloudinary_storage_uploads_bytes(mock_upload):
+    mock_upload.return_value = "https://res.cloudinary.com/demo/user_avatars/1"
+    url = await CloudinaryStorage().save(b"img", "user_avatars/1", "image/png")
+
+    assert url == "https://res.cloudinary.com/demo/user_avatars/1"
+    mock_upload.assert_called_once_with(b"img", "user_avatars/1")
+
+
+def test_get_storage_selects_backend(monkeypatch):
+    storage.get_storage.cache_clear()
+    monkeypatch.setattr(storage, "AVATAR_STORAGE", "local")
+    assert isinstance(storage.get_storage(), LocalStorage)
+    storage.get_storage.cache_clear()
+    monkeypatch.setattr(storage, "AVATAR_STORAGE", "s3")
+    with pytest.raises(ValueError):
+        storage.get_storage()
+    storage.get_storage.cache_clear()
@@ -1,7 +1,10 @@
 import pytest
 from jose import jwt
 from datetime import datetime, timedelta
+from jose import JWTError
+from unittest.mock import patch
 from src.services.email_token import create_email_token, decode_email_token
+from src.auth.auth import create_access_token, decode_token, token_cache, token_cache_stats
 import os
 
 SECRET_KEY = os.getenv("SECRET_KEY")
@@ -32,4 +35,33 @@ async def test_decode_email_token_expired():
     expired_payload = {"sub": "test@example.com", "exp": datetime.utcnow() - timedelta(hours=1)}
     expired_token = jwt.encode(expired_payload, SECRET_KEY, algorithm=ALGORITHM)
     sub = await decode_email_token(expired_token)
-    assert sub is None
\ No newline at end of file
+    assert sub is None
+
+
+@pytest.mark.asyncio
+async def test_decode_token_caches_verified_claims():
+    token_cache.clear()
+    token = await create_access_token({"sub": "cached@example.com"})
+    first = decode_token(token)
+    with patch("src.auth.auth.jwt.decode") as mock_decode:
+        second = decode_token(token)
+    mock_decode.assert_not_called()
+    assert first == second
+    assert second["sub"] == "cached@example.com"
+    assert token_cache_stats["hits"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_decode_token_entry_expires_with_token():
+    token_cache.clear()
+    token = await create_access_token({"sub": "short@example.com"}, expires_delta=1)
+    decode_token(token)
+    with patch("src.cache_func.local_cache.time.monotonic", return_value=10**9):
+        with pytest.raises(JWTError):
+            with patch("src.auth.auth.jwt.decode", side_effect=JWTError("expired")):
+                decode_token(token)
+
+
+def test_decode_token_rejects_invalid_token():
+    with pytest.raises(JWTError):
+        decode_token("this.is.not.a.valid.token")
@@ -0,0 +1,89 @@
+import io
+import pytest
+from unittest.mock import AsyncMock, patch
+from redis.exceptions import ConnectionError as RedisConnectionError
+from src.services import update_avatar
+from src.services.storage import LocalStorage
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def make_image(size=(640, 480), fmt="JPEG", exif=True) -> bytes:
+    image = Image.new("RGB", size, (200, 30, 30))
+    buffer = io.BytesIO()
+    if exif:
+        metadata = Image.Exif()
+        metadata[0x010F] = "SecretCamera"
+        image.save(buffer, fmt, exif=metadata)
+    else:
+        image.save(buffer, fmt)
+    return buffer.getvalue()
+
+
+def test_process_avatar_resizes_and_strips_metadata():
+    variants = update_avatar.process_avatar(make_image(), sizes=(128, 32))
+
+    assert set(variants) == {128, 32}
+    with Image.open(io.BytesIO(variants[128])) as thumb:
+        assert thumb.format == "WEBP"
+        assert thumb.size == (128, 128)
+        assert "exif" not in thumb.info
+    assert b"SecretCamera" not in variants[128]
+
+
+def test_process_avatar_rejects_garbage():
+    with pytest.raises(ValueError):
+        update_avatar.process_avatar(b"not an image")
+
+
+@pytest.mark.asyncio
+@patch("src.services.update_avatar.get_redis")
+async def test_store_avatar_processes_and_indexes(mock_get_redis, tmp_path):
+    mock_redis = mock_get_redis.return_value
+    mock_redis.get = AsyncMock(return_value=None)
+    mock_redis.set = AsyncMock()
+    storage = LocalStorage(root=str(tmp_path), base_url="/media")
+    data = make_image()
+    digest = update_avatar.content_hash(data)
+
+    url = await update_avatar.store_avatar(data, storage)
+
+    size = update_avatar.AVATAR_SIZES[0]
+    assert url == f"/media/avatars/{digest}/{size}.webp"
+    for size in update_avatar.AVATAR_SIZES:
+        assert (tmp_path / "avatars" / digest / f"{size}.webp").exists()
+    mock_redis.set.assert_awaited_once_with(
+        f"avatar:{digest}", url, ex=update_avatar.AVATAR_INDEX_TTL
+    )
+
+
+@pytest.mark.asyncio
+@patch("src.services.update_avatar.get_redis")
+async def test_store_avatar_skips_known_image(mock_get_redis):
+    mock_redis = mock_get_redis.return_value
+    mock_redis.get = AsyncMock(return_value="https://cdn.example.com/a.webp")
+    storage = AsyncMock()
+
+    with patch.object(update_avatar, "executor") as mock_executor:
+        url = await update_avatar.store_avatar(make_image(), storage)
+
+    assert url == "https://cdn.example.com/a.webp"
+    mock_executor.assert_not_called()
+    storage.save.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@patch("src.services.update_avatar.get_redis")
+async def test_store_avatar_falls_back_to_storage_without_redis(mock_get_redis, tmp_path):
+    mock_redis = mock_get_redis.return_value
+    mock_redis.get = AsyncMock(side_effect=RedisConnectionError())
+    mock_redis.set = AsyncMock(side_effect=RedisConnectionError())
+    storage = LocalStorage(root=str(tmp_path), base_url="/media")
+    data = make_image(exif=False)
+
+    first = await update_avatar.store_avatar(data, storage)
+    with patch.object(storage, "save", new=AsyncMock()) as mock_save:
+        second = await update_avatar.store_avatar(data, storage)
+
+    assert first == second
+    mock_save.assert_not_awaited()
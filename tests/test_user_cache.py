@@ -0,0 +1,93 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+from src.cache_func import user_cache
+from src.cache_func.local_cache import TTLCache
+from src.cache_func.user_cache import get_user_from_cache, set_user_to_cache, local_users
+from src.databases.models import User
+from src.auth.principal import Principal
+
+
+@pytest.fixture(autouse=True)
+def clear_local_users():
+    local_users.clear()
+    yield
+    local_users.clear()
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=2, ttl=60)
+    with patch("src.cache_func.local_cache.time.monotonic", return_value=100):
+        cache.set("a", 1, ttl=5)
+        cache.set("b", 2)
+    with patch("src.cache_func.local_cache.time.monotonic", return_value=110):
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+
+
+@pytest.mark.asyncio
+@patch("src.cache_func.user_cache.get_redis")
+async def test_get_user_from_cache_uses_local_tier(mock_get_redis):
+    mock_redis = mock_get_redis.return_value
+    mock_redis.get = AsyncMock(
+        return_value='{"id": 1, "username": "a", "email": "a@example.com", '
+        '"avatar": null, "confirmed": true, "role": "admin"}'
+    )
+
+    first = await get_user_from_cache("a@example.com")
+    second = await get_user_from_cache("a@example.com")
+
+    assert isinstance(first, Principal)
+    assert first is second
+    assert first.role == "admin"
+    mock_redis.get.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@patch("src.cache_func.user_cache.get_redis")
+async def test_set_user_to_cache_publishes_invalidation(mock_get_redis):
+    mock_redis = mock_get_redis.return_value
+    mock_redis.set = AsyncMock()
+    mock_redis.publish = AsyncMock()
+    local_users.set("a@example.com", Principal(id=1, username="a", email="a@example.com"))
+    user = User(id=1, username="a", email="a@example.com", avatar="new.png", role="user")
+
+    principal = await set_user_to_cache(user)
+
+    assert principal.avatar == "new.png"
+    assert local_users.get("a@example.com") is None
+    mock_redis.publish.assert_awaited_once_with(
+        user_cache.INVALIDATION_CHANNEL, "a@example.com"
+    )
+
+
+@pytest.mark.asyncio
+@patch("src.cache_func.user_cache.get_redis")
+async def test_cache_fill_does_not_publish(mock_get_redis):
+    mock_redis = mock_get_redis.return_value
+    mock_redis.set = AsyncMock()
+    mock_redis.publish = AsyncMock()
+    user = User(id=1, username="a", email="a@example.com", role="user")
+
+    principal = await set_user_to_cache(user, publish=False)
+
+    assert local_users.get("a@example.com") == principal
+    mock_redis.set.assert_awaited_once()
+    mock_redis.publish.assert_not_awaited()
+
+
+def test_principal_is_immutable():
+    principal = Principal(id=1, username="a", email="a@example.com")
+    with pytest.raises(AttributeError):
+        principal.role = "admin"
+    assert not hasattr(principal, "__dict__")